@@ -0,0 +1,184 @@
+"""Offline parser benchmark – replays recorded scraper inputs through each parsing stage.
+
+Usage:
+    python benchmarks/bench_parsers.py                       # bundled fixtures
+    python benchmarks/bench_parsers.py --recordings recordings/ --repeat 500
+    python benchmarks/bench_parsers.py --json bench_parsers.json
+
+Record fresh inputs with ``JOBPULSE_RECORD_DIR=recordings python main.py``.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+# Ensure project root is on sys.path so `src` package is importable.
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from src.recording import (
+    KIND_JUSTJOINIT_API,
+    KIND_JUSTJOINIT_CARDS,
+    KIND_THEPROTOCOL_API,
+    KIND_THEPROTOCOL_HTML,
+    Recording,
+    load_recordings,
+)
+from src.scrapers import justjoinit, theprotocol
+
+_FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: list
+    run: Callable[[object], int]  # processes one input, returns number of offers produced
+
+
+def _build_stages(recordings: list[Recording]) -> list[Stage]:
+    cards: list[tuple[str, list[str]]] = []
+    justjoinit_pages: list[object] = []
+    html_docs: list[str] = []
+    api_payloads: list[object] = []
+    for recording in recordings:
+        if recording.source == "justjoinit" and recording.kind == KIND_JUSTJOINIT_CARDS:
+            cards.extend((href, lines) for href, lines in recording.payload)
+        elif recording.source == "justjoinit" and recording.kind == KIND_JUSTJOINIT_API:
+            justjoinit_pages.append(recording.payload)
+        elif recording.source == "theprotocol" and recording.kind == KIND_THEPROTOCOL_HTML:
+            html_docs.append(recording.payload)
+        elif recording.source == "theprotocol" and recording.kind == KIND_THEPROTOCOL_API:
+            api_payloads.append(recording.payload)
+
+    scraper = justjoinit.JustJoinItScraper()
+    justjoinit_api_items = [item for page in justjoinit_pages for item in justjoinit.extract_offers_from_api(page)[0]]
+    protocol_candidates = [c for payload in api_payloads for c in theprotocol._extract_candidates_from_api(payload)]
+    protocol_candidates += [c for html in html_docs for c in theprotocol._extract_candidates_from_html(html)]
+
+    def _classify(item: tuple[str, list[str]]) -> int:
+        justjoinit.classify_card_lines(item[1])
+        return 1
+
+    def _core_fields(item: tuple[str, list[str]]) -> int:
+        justjoinit._extract_core_fields(item[1], item[0])
+        return 1
+
+    def _justjoinit_offer(item: tuple[str, list[str]]) -> int:
+        scraper._to_job_offer(item[0], item[1])
+        return 1
+
+    def _justjoinit_api_offer(item: dict) -> int:
+        justjoinit._api_item_to_job_offer(item)
+        return 1
+
+    def _protocol_offer(candidate: dict) -> int:
+        theprotocol._to_job_offer(candidate)
+        return 1
+
+    stages = [
+        Stage("justjoinit.classify_card_lines", cards, _classify),
+        Stage("justjoinit.extract_core_fields", cards, _core_fields),
+        Stage("justjoinit.to_job_offer", cards, _justjoinit_offer),
+        Stage(
+            "justjoinit.extract_offers_from_api",
+            justjoinit_pages,
+            lambda page: len(justjoinit.extract_offers_from_api(page)[0]),
+        ),
+        Stage("justjoinit.api_to_job_offer", justjoinit_api_items, _justjoinit_api_offer),
+        Stage(
+            "theprotocol.extract_candidates_from_html",
+            html_docs,
+            lambda html: len(theprotocol._extract_candidates_from_html(html)),
+        ),
+        Stage(
+            "theprotocol.extract_candidates_from_api",
+            api_payloads,
+            lambda payload: len(theprotocol._extract_candidates_from_api(payload)),
+        ),
+        Stage(
+            "theprotocol.api_generic_candidates",
+            api_payloads,
+            lambda payload: len([theprotocol._generic_candidate(item) for item in theprotocol._locate_api_items(payload)[0]]),
+        ),
+        Stage("theprotocol.to_job_offer", protocol_candidates, _protocol_offer),
+    ]
+    return [stage for stage in stages if stage.inputs]
+
+
+def _measure(stage: Stage, repeat: int) -> dict:
+    # Timing pass without tracemalloc (it slows allocation-heavy code several times).
+    offers = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in stage.inputs:
+            offers += stage.run(item)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for item in stage.inputs:
+        stage.run(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "stage": stage.name,
+        "inputs": len(stage.inputs) * repeat,
+        "offers": offers,
+        "seconds": round(elapsed, 4),
+        "offers_per_sec": round(offers / elapsed, 1) if elapsed > 0 else None,
+        "peak_kib_per_pass": round(peak / 1024, 1),
+    }
+
+
+def _print_results(results: list[dict]) -> None:
+    columns = ("stage", "offers", "seconds", "offers_per_sec", "peak_kib_per_pass")
+    widths = {col: max(len(col), *(len(str(r[col])) for r in results)) for col in columns}
+    print(" | ".join(col.ljust(widths[col]) for col in columns))
+    print("-+-".join("-" * widths[col] for col in columns))
+    for result in results:
+        print(" | ".join(str(result[col]).ljust(widths[col]) for col in columns))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded scraper inputs through the parsers")
+    parser.add_argument(
+        "--recordings", default=str(_FIXTURES_DIR), help="Directory with recordings (default: bundled fixtures)"
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="Replay each input N times (default: 200)")
+    parser.add_argument("--json", help="Write results to a JSON file")
+    args = parser.parse_args(argv)
+
+    recordings = load_recordings(args.recordings)
+    stages = _build_stages(recordings)
+    if not stages:
+        print(f"No usable recordings in {args.recordings}", file=sys.stderr)
+        sys.exit(1)
+
+    results = [_measure(stage, args.repeat) for stage in stages]
+    _print_results(results)
+
+    if args.json:
+        report = {
+            "benchmark": "parsers",
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "recordings": args.recordings,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""End-to-end load benchmark: synthetic offers through filter -> store -> query -> export.
+
+Usage:
+    python benchmarks/bench_pipeline.py --offers 100000
+    python benchmarks/bench_pipeline.py --offers 1000000 --json bench_1m.json
+    python benchmarks/bench_pipeline.py --offers 100000 --compare bench_before.json
+    python benchmarks/bench_pipeline.py --offers 100000 --dsn postgresql://localhost/jobpulse_bench
+
+The report (JSON on stdout or in --json) holds throughput, p50/p99 latencies per
+stage and peak RSS, so runs from different commits can be diffed directly.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+# Ensure project root is on sys.path so `src` package is importable.
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+_BENCH_DIR = str(Path(__file__).resolve().parent)
+if _BENCH_DIR not in sys.path:
+    sys.path.insert(0, _BENCH_DIR)
+
+from synthetic import SyntheticConfig, generate_offers
+
+from main import _offer_to_export_row
+from src.exporters import ExportError, export_rows
+from src.filters import OfferFilter, filter_offers
+from src.storage import OfferQuery, SQLiteOfferStore, open_store
+from src.storage.base import dsn_scheme
+
+QUERIES = {
+    "latest": OfferQuery(limit=20),
+    "source": OfferQuery(source="theprotocol", limit=20),
+    "min_salary": OfferQuery(min_salary=25000, limit=20),
+    "city_exact": OfferQuery(city="Kraków", city_match="exact", limit=20),
+    "city_contains": OfferQuery(city="Gda", limit=20),
+    "company_exact": OfferQuery(company="Company 01234", company_match="exact", limit=20),
+    "company_prefix": OfferQuery(company="Company 001", company_match="prefix", limit=20),
+    "skill_substring": OfferQuery(skill="Kubernetes", limit=20),
+    "skill_exact": OfferQuery(skill="kubernetes", skill_match="exact", limit=20),
+}
+EXPORT_FORMATS = ("jsonl", "csv.gz", "parquet")
+
+
+def _percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"p50_ms": None, "p99_ms": None}
+    ordered = sorted(samples)
+    p99_index = min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p99_ms": round(ordered[p99_index] * 1000, 3),
+    }
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _batched(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run(args: argparse.Namespace, workdir: Path) -> dict:
+    config = SyntheticConfig(seed=args.seed, duplicate_rate=args.duplicate_rate)
+    offer_filter = OfferFilter(min_salary_pln=args.min_salary) if args.min_salary else OfferFilter()
+    store = open_store(args.dsn) if args.dsn else SQLiteOfferStore(db_path=workdir / "bench.db")
+
+    stages: dict[str, dict] = {}
+    filter_times: list[float] = []
+    save_times: list[float] = []
+    generated = matched = inserted = 0
+    generate_seconds = 0.0
+
+    gen_iter = generate_offers(args.offers, config)
+    while True:
+        start = time.perf_counter()
+        batch = list(islice(gen_iter, args.batch_size))
+        generate_seconds += time.perf_counter() - start
+        if not batch:
+            break
+        generated += len(batch)
+
+        start = time.perf_counter()
+        kept = filter_offers(batch, offer_filter)
+        filter_times.append(time.perf_counter() - start)
+        matched += len(kept)
+
+        start = time.perf_counter()
+        inserted += store.save_offers(kept)
+        save_times.append(time.perf_counter() - start)
+
+    stages["generate"] = {"items": generated, "seconds": round(generate_seconds, 3)}
+    stages["filter"] = {
+        "items": generated,
+        "seconds": round(sum(filter_times), 3),
+        "items_per_sec": round(generated / sum(filter_times), 1) if sum(filter_times) else None,
+        **_percentiles(filter_times),
+    }
+    stages["store"] = {
+        "items": matched,
+        "inserted": inserted,
+        "seconds": round(sum(save_times), 3),
+        "items_per_sec": round(matched / sum(save_times), 1) if sum(save_times) else None,
+        **_percentiles(save_times),
+    }
+
+    queries: dict[str, dict] = {}
+    for name, query in QUERIES.items():
+        samples = []
+        for _ in range(args.query_repeat):
+            start = time.perf_counter()
+            store.query_offers(query)
+            samples.append(time.perf_counter() - start)
+        queries[name] = _percentiles(samples)
+    stages["query"] = queries
+
+    exports: dict[str, dict] = {}
+    for fmt in EXPORT_FORMATS:
+        path = workdir / f"export.{fmt}"
+        start = time.perf_counter()
+        try:
+            written = export_rows(store.iter_offers(OfferQuery(limit=0)), path)
+        except ExportError as exc:
+            exports[fmt] = {"skipped": str(exc)}
+            continue
+        elapsed = time.perf_counter() - start
+        exports[fmt] = {
+            "rows": written,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(written / elapsed, 1) if elapsed else None,
+            "bytes": path.stat().st_size,
+        }
+    # Export from in-memory offers the way main.py --output does.
+    sample = list(islice(generate_offers(min(args.offers, 50_000), config), 50_000))
+    start = time.perf_counter()
+    export_rows((_offer_to_export_row(offer) for offer in sample), workdir / "main_export.jsonl")
+    elapsed = time.perf_counter() - start
+    exports["main_output_jsonl"] = {
+        "rows": len(sample),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(sample) / elapsed, 1) if elapsed else None,
+    }
+    stages["export"] = exports
+
+    return {
+        "benchmark": "pipeline",
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "params": {
+            "offers": args.offers,
+            "batch_size": args.batch_size,
+            "duplicate_rate": args.duplicate_rate,
+            "min_salary": args.min_salary,
+            "seed": args.seed,
+            "backend": dsn_scheme(args.dsn) if args.dsn else "sqlite",
+        },
+        "db_bytes": None if args.dsn else (workdir / "bench.db").stat().st_size,
+        "peak_rss_mib": _peak_rss_mib(),
+        "stages": stages,
+    }
+
+
+def _flatten(prefix: str, value, out: dict) -> None:
+    if isinstance(value, dict):
+        for key, inner in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else key, inner, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+
+
+def _print_comparison(current: dict, baseline: dict) -> None:
+    now: dict = {}
+    before: dict = {}
+    _flatten("", {"db_bytes": current["db_bytes"], "peak_rss_mib": current["peak_rss_mib"], **current["stages"]}, now)
+    _flatten("", {"db_bytes": baseline["db_bytes"], "peak_rss_mib": baseline["peak_rss_mib"], **baseline["stages"]}, before)
+    print(f"{'metric':<40} {'baseline':>14} {'current':>14} {'ratio':>8}", file=sys.stderr)
+    for key in sorted(now.keys() & before.keys()):
+        ratio = f"{now[key] / before[key]:.2f}x" if before[key] else "-"
+        print(f"{key:<40} {before[key]:>14} {now[key]:>14} {ratio:>8}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="End-to-end JobPulse load benchmark on synthetic offers")
+    parser.add_argument("--offers", type=int, default=100_000, help="Number of synthetic offers (default: 100000)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Offers per save_offers call (default: 5000)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2, help="Share of re-seen offers (default: 0.2)")
+    parser.add_argument("--min-salary", type=int, default=0, help="OfferFilter min salary (0 = keep all)")
+    parser.add_argument("--query-repeat", type=int, default=50, help="Runs per query for latency stats")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--dsn",
+        help="Store offers in this database (e.g. a throwaway postgresql:// DSN) instead of a fresh SQLite file",
+    )
+    parser.add_argument("--workdir", help="Keep DB and exports here instead of a temp dir")
+    parser.add_argument("--json", help="Write the report to this file instead of stdout")
+    parser.add_argument("--compare", help="Baseline report to compare against (printed to stderr)")
+    args = parser.parse_args(argv)
+
+    if args.workdir:
+        workdir = Path(args.workdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for stale in workdir.glob("bench.db*"):
+            stale.unlink()
+        report = run(args, workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="jobpulse-bench-") as tmp:
+            report = run(args, Path(tmp))
+
+    text = json.dumps(report, indent=2)
+    if args.json:
+        Path(args.json).write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote {args.json}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        _print_comparison(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""CLI startup benchmark based on ``python -X importtime``.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --budget-ms 100 --json bench_startup.json
+
+Each scenario runs in a fresh interpreter inside a temporary directory. The
+report holds wall time, time spent importing modules (interpreter start-up
+such as ``site`` excluded), the slowest top-level imports and any heavy
+module that the scenario must not load. Exits with status 1 when a scenario
+exceeds the import budget or loads a forbidden module.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+# Ensure project root is on sys.path so `src` package is importable.
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+_BENCH_DIR = str(Path(__file__).resolve().parent)
+if _BENCH_DIR not in sys.path:
+    sys.path.insert(0, _BENCH_DIR)
+
+from synthetic import generate_offers
+
+from main import _offers_to_cache_payload
+from src.models import JobOffer
+from src.storage import SQLiteOfferStore
+
+# Imported by the interpreter before any project code runs.
+_STARTUP_MODULES = {"site", "encodings", "_frozen_importlib_external", "zipimport", "codecs", "io", "abc"}
+CACHED_LIMIT = 30
+
+
+@dataclass
+class Scenario:
+    name: str
+    argv: list[str]
+    forbidden: tuple[str, ...]
+    budgeted: bool = True
+
+
+def _scenarios(workdir: Path) -> list[Scenario]:
+    return [
+        Scenario(
+            name="show_db.query",
+            argv=[str(_PROJECT_ROOT / "scripts" / "show_db.py"), "--db", str(workdir / "bench.db"), "-n", "5"],
+            forbidden=("pydantic", "selenium", "requests", "bs4"),
+        ),
+        Scenario(
+            name="main.cached",
+            argv=[
+                str(_PROJECT_ROOT / "main.py"),
+                "--sources", "justjoinit",
+                "-n", str(CACHED_LIMIT),
+                "--cache-ttl", "3600",
+                "--dry-run",
+                "--summary-only",
+                "--log-level", "WARNING",
+            ],
+            forbidden=("selenium", "requests", "bs4"),
+        ),
+    ]
+
+
+def _prepare(workdir: Path) -> None:
+    offers = list(generate_offers(200))
+    SQLiteOfferStore(db_path=workdir / "bench.db").save_offers(offers)
+    # Synthetic offers skip validation; validate the cached ones so they serialize cleanly.
+    cached = [JobOffer.model_validate({name: getattr(offer, name) for name in JobOffer.model_fields}) for offer in offers[:CACHED_LIMIT]]
+    cache = {f"justjoinit:{CACHED_LIMIT}": {"ts": time.time(), "offers": _offers_to_cache_payload(cached)}}
+    (workdir / ".jobpulse_cache.json").write_text(json.dumps(cache), encoding="utf-8")
+
+
+def _parse_importtime(stderr: str) -> tuple[float, list[tuple[str, float]], set[str]]:
+    """Return (project import ms, top-level imports by cumulative ms, all module names)."""
+    top_level: list[tuple[str, float]] = []
+    modules: set[str] = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        module = name.strip()
+        modules.add(module)
+        if name.startswith(" ") and not name.startswith("  ") and module not in _STARTUP_MODULES:
+            top_level.append((module, int(cumulative) / 1000))
+    total = sum(ms for _, ms in top_level)
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return total, top_level, modules
+
+
+def _run_scenario(scenario: Scenario, workdir: Path, repeat: int) -> dict:
+    env = {key: value for key, value in os.environ.items() if key != "JOBPULSE_RECORD_DIR"}
+    wall: list[float] = []
+    imports: list[float] = []
+    top: list[tuple[str, float]] = []
+    loaded: set[str] = set()
+    for _ in range(repeat + 1):  # first run warms the bytecode cache
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *scenario.argv],
+            cwd=workdir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        elapsed = time.perf_counter() - start
+        if completed.returncode != 0:
+            raise RuntimeError(f"{scenario.name} exited with {completed.returncode}:\n{completed.stderr[-2000:]}")
+        import_ms, top, loaded = _parse_importtime(completed.stderr)
+        wall.append(elapsed * 1000)
+        imports.append(import_ms)
+
+    wall, imports = wall[1:], imports[1:]
+    return {
+        "name": scenario.name,
+        "wall_ms": round(statistics.median(wall), 1),
+        "import_ms": round(statistics.median(imports), 1),
+        "top_imports": [{"module": module, "ms": round(ms, 1)} for module, ms in top[:8]],
+        "forbidden_loaded": sorted(module for module in scenario.forbidden if module in loaded),
+        "budgeted": scenario.budgeted,
+    }
+
+
+def _failed(result: dict, budget_ms: float) -> bool:
+    over_budget = result["budgeted"] and result["import_ms"] > budget_ms
+    return over_budget or bool(result["forbidden_loaded"])
+
+
+def _print_results(results: list[dict], budget_ms: float) -> None:
+    for result in results:
+        status = "FAIL" if _failed(result, budget_ms) else "ok"
+        print(f"{result['name']:<16} wall={result['wall_ms']:>7.1f} ms  imports={result['import_ms']:>7.1f} ms  [{status}]")
+        for entry in result["top_imports"]:
+            print(f"    {entry['module']:<32} {entry['ms']:>7.1f} ms")
+        if result["forbidden_loaded"]:
+            print(f"    forbidden modules loaded: {', '.join(result['forbidden_loaded'])}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure JobPulse CLI startup with python -X importtime")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario, median reported (default: 5)")
+    parser.add_argument(
+        "--budget-ms", type=float, default=100.0, help="Max import time per scenario in ms (default: 100)"
+    )
+    parser.add_argument("--json", help="Write results to a JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="jobpulse-startup-") as tmp:
+        workdir = Path(tmp)
+        _prepare(workdir)
+        results = [_run_scenario(scenario, workdir, max(1, args.repeat)) for scenario in _scenarios(workdir)]
+
+    _print_results(results, args.budget_ms)
+
+    if args.json:
+        report = {
+            "benchmark": "startup",
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "budget_ms": args.budget_ms,
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Wrote {args.json}")
+
+    sys.exit(1 if any(_failed(result, args.budget_ms) for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
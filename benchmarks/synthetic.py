@@ -0,0 +1,114 @@
+"""Synthetic JobOffer generator with roughly realistic Polish IT market distributions."""
+
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from src.models import JobOffer
+
+CITIES = {
+    "Warszawa": 35,
+    "Kraków": 18,
+    "Wrocław": 12,
+    "Remote": 14,
+    "Gdańsk": 7,
+    "Poznań": 6,
+    "Łódź": 4,
+    "Katowice": 4,
+}
+WORKPLACE_TYPES = {"hybrid": 45, "remote": 30, "office": 15, "unknown": 10}
+EMPLOYMENT_TYPES = {"b2b": 55, "permanent": 35, "uz": 3, None: 7}
+SENIORITY = {"Junior": 15, "Mid": 35, "Senior": 35, "Lead": 10, "Principal": 5}
+ROLES = {
+    "Python Developer": ["Python", "Django", "FastAPI", "SQL", "Docker", "AWS", "PostgreSQL", "Celery"],
+    "Java Developer": ["Java", "Spring", "Kafka", "SQL", "Kubernetes", "Microservices", "Hibernate"],
+    "Frontend Developer": ["JavaScript", "TypeScript", "React", "Angular", "CSS", "HTML", "Redux"],
+    "DevOps Engineer": ["Kubernetes", "Docker", "Terraform", "AWS", "GCP", "Linux", "Ansible", "CI/CD"],
+    "Data Engineer": ["Python", "Spark", "Airflow", "SQL", "Kafka", "Databricks", "Scala"],
+    ".NET Developer": ["C#", ".NET", "Azure", "SQL", "Entity Framework", "Docker"],
+    "QA Engineer": ["Selenium", "Python", "Java", "Cypress", "Pytest", "Postman"],
+    "ML Engineer": ["Python", "PyTorch", "TensorFlow", "MLOps", "Kubernetes", "SQL"],
+    "Go Developer": ["Go", "gRPC", "PostgreSQL", "Docker", "Kubernetes"],
+}
+ROLE_WEIGHTS = [22, 16, 15, 10, 10, 9, 8, 6, 4]
+SENIORITY_SALARY = {"Junior": 9000, "Mid": 16000, "Senior": 23000, "Lead": 28000, "Principal": 33000}
+
+
+@dataclass
+class SyntheticConfig:
+    seed: int = 42
+    duplicate_rate: float = 0.2  # share of offers re-emitting an earlier (source, external_id)
+    salary_change_rate: float = 0.1  # share of duplicates whose salary moved
+    undisclosed_salary_rate: float = 0.2
+    companies: int = 2000
+    days: int = 90
+
+
+def _weighted(rng: random.Random, table: dict):
+    return rng.choices(list(table), weights=list(table.values()))[0]
+
+
+def generate_offers(count: int, config: SyntheticConfig | None = None) -> Iterator[JobOffer]:
+    """Yield *count* offers; a ``duplicate_rate`` share repeats earlier offers."""
+    config = config or SyntheticConfig()
+    rng = random.Random(config.seed)
+    companies = [f"Company {index:05d}" for index in range(config.companies)]
+    company_weights = [1 / (rank + 1) for rank in range(config.companies)]  # Zipf-like
+    roles = list(ROLES)
+    start = datetime.utcnow() - timedelta(days=config.days)
+    emitted: list[JobOffer] = []
+
+    for index in range(count):
+        scraped_at = start + timedelta(seconds=config.days * 86400 * index / max(count, 1))
+        if emitted and rng.random() < config.duplicate_rate:
+            previous = emitted[rng.randrange(len(emitted))]
+            update = {"scraped_at": scraped_at}
+            if previous.salary_min_pln is not None and rng.random() < config.salary_change_rate:
+                bump = rng.choice([1000, 2000, -1000])
+                update["salary_min_pln"] = max(0, previous.salary_min_pln + bump)
+                update["salary_max_pln"] = max(0, (previous.salary_max_pln or 0) + bump)
+            yield previous.model_copy(update=update)
+            continue
+
+        role_index = rng.choices(range(len(roles)), weights=ROLE_WEIGHTS)[0]
+        role = roles[role_index]
+        seniority = _weighted(rng, SENIORITY)
+        company = rng.choices(companies, weights=company_weights)[0]
+        city = _weighted(rng, CITIES)
+        workplace_type = "remote" if city == "Remote" else _weighted(rng, WORKPLACE_TYPES)
+        employment_type = _weighted(rng, EMPLOYMENT_TYPES)
+
+        salary_min = salary_max = None
+        if rng.random() >= config.undisclosed_salary_rate:
+            base = SENIORITY_SALARY[seniority] * math.exp(rng.gauss(0, 0.2))
+            salary_min = int(round(base, -2))
+            salary_max = int(round(base * rng.uniform(1.15, 1.45), -2))
+
+        pool = ROLES[role]
+        skills = rng.sample(pool, k=min(len(pool), rng.randint(3, 6)))
+        source = "justjoinit" if rng.random() < 0.7 else "theprotocol"
+        slug = f"{company.lower().replace(' ', '-')}-{seniority.lower()}-{role.lower().replace(' ', '-').replace('.', '')}-{index}"
+
+        offer = JobOffer.model_construct(
+            source=source,
+            external_id=slug,
+            title=f"{seniority} {role}",
+            company=company,
+            city=city,
+            workplace_type=workplace_type,
+            employment_type=employment_type,
+            salary_min_pln=salary_min,
+            salary_max_pln=salary_max,
+            currency="PLN",
+            skills=skills,
+            offer_url=f"https://{source}.example/job-offer/{slug}",
+            published_at=None,
+            scraped_at=scraped_at,
+        )
+        if len(emitted) < 100_000:
+            emitted.append(offer)
+        else:
+            emitted[rng.randrange(len(emitted))] = offer
+        yield offer
@@ -1,18 +1,24 @@
 import argparse
-import csv
 import json
 import logging
 import os
+import re
 import sys
 import time
+from dataclasses import asdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from src.config import AppConfig, ConfigError, load_config
-from src.filters import OfferFilter, filter_offers
 from src.logger import setup_logging
 from src.models import JobOffer
-from src.scrapers import get_scrapers
-from src.storage import SQLiteOfferStore
+from src.scrapers import UnknownSourceError, check_sources, get_scrapers, run_scrapers
+
+if TYPE_CHECKING:
+    from src.filters import OfferFilter
+
+# Storage, filters and exporters are imported where they are used: a cached --dry-run
+# never touches the store or an export, and startup stays within the bench_startup budget.
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +74,19 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--output",
-        help="Export filtered offers to a file (.csv or .json)",
+        help="Export filtered offers to a file; format from extension "
+        "(.json, .jsonl, .csv, optionally .gz/.bz2/.xz/.zst, or .parquet/.arrow with pyarrow)",
+    )
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Fetch detail pages of newly stored offers to fill in missing fields",
+    )
+    parser.add_argument(
+        "--enrich-limit",
+        type=int,
+        default=200,
+        help="Max detail pages to fetch per run with --enrich (default: 200)",
     )
     parser.add_argument(
         "--cache-path",
@@ -116,6 +134,51 @@ def parse_args() -> argparse.Namespace:
         default="profiles.json",
         help="Path to profiles file (default: profiles.json)",
     )
+    parser.add_argument(
+        "--from-db",
+        action="store_true",
+        help="Do not scrape: run the filters (config/profile/CLI) against offers already in the database",
+    )
+    parser.add_argument(
+        "--since",
+        help="With --from-db: only offers scraped on/after this ISO date (e.g. 2025-03-01)",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Split this run into scrape tasks on the work queue and exit (run them with --worker)",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Claim scrape tasks from the work queue and save their offers until the queue is drained",
+    )
+    parser.add_argument(
+        "--queue",
+        help="Work queue path or sqlite:/// URL (overrides config queue_path)",
+    )
+    parser.add_argument(
+        "--batch",
+        help="Batch name for --enqueue; re-enqueueing the same batch adds nothing (default: today's UTC date)",
+    )
+    parser.add_argument(
+        "--pages-per-task",
+        type=int,
+        default=5,
+        help="Listing pages per task for paginated sources with --enqueue (default: 5)",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=120.0,
+        help="Task lease for --worker; renewed while the task runs (default: 120)",
+    )
+    parser.add_argument(
+        "--worker-idle",
+        type=float,
+        default=0.0,
+        help="Seconds a --worker keeps polling an empty queue before exiting (default: 0)",
+    )
     return parser.parse_args()
 
 
@@ -139,26 +202,15 @@ def _offer_to_export_row(offer: "JobOffer") -> dict:
 
 
 def _export_offers(offers: list["JobOffer"], output_path: str) -> None:
-    if output_path.lower().endswith(".json"):
-        data = [_offer_to_export_row(offer) for offer in offers]
-        with open(output_path, "w", encoding="utf-8") as handle:
-            json.dump(data, handle, ensure_ascii=False, indent=2)
-        logger.info("Exported %d offers to %s", len(offers), output_path)
-        return
+    from src.exporters import ExportError, export_rows
 
-    if output_path.lower().endswith(".csv"):
-        data = [_offer_to_export_row(offer) for offer in offers]
-        if not data:
-            logger.warning("No offers to export (CSV)")
-            return
-        with open(output_path, "w", encoding="utf-8", newline="") as handle:
-            writer = csv.DictWriter(handle, fieldnames=list(data[0].keys()))
-            writer.writeheader()
-            writer.writerows(data)
-        logger.info("Exported %d offers to %s", len(offers), output_path)
+    try:
+        written = export_rows((_offer_to_export_row(offer) for offer in offers), output_path)
+    except ExportError as exc:
+        logger.error("Export failed: %s", exc)
         return
-
-    logger.error("Unsupported output format for %s (use .csv or .json)", output_path)
+    if not written:
+        logger.warning("No offers to export")
 
 
 def _load_cache(cache_path: Path) -> dict:
@@ -235,6 +287,128 @@ def _apply_profile(config: AppConfig, profile_data: dict) -> None:
         config.limit = profile_data.get("limit")
 
 
+def _build_offer_filter(config: AppConfig, args: argparse.Namespace) -> "OfferFilter":
+    from src.filters import OfferFilter
+
+    if args.title_regex:
+        try:
+            re.compile(args.title_regex)
+        except re.error as exc:
+            print(f"[config error] Invalid title regex {args.title_regex!r}: {exc}", file=sys.stderr)
+            sys.exit(1)
+    return OfferFilter(
+        min_salary_pln=config.filters.min_salary_pln,
+        city=config.filters.city,
+        must_have_skills=config.filters.must_have_skills,
+        skills_match=args.skills_match,
+        title_regex=args.title_regex,
+        workplace_type=args.workplace,
+    )
+
+
+def _run_backfill(args: argparse.Namespace, config: AppConfig, sources: list[str]) -> None:
+    """``--from-db``: select stored offers matching the run's filters; the filter runs as SQL in the store."""
+    from src.exporters import ExportError, export_rows
+    from src.storage import OfferQuery, open_store
+
+    start_time = time.time()
+    try:
+        store = open_store(config.db_path)
+    except ImportError as exc:
+        print(f"[config error] {exc}", file=sys.stderr)
+        sys.exit(1)
+    offer_filter = _build_offer_filter(config, args)
+    offer_filter.sources = sources
+    try:
+        rows = list(store.iter_offers(OfferQuery(offer_filter=offer_filter, scraped_since=args.since, limit=0)))
+    except ValueError as exc:
+        print(f"[config error] {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        try:
+            export_rows(rows, args.output)
+        except ExportError as exc:
+            logger.error("Export failed: %s", exc)
+
+    duration = time.time() - start_time
+    print("\n" + "=" * 50)
+    print("JOBPULSE DATABASE QUERY SUMMARY")
+    print("=" * 50)
+    print(f"Total time:       {duration:.2f}s")
+    print(f"Sources:          {', '.join(sources)}")
+    print(f"Offers matched:   {len(rows)}")
+    print("-" * 50)
+    if not args.summary_only:
+        for index, row in enumerate(rows, start=1):
+            if args.max_print and index > args.max_print:
+                break
+            salary = _format_salary(row["salary_min_pln"], row["salary_max_pln"])
+            skills_preview = ", ".join(row["skills"][:4]) if row["skills"] else "brak"
+            print(
+                f"{index}. {row['title']} | {row['company']} | {row['city'] or '?'} | "
+                f"salary: {salary} | skills: {skills_preview}"
+            )
+    print("=" * 50)
+    if args.summary_json:
+        summary = {
+            "duration_seconds": round(duration, 2),
+            "sources": sources,
+            "offers_matched": len(rows),
+            "from_db": True,
+        }
+        _write_summary_json(args.summary_json, summary)
+
+
+def _run_queue_mode(args: argparse.Namespace, config: AppConfig, sources: list[str]) -> None:
+    """``--enqueue``: plan tasks for *sources*; ``--worker``: run queued tasks into the store."""
+    from src.storage import open_store
+    from src.workqueue import QueueWorker, open_queue, plan_tasks
+
+    queue_dsn = args.queue or config.queue_path
+    try:
+        queue = open_queue(queue_dsn)
+    except ValueError as exc:
+        print(f"[config error] {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.enqueue:
+        batch = args.batch or time.strftime("%Y-%m-%d", time.gmtime())
+        specs = plan_tasks(sources, config.limit, pages_per_task=args.pages_per_task)
+        added = queue.enqueue(specs, batch=batch)
+        print(f"Queued {added} of {len(specs)} tasks (batch {batch}) in {queue_dsn}")
+        if not args.worker:
+            return
+
+    try:
+        store = open_store(config.db_path)
+    except ImportError as exc:
+        print(f"[config error] {exc}", file=sys.stderr)
+        sys.exit(1)
+    worker = QueueWorker(
+        queue,
+        store,
+        offer_filter=_build_offer_filter(config, args),
+        lease_seconds=args.lease_seconds,
+        idle_wait=args.worker_idle,
+    )
+    stats = worker.run()
+
+    print("\n" + "=" * 50)
+    print(f"JOBPULSE WORKER SUMMARY ({worker.worker_id})")
+    print("=" * 50)
+    print(f"Tasks done:       {stats.tasks}")
+    print(f"Failed attempts:  {stats.failed}")
+    print(f"Leases lost:      {stats.lost}")
+    print(f"Offers matched:   {stats.offers}")
+    print(f"New saved:        {stats.inserted}")
+    print(f"Queue:            {queue.counts()}")
+    print("=" * 50)
+    if args.summary_json:
+        summary = {"worker_id": worker.worker_id, **asdict(stats), "queue": queue.counts()}
+        _write_summary_json(args.summary_json, summary)
+
+
 def main() -> None:
     start_time = time.time()
     args = parse_args()
@@ -270,53 +444,85 @@ def main() -> None:
 
     logger.info("Starting JobPulse (dry-run=%s) sources=%s limit=%d", args.dry_run, config.sources, config.limit)
     
-    scrapers = get_scrapers(config.sources)
-    if not scrapers:
-        logger.warning("No valid scrapers enabled. Check your config/sources.")
+    sources = list(dict.fromkeys(config.sources))
+    if not sources:
+        logger.warning("No sources enabled. Check your config/sources.")
+        return
+    try:
+        check_sources(sources)
+    except UnknownSourceError as exc:
+        print(f"[config error] {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.from_db:
+        _run_backfill(args, config, sources)
+        return
+    if args.enqueue or args.worker:
+        _run_queue_mode(args, config, sources)
         return
 
     cache_path = Path(args.cache_path)
     cache_data = _load_cache(cache_path)
 
-    offers = []
-    for scraper in scrapers:
-        cache_key = f"{scraper.source}:{config.limit}"
+    offers_by_source: dict[str, list["JobOffer"]] = {}
+    for source in sources:
+        cache_key = f"{source}:{config.limit}"
         cache_entry = cache_data.get(cache_key) if isinstance(cache_data, dict) else None
         if not args.no_cache and _should_use_cache(cache_entry or {}, args.cache_ttl):
             logger.info("Cache hit for %s (ttl=%ss)", cache_key, args.cache_ttl)
-            cached_offers = _offers_from_cache_payload(cache_entry.get("offers", []))
-            offers.extend(cached_offers)
-            continue
-
-        fresh_offers = scraper.fetch_offers(limit=config.limit)
-        offers.extend(fresh_offers)
-
+            offers_by_source[source] = _offers_from_cache_payload(cache_entry.get("offers", []))
+
+    # Scrapers are instantiated (and their modules imported) only on a cache miss.
+    pending = [source for source in sources if source not in offers_by_source]
+    if pending:
+        fresh = run_scrapers(get_scrapers(pending), limit=config.limit, webdriver_budget=config.webdriver_budget)
+        offers_by_source.update(fresh)
+        # Failed sources are missing from *fresh*: nothing is cached for them, so the next run retries.
         if args.cache_ttl > 0 and not args.no_cache:
-            cache_data[cache_key] = {
-                "ts": time.time(),
-                "offers": _offers_to_cache_payload(fresh_offers),
-            }
+            for source, fresh_offers in fresh.items():
+                cache_data[f"{source}:{config.limit}"] = {
+                    "ts": time.time(),
+                    "offers": _offers_to_cache_payload(fresh_offers),
+                }
+
+    offers = [offer for source in sources for offer in offers_by_source.get(source, [])]
 
     if args.cache_ttl > 0 and not args.no_cache:
         _save_cache(cache_path, cache_data)
 
-    offer_filter = OfferFilter(
-        min_salary_pln=config.filters.min_salary_pln,
-        city=config.filters.city,
-        must_have_skills=config.filters.must_have_skills,
-        skills_match=args.skills_match,
-        title_regex=args.title_regex,
-        workplace_type=args.workplace,
-    )
-    filtered_offers = filter_offers(offers, offer_filter)
+    from src.filters import filter_offers
+
+    filtered_offers = filter_offers(offers, _build_offer_filter(config, args))
 
     if args.output:
         _export_offers(filtered_offers, args.output)
 
     inserted = 0
+    enriched = 0
     if not args.dry_run:
-        store = SQLiteOfferStore(db_path=config.db_path)
+        from src.storage import PartitionedSQLiteStore, open_store
+
+        try:
+            store = open_store(config.db_path)
+        except ImportError as exc:
+            print(f"[config error] {exc}", file=sys.stderr)
+            sys.exit(1)
         inserted = store.save_offers(filtered_offers)
+        if store.supports_history:
+            store.compact_history(
+                raw_days=config.history_raw_days,
+                retention_days=config.history_retention_days,
+            )
+        if isinstance(store, PartitionedSQLiteStore):
+            store.compact_partitions(keep_months=config.partition_hot_months)
+        if config.snapshot_path:
+            from src.storage.snapshot import build_snapshot
+
+            build_snapshot(store, config.snapshot_path, days=config.snapshot_days)
+        if args.enrich:
+            from src.enrichment import enrich_pending  # pulls in requests; keep it off the default path
+
+            enriched = enrich_pending(store, limit=args.enrich_limit)["enriched"]
     else:
         logger.info("Dry-run enabled: skipping DB save")
 
@@ -327,6 +533,7 @@ def main() -> None:
         "offers_fetched": len(offers),
         "offers_matched": len(filtered_offers),
         "new_saved": inserted,
+        "enriched": enriched,
         "dry_run": args.dry_run,
     }
     
@@ -339,6 +546,8 @@ def main() -> None:
     print(f"Offers fetched:   {len(offers)}")
     print(f"Offers matched:   {len(filtered_offers)}")
     print(f"New saved:        {inserted} {'(dry-run)' if args.dry_run else ''}")
+    if args.enrich:
+        print(f"Enriched:         {enriched}")
     print("-" * 50)
 
     if not args.summary_only:
@@ -0,0 +1,52 @@
+"""Build the read-only offer snapshot for memory-mapped readers, once or periodically."""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path so `src` package is importable.
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from src.storage import open_store
+from src.storage.snapshot import build_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write recent offers to a columnar snapshot file.")
+    parser.add_argument("--db", default="jobpulse.db", help="Store path or DSN (default: jobpulse.db)")
+    parser.add_argument("--out", default="jobpulse.snapshot", help="Snapshot file (default: jobpulse.snapshot)")
+    parser.add_argument("--days", type=int, default=30, help="Offers scraped in the last N days, 0 = all (default: 30)")
+    parser.add_argument("--every", type=float, default=0, metavar="SECONDS", help="Rebuild every N seconds (default: once)")
+    return parser.parse_args(argv)
+
+
+def main(args: argparse.Namespace | None = None) -> None:
+    if args is None:
+        args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    try:
+        store = open_store(args.db)
+    except (ImportError, ValueError) as exc:
+        print(f"Cannot open {args.db}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    while True:
+        started = time.monotonic()
+        build_snapshot(store, args.out, days=args.days)
+        if args.every <= 0:
+            return
+        time.sleep(max(0.0, args.every - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -4,14 +4,21 @@ import argparse
 import csv
 import io
 import json
+import os
+import re
 import sys
+import textwrap
 from pathlib import Path
+from typing import Iterable
 
 # Ensure project root is on sys.path so `src` package is importable.
 _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
 if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
+from src.exporters import ExportError, export_rows
+from src.filters import OfferFilter, profile_filter
+from src.storage.partitioned_store import PartitionedSQLiteStore
 from src.storage.sqlite_store import SQLiteOfferStore, OfferQuery
 
 _DISPLAY_COLUMNS = ("title", "company", "city", "salary", "source")
@@ -28,14 +35,92 @@ def _offer_query_from_args(args: argparse.Namespace) -> OfferQuery:
         source=args.source,
         min_salary=args.min_salary,
         limit=args.limit,
+        city_match=args.city_match,
+        company_match=args.company_match,
+        skill_match=args.skill_match,
+        before_id=args.before_id,
+        scraped_since=args.since,
+        scraped_until=args.until,
+        offer_filter=_offer_filter_from_args(args),
     )
 
 
+def _offer_filter_from_args(args: argparse.Namespace) -> OfferFilter | None:
+    """Profile filters (``--profile``) overridden by --skills/--title-regex/--workplace; ``None`` if unused."""
+    if not (args.profile or args.skills or args.title_regex or args.workplace):
+        return None
+    offer_filter = OfferFilter()
+    if args.profile:
+        profiles_path = Path(args.profiles_path)
+        try:
+            profiles = json.loads(profiles_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"Cannot read profiles file {profiles_path}: {exc}", file=sys.stderr)
+            sys.exit(1)
+        profile_data = profiles.get(args.profile) if isinstance(profiles, dict) else None
+        if not isinstance(profile_data, dict):
+            print(f"Profile '{args.profile}' not found in {profiles_path}", file=sys.stderr)
+            sys.exit(1)
+        offer_filter = profile_filter(profile_data)
+    if args.skills:
+        offer_filter.must_have_skills = [skill.strip() for skill in args.skills.split(",") if skill.strip()]
+    if args.skills_match:
+        offer_filter.skills_match = args.skills_match
+    if args.title_regex:
+        offer_filter.title_regex = args.title_regex
+    if args.workplace:
+        offer_filter.workplace_type = args.workplace
+    if offer_filter.title_regex:
+        try:
+            re.compile(offer_filter.title_regex)
+        except re.error as exc:
+            print(f"Invalid title regex {offer_filter.title_regex!r}: {exc}", file=sys.stderr)
+            sys.exit(1)
+    return offer_filter
+
+
+# Filters that must be answered from an index (substring LIKEs always scan).
+_EXPLAIN_PROBES: dict[str, OfferQuery] = {
+    "source": OfferQuery(source="justjoinit"),
+    "min-salary": OfferQuery(min_salary=15000),
+    "city exact": OfferQuery(city="Warszawa", city_match="exact"),
+    "city prefix": OfferQuery(city="War", city_match="prefix"),
+    "company exact": OfferQuery(company="SCALO", company_match="exact"),
+    "company prefix": OfferQuery(company="SCA", company_match="prefix"),
+    "source + min-salary": OfferQuery(source="justjoinit", min_salary=15000),
+    "skills (all)": OfferQuery(offer_filter=OfferFilter(must_have_skills=["python", "docker"])),
+    "skills (any)": OfferQuery(offer_filter=OfferFilter(must_have_skills=["python", "go"], skills_match="any")),
+}
+
+
+def _is_full_scan(plan: list[str]) -> bool:
+    # Partitioned stores report one "SCAN pN.offers" line per attached partition.
+    # Scans of the small companies/cities lookup tables do not count.
+    return any(detail.startswith("SCAN ") and detail.split()[1].rpartition(".")[2] == "offers" for detail in plan)
+
+
+def _run_explain(store: SQLiteOfferStore, extra: OfferQuery | None) -> int:
+    """Print query plans for supported filters; return number of full scans."""
+    probes = dict(_EXPLAIN_PROBES)
+    if extra is not None:
+        probes["current args"] = extra
+
+    full_scans = 0
+    for name, query in probes.items():
+        plan = store.explain_query(query)
+        scan = _is_full_scan(plan)
+        full_scans += scan
+        print(f"[{'FULL SCAN' if scan else 'ok':>9}] {name}")
+        for detail in plan:
+            print(f"             {detail}")
+    return full_scans
+
+
 # ---------------------------------------------------------------------------
 # Output formatters
 # ---------------------------------------------------------------------------
 
-def _output_text(rows: list[dict], total: int, verbose: bool) -> None:
+def _output_text(rows: list[dict], total: int, verbose: bool, limit: int) -> None:
     """Default human-readable output."""
     print(f"Total rows in DB: {total}")
     print(f"Matching rows: {len(rows)}")
@@ -49,21 +134,39 @@ def _output_text(rows: list[dict], total: int, verbose: bool) -> None:
             print(f"    url:    {row['offer_url']}")
         print()
 
+    if rows and len(rows) == limit:
+        print(f"Next page: --before-id {rows[-1]['id']}")
 
-def _output_csv(rows: list[dict]) -> None:
-    """CSV output to stdout — pipe-friendly."""
+
+def _output_csv(rows: Iterable[dict]) -> None:
+    """CSV output to stdout — pipe-friendly, written row by row."""
     writer = csv.DictWriter(
         sys.stdout,
         fieldnames=_CSV_COLUMNS,
         extrasaction="ignore",
     )
     writer.writeheader()
-    writer.writerows(rows)
+    for row in rows:
+        writer.writerow(row)
 
 
-def _output_json(rows: list[dict]) -> None:
-    """JSON array output to stdout."""
-    print(json.dumps(rows, ensure_ascii=False, indent=2))
+def _output_json(rows: Iterable[dict]) -> None:
+    """JSON array output to stdout, streamed one element at a time."""
+    out = sys.stdout
+    first = True
+    for row in rows:
+        out.write("[\n" if first else ",\n")
+        out.write(textwrap.indent(json.dumps(row, ensure_ascii=False, indent=2), "  "))
+        first = False
+    out.write("[]\n" if first else "\n]\n")
+
+
+def _output_jsonl(rows: Iterable[dict]) -> None:
+    """JSON Lines output to stdout (one compact object per line)."""
+    out = sys.stdout
+    for row in rows:
+        out.write(json.dumps(row, ensure_ascii=False))
+        out.write("\n")
 
 
 def _output_table(rows: list[dict]) -> None:
@@ -101,6 +204,42 @@ def _output_table(rows: list[dict]) -> None:
         print(line)
 
 
+def _output_history(entries: list[dict], source: str, external_id: str) -> None:
+    """Offer history: daily aggregates first, then raw observations."""
+    if not entries:
+        print(f"No history for {source}:{external_id}")
+        return
+
+    print(f"History for {source}:{external_id}")
+    for entry in entries:
+        changes = ", ".join(f"{key}={value}" for key, value in entry["changes"].items()) or "(unchanged)"
+        print(
+            f"  [{entry['kind']:<11}] {entry['first_seen'][:19]} .. {entry['last_seen'][:19]} "
+            f"x{entry['seen_count']} | {changes}"
+        )
+
+
+def _output_stats(results: list[dict], group_by: str | None) -> None:
+    """Market stats table: offer counts and salary percentiles per group."""
+    if not results:
+        print("(no results)")
+        return
+
+    columns = ("group", "offers", "salary_offers", "p25", "p50", "p75", "p90")
+    header_names = {"group": (group_by or "scope").upper(), "salary_offers": "WITH SALARY"}
+    widths = {col: len(header_names.get(col, col.upper())) for col in columns}
+    for result in results:
+        for col in columns:
+            widths[col] = max(widths[col], len(str(result[col] if result[col] is not None else "-")))
+
+    print(" | ".join(header_names.get(col, col.upper()).ljust(widths[col]) for col in columns))
+    print("-+-".join("-" * widths[col] for col in columns))
+    for result in results:
+        print(" | ".join(
+            str(result[col] if result[col] is not None else "-").ljust(widths[col]) for col in columns
+        ))
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -114,20 +253,57 @@ def main(args: argparse.Namespace | None = None) -> None:
         print(f"Database not found: {db_file}", file=sys.stderr)
         sys.exit(1)
 
-    store = SQLiteOfferStore(db_path=args.db)
-    total = store.count()
+    # A directory is a monthly-partitioned store (sqlite+monthly:///DIR in config).
+    store = PartitionedSQLiteStore(db_file) if db_file.is_dir() else SQLiteOfferStore(db_path=args.db)
+
+    if args.command == "history":
+        _output_history(store.offer_history(args.source_name, args.external_id), args.source_name, args.external_id)
+        return
+    if args.command == "explain":
+        query = _offer_query_from_args(args)
+        has_filters = any([args.city, args.company, args.skill, args.title, args.source, args.min_salary is not None])
+        full_scans = _run_explain(store, query if has_filters or query.offer_filter else None)
+        if full_scans:
+            print(f"{full_scans} quer{'y' if full_scans == 1 else 'ies'} fall back to a full table scan", file=sys.stderr)
+            sys.exit(1)
+        return
+    if args.command == "stats":
+        if args.rebuild:
+            store.rebuild_market_stats()
+        results = store.market_stats(
+            skill=args.stats_skill,
+            city=args.stats_city,
+            workplace_type=args.stats_workplace,
+            employment_type=args.stats_employment,
+            weeks=args.weeks,
+            group_by=args.by,
+        )
+        _output_stats(results, args.by)
+        return
+
     query = _offer_query_from_args(args)
-    rows = store.query_offers(query)
+
+    if args.output:
+        try:
+            written = export_rows(store.iter_offers(query), args.output)
+        except ExportError as exc:
+            print(f"Export failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Exported {written} offers to {args.output}", file=sys.stderr)
+        return
 
     fmt = args.format
+    # Machine-readable formats stream straight from the keyset cursor.
     if fmt == "csv":
-        _output_csv(rows)
+        _output_csv(store.iter_offers(query))
     elif fmt == "json":
-        _output_json(rows)
+        _output_json(store.iter_offers(query))
+    elif fmt == "jsonl":
+        _output_jsonl(store.iter_offers(query))
     elif fmt == "table":
-        _output_table(rows)
+        _output_table(store.query_offers(query))
     else:
-        _output_text(rows, total, args.verbose)
+        _output_text(store.query_offers(query), store.count(), args.verbose, args.limit)
 
 
 def _format_salary(sal_min: int | None, sal_max: int | None) -> str:
@@ -149,27 +325,104 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         "--db", default="jobpulse.db", help="Path to SQLite database (default: jobpulse.db)"
     )
     parser.add_argument(
-        "-n", "--limit", type=int, default=20, help="Max rows to display (default: 20)"
+        "-n", "--limit", type=int, default=20, help="Max rows to display, 0 for all (default: 20)"
+    )
+    parser.add_argument(
+        "--before-id", type=int, help="Keyset cursor: only offers with id below this (next page)"
+    )
+    parser.add_argument("--city", help="Filter by city (see --city-match)")
+    parser.add_argument("--company", help="Filter by company (see --company-match)")
+    parser.add_argument(
+        "--city-match",
+        choices=["contains", "prefix", "exact"],
+        default="contains",
+        help="City matching: substring (default), indexed prefix or indexed exact",
+    )
+    parser.add_argument(
+        "--company-match",
+        choices=["contains", "prefix", "exact"],
+        default="contains",
+        help="Company matching: substring (default), indexed prefix or indexed exact",
+    )
+    parser.add_argument("--skill", help="Filter by skill name (see --skill-match)")
+    parser.add_argument(
+        "--skill-match",
+        choices=["contains", "exact"],
+        default="contains",
+        help="Skill matching: substring of the skill list (default) or one whole skill, case-insensitive",
+    )
+    parser.add_argument(
+        "--skills",
+        help="Comma-separated skills, normalized like main.py --skills and looked up in the skill index",
+    )
+    parser.add_argument(
+        "--skills-match",
+        choices=["all", "any"],
+        help="Require all (default) or any of --skills",
     )
-    parser.add_argument("--city", help="Filter by city (substring match)")
-    parser.add_argument("--company", help="Filter by company (substring match)")
-    parser.add_argument("--skill", help="Filter by skill name (substring match in JSON)")
     parser.add_argument("--title", help="Filter by title (substring match)")
+    parser.add_argument("--title-regex", help="Filter by title regex (case-insensitive, evaluated in SQLite)")
+    parser.add_argument(
+        "--workplace",
+        choices=["remote", "hybrid", "office", "unknown"],
+        help="Filter by workplace type",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Apply the filters of a profile from --profiles-path (other filter options narrow it further)",
+    )
+    parser.add_argument(
+        "--profiles-path", default="profiles.json", help="Path to profiles file (default: profiles.json)"
+    )
     parser.add_argument("--source", help="Filter by source (exact match)")
     parser.add_argument(
         "--min-salary", type=int, help="Minimum salary in PLN (checks both min and max)"
     )
+    parser.add_argument("--since", help="Only offers scraped on/after this ISO date (e.g. 2025-03-01)")
+    parser.add_argument("--until", help="Only offers scraped before this ISO date (exclusive)")
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Show skills and URL for each offer (text format only)"
     )
     parser.add_argument(
         "-f", "--format",
-        choices=["text", "table", "csv", "json"],
+        choices=["text", "table", "csv", "json", "jsonl"],
         default="text",
         help="Output format (default: text)",
     )
+    parser.add_argument(
+        "-o", "--output",
+        help="Export matching offers to a file instead of printing (format from extension, e.g. .jsonl.zst, .parquet)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    history_parser = subparsers.add_parser("history", help="Show observation history of one offer")
+    history_parser.add_argument("source_name", metavar="SOURCE", help="Offer source (e.g. justjoinit)")
+    history_parser.add_argument("external_id", metavar="EXTERNAL_ID", help="Offer external id (slug)")
+
+    subparsers.add_parser(
+        "explain",
+        help="Show EXPLAIN QUERY PLAN for indexed filters; exit 1 if any does a full scan",
+    )
+
+    stats_parser = subparsers.add_parser("stats", help="Offer counts and salary percentiles from rollups")
+    stats_parser.add_argument("--skill", dest="stats_skill", help="Skill (normalized, e.g. python)")
+    stats_parser.add_argument("--city", dest="stats_city", help="City (exact, case-insensitive)")
+    stats_parser.add_argument(
+        "--workplace", dest="stats_workplace", choices=["remote", "hybrid", "office", "unknown"], help="Workplace type"
+    )
+    stats_parser.add_argument("--employment", dest="stats_employment", help="Employment type (e.g. b2b, permanent)")
+    stats_parser.add_argument("--weeks", type=int, help="Only include the last N ISO weeks")
+    stats_parser.add_argument(
+        "--by", choices=["week", "skill", "city", "workplace_type", "employment_type"], help="Group results by column"
+    )
+    stats_parser.add_argument("--rebuild", action="store_true", help="Recompute rollups from stored offers first")
     return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except BrokenPipeError:
+        # Streaming output was cut short by the consumer (e.g. `| head`).
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
@@ -0,0 +1,4 @@
+from .rollups import query_rollups, rebuild_rollups, update_rollups
+from .sketch import QuantileSketch
+
+__all__ = ["QuantileSketch", "query_rollups", "rebuild_rollups", "update_rollups"]
@@ -0,0 +1,267 @@
+"""Materialized market rollups keyed by week, skill, city, workplace and contract.
+
+Each stored offer contributes to one rollup row per normalized skill plus a
+``"*"`` row, so totals never double count multi-skill offers. Rows carry an
+offer count and a serialized :class:`QuantileSketch` of the salary midpoint;
+queries merge the handful of matching sketches instead of scanning offers.
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Iterable, TYPE_CHECKING
+
+from src.analytics.sketch import QuantileSketch
+from src.filters import lookup_key, normalize_skill
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+ALL_SKILLS = "*"
+GROUP_COLUMNS = ("week", "skill", "city", "workplace_type", "employment_type")
+QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+def ensure_rollup_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS offer_rollups (
+            week TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            city TEXT NOT NULL,
+            workplace_type TEXT NOT NULL,
+            employment_type TEXT NOT NULL,
+            offers INTEGER NOT NULL,
+            salary_offers INTEGER NOT NULL,
+            salary_sketch TEXT NOT NULL,
+            city_key TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (skill, week, city, workplace_type, employment_type)
+        ) WITHOUT ROWID
+        """
+    )
+    if "city_key" not in {row[1] for row in conn.execute("PRAGMA table_info(offer_rollups)")}:
+        conn.execute("ALTER TABLE offer_rollups ADD COLUMN city_key TEXT NOT NULL DEFAULT ''")
+        conn.create_function("lookup_key", 1, lookup_key, deterministic=True)
+        conn.execute("UPDATE offer_rollups SET city_key = lookup_key(city)")
+    # City filters match lookup_key(city); partitions may store different spellings of one city.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offer_rollups_city ON offer_rollups(city_key, skill, week)")
+
+
+def iso_week(moment: datetime) -> str:
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def offer_rollup_row(offer: "JobOffer") -> dict:
+    return {
+        "scraped_at": offer.scraped_at,
+        "city": offer.city,
+        "workplace_type": offer.workplace_type,
+        "employment_type": offer.employment_type,
+        "salary_min_pln": offer.salary_min_pln,
+        "salary_max_pln": offer.salary_max_pln,
+        "skills": offer.skills,
+    }
+
+
+def _salary_point(salary_min: int | None, salary_max: int | None) -> float | None:
+    if salary_min is not None and salary_max is not None:
+        return (salary_min + salary_max) / 2
+    if salary_min is not None:
+        return float(salary_min)
+    if salary_max is not None:
+        return float(salary_max)
+    return None
+
+
+def update_rollups(conn: sqlite3.Connection, rows: Iterable[dict], weight: int = 1) -> int:
+    """Fold *rows* (see :func:`offer_rollup_row`) into ``offer_rollups``.
+
+    ``weight=-1`` takes previously folded rows back out (sketch buckets are
+    exact counts, so this is lossless). Returns the number of rollup rows touched.
+    """
+    pending: dict[tuple[str, str, str, str, str], list] = {}
+    for row in rows:
+        scraped_at = row.get("scraped_at")
+        if isinstance(scraped_at, str):
+            scraped_at = datetime.fromisoformat(scraped_at)
+        week = iso_week(scraped_at or datetime.utcnow())
+        salary = _salary_point(row.get("salary_min_pln"), row.get("salary_max_pln"))
+        skills = {normalize_skill(skill) for skill in row.get("skills") or []}
+        skills.discard("")
+        skills.add(ALL_SKILLS)
+
+        for skill in skills:
+            key = (
+                skill,
+                week,
+                row.get("city") or "",
+                row.get("workplace_type") or "unknown",
+                row.get("employment_type") or "",
+            )
+            entry = pending.get(key)
+            if entry is None:
+                entry = pending[key] = [0, 0, QuantileSketch()]
+            entry[0] += weight
+            if salary is not None:
+                entry[1] += weight
+                entry[2].add(salary, weight)
+
+    for key, (offers, salary_offers, sketch) in pending.items():
+        existing = conn.execute(
+            """
+            SELECT offers, salary_offers, salary_sketch FROM offer_rollups
+            WHERE skill = ? AND week = ? AND city = ? AND workplace_type = ? AND employment_type = ?
+            """,
+            key,
+        ).fetchone()
+        if existing is not None:
+            offers += existing[0]
+            salary_offers += existing[1]
+            sketch.merge(QuantileSketch.from_json(existing[2]))
+        if offers <= 0:
+            conn.execute(
+                """
+                DELETE FROM offer_rollups
+                WHERE skill = ? AND week = ? AND city = ? AND workplace_type = ? AND employment_type = ?
+                """,
+                key,
+            )
+            continue
+        sketch.buckets = {index: count for index, count in sketch.buckets.items() if count > 0}
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO offer_rollups
+                (skill, week, city, workplace_type, employment_type, offers, salary_offers, salary_sketch, city_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (*key, offers, salary_offers, sketch.to_json(), lookup_key(key[2])),
+        )
+    return len(pending)
+
+
+_ROW_COLUMNS = "scraped_at, city, workplace_type, employment_type, salary_min_pln, salary_max_pln, skills"
+
+
+def _stored_row(record: tuple) -> dict:
+    scraped_at, city, workplace_type, employment_type, salary_min, salary_max, skills = record
+    try:
+        skills_list = json.loads(skills) if skills else []
+    except (json.JSONDecodeError, TypeError):
+        skills_list = []
+    return {
+        "scraped_at": scraped_at,
+        "city": city,
+        "workplace_type": workplace_type,
+        "employment_type": employment_type,
+        "salary_min_pln": salary_min,
+        "salary_max_pln": salary_max,
+        "skills": skills_list,
+    }
+
+
+def stored_rollup_rows(conn: sqlite3.Connection, offer_ids: list[int], table: str = "job_offers") -> list[dict]:
+    """Rollup rows (see :func:`offer_rollup_row`) for the stored offers *offer_ids* of *table*."""
+    rows: list[dict] = []
+    for start in range(0, len(offer_ids), 500):
+        chunk = offer_ids[start:start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = conn.execute(f"SELECT {_ROW_COLUMNS} FROM {table} WHERE id IN ({placeholders})", chunk)
+        rows += [_stored_row(record) for record in cursor]
+    return rows
+
+
+def rebuild_rollups(
+    conn: sqlite3.Connection, batch_size: int = 5000, table: str = "job_offers", clear: bool = True
+) -> int:
+    """Recompute all rollups from *table*; return number of offers folded.
+
+    With ``clear=False`` the offers are added to the existing rollups (used to
+    fold several partition tables one after another).
+    """
+    if clear:
+        conn.execute("DELETE FROM offer_rollups")
+    cursor = conn.execute(f"SELECT {_ROW_COLUMNS} FROM {table}")
+    total = 0
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        update_rollups(conn, [_stored_row(record) for record in batch])
+        total += len(batch)
+    logger.info("Rebuilt market rollups from %d offers", total)
+    return total
+
+
+def query_rollups(
+    conn: sqlite3.Connection,
+    skill: str | None = None,
+    city: str | None = None,
+    workplace_type: str | None = None,
+    employment_type: str | None = None,
+    weeks: int | None = None,
+    group_by: str | None = None,
+) -> list[dict]:
+    """Return offer counts and salary percentiles, optionally grouped by one column."""
+    if group_by is not None and group_by not in GROUP_COLUMNS:
+        raise ValueError(f"Unsupported group_by {group_by!r} (use one of {', '.join(GROUP_COLUMNS)})")
+
+    clauses: list[str] = []
+    params: list[object] = []
+    if skill:
+        clauses.append("skill = ?")
+        params.append(normalize_skill(skill))
+    elif group_by == "skill":
+        clauses.append("skill != ?")
+        params.append(ALL_SKILLS)
+    else:
+        clauses.append("skill = ?")
+        params.append(ALL_SKILLS)
+    if city:
+        # Partitions may store different spellings of one city ("Łódź", "ŁÓDŹ"); match them all.
+        clauses.append("city_key = ?")
+        params.append(lookup_key(city))
+    if workplace_type:
+        clauses.append("workplace_type = ?")
+        params.append(workplace_type)
+    if employment_type:
+        clauses.append("employment_type = ?")
+        params.append(employment_type)
+    if weeks:
+        clauses.append("week >= ?")
+        params.append(iso_week(datetime.utcnow() - timedelta(weeks=weeks - 1)))
+
+    group_column = group_by or "'all'"
+    sql = (
+        f"SELECT {group_column}, offers, salary_offers, salary_sketch FROM offer_rollups"
+        f" WHERE {' AND '.join(clauses)}"
+    )
+
+    groups: dict[str, list] = {}
+    labels: dict[str, str] = {}
+    for group, offers, salary_offers, raw_sketch in conn.execute(sql, params):
+        if group_by == "city":
+            group = labels.setdefault(lookup_key(group), group)
+        entry = groups.get(group)
+        if entry is None:
+            entry = groups[group] = [0, 0, QuantileSketch()]
+        entry[0] += offers
+        entry[1] += salary_offers
+        entry[2].merge(QuantileSketch.from_json(raw_sketch))
+
+    results: list[dict] = []
+    for group, (offers, salary_offers, sketch) in groups.items():
+        result: dict = {"group": group, "offers": offers, "salary_offers": salary_offers}
+        for q in QUANTILES:
+            value = sketch.quantile(q)
+            result[f"p{int(q * 100)}"] = round(value) if value is not None else None
+        results.append(result)
+
+    if group_by == "week":
+        results.sort(key=lambda r: r["group"])
+    else:
+        results.sort(key=lambda r: r["offers"], reverse=True)
+    return results
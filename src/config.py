@@ -3,7 +3,9 @@ import logging
 import os
 from pathlib import Path
 
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from src.storage.base import check_dsn
 
 ENV_PREFIX = "JOBPULSE_"
 logger = logging.getLogger(__name__)
@@ -22,9 +24,21 @@ class FilterConfig(BaseModel):
 class AppConfig(BaseModel):
     sources: list[str] = Field(default_factory=lambda: ["justjoinit"])
     limit: int = 30
-    db_path: str = "jobpulse.db"
+    db_path: str = "jobpulse.db"  # SQLite path, sqlite:/// or sqlite+monthly:/// URL, or postgresql:// DSN
+    history_raw_days: int = 30
+    history_retention_days: int = 365
+    queue_path: str = "jobpulse-queue.db"  # work queue for --enqueue/--worker (SQLite path or sqlite:/// URL)
+    partition_hot_months: int = 3  # sqlite+monthly: months kept writable; older ones are compacted read-only
+    snapshot_path: str = ""  # columnar snapshot rebuilt after each run for mmap readers; empty = disabled
+    snapshot_days: int = 30  # offers scraped in the last N days go into the snapshot (0 = all)
+    webdriver_budget: int = 1
     filters: FilterConfig = Field(default_factory=FilterConfig)
 
+    @field_validator("db_path")
+    @classmethod
+    def _check_db_dsn(cls, value: str) -> str:
+        return check_dsn(value)
+
 
 def _merge_dicts(base: dict, overrides: dict) -> dict:
     merged = dict(base)
@@ -42,7 +56,14 @@ def _apply_env_overrides(data: dict) -> dict:
     Supported variables:
         JOBPULSE_SOURCES              – comma-separated list of sources
         JOBPULSE_LIMIT                – integer
-        JOBPULSE_DB_PATH              – string
+        JOBPULSE_DB_PATH              – SQLite path, sqlite+monthly:/// URL or postgresql:// DSN
+        JOBPULSE_HISTORY_RAW_DAYS     – integer
+        JOBPULSE_HISTORY_RETENTION_DAYS – integer
+        JOBPULSE_PARTITION_HOT_MONTHS – integer
+        JOBPULSE_QUEUE_PATH           – work queue SQLite path
+        JOBPULSE_SNAPSHOT_PATH        – snapshot file, or empty to disable
+        JOBPULSE_SNAPSHOT_DAYS        – integer
+        JOBPULSE_WEBDRIVER_BUDGET     – integer, concurrent browser sessions
         JOBPULSE_FILTER_MIN_SALARY_PLN – integer or empty to clear
         JOBPULSE_FILTER_CITY          – string or empty to clear
         JOBPULSE_FILTER_MUST_HAVE_SKILLS – comma-separated list
@@ -51,6 +72,13 @@ def _apply_env_overrides(data: dict) -> dict:
         "SOURCES": (["sources"], list),
         "LIMIT": (["limit"], int),
         "DB_PATH": (["db_path"], str),
+        "HISTORY_RAW_DAYS": (["history_raw_days"], int),
+        "HISTORY_RETENTION_DAYS": (["history_retention_days"], int),
+        "PARTITION_HOT_MONTHS": (["partition_hot_months"], int),
+        "QUEUE_PATH": (["queue_path"], str),
+        "SNAPSHOT_PATH": (["snapshot_path"], str),
+        "SNAPSHOT_DAYS": (["snapshot_days"], int),
+        "WEBDRIVER_BUDGET": (["webdriver_budget"], int),
         "FILTER_MIN_SALARY_PLN": (["filters", "min_salary_pln"], int),
         "FILTER_CITY": (["filters", "city"], str),
         "FILTER_MUST_HAVE_SKILLS": (["filters", "must_have_skills"], list),
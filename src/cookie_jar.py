@@ -0,0 +1,273 @@
+"""Encrypted on-disk cookie jar shared by the Selenium fallbacks and ``requests`` sessions.
+
+When a browser session gets past a Cloudflare challenge, its cookies
+(``cf_clearance``, ``__cf_bm``, ...) are saved here. Later runs load them into
+``requests`` sessions and stay on the HTTP/API path until they expire.
+
+* ``JOBPULSE_COOKIE_JAR`` – jar file (default ``.jobpulse_cookies.enc``;
+  set it to an empty string to disable the jar).
+* ``JOBPULSE_COOKIE_KEY`` – Fernet key (``Fernet.generate_key()``). Without
+  it, a key is generated once into ``JOBPULSE_COOKIE_KEY_FILE`` (default
+  ``~/.config/jobpulse/cookie.key``, mode 0600), outside the project directory.
+* ``JOBPULSE_COOKIE_SESSION_TTL`` – lifetime in seconds for cookies without
+  an expiry (browser-session cookies), default 1800.
+
+The jar is encrypted with ``cryptography``'s Fernet (pip install cryptography);
+without the package the jar is disabled rather than written in plain text.
+Clearance cookies are bound to the browser's User-Agent, so the jar records
+it and :meth:`EncryptedCookieJar.user_agent` lets sessions reuse it.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.cookiejar import CookieJar
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+JAR_PATH_ENV = "JOBPULSE_COOKIE_JAR"
+KEY_ENV = "JOBPULSE_COOKIE_KEY"
+KEY_FILE_ENV = "JOBPULSE_COOKIE_KEY_FILE"
+SESSION_TTL_ENV = "JOBPULSE_COOKIE_SESSION_TTL"
+
+DEFAULT_JAR_PATH = ".jobpulse_cookies.enc"
+DEFAULT_KEY_FILE = "~/.config/jobpulse/cookie.key"
+DEFAULT_SESSION_TTL = 1800.0
+_FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+_warned_disabled = False
+
+
+class CookieJarError(Exception):
+    """Raised when the jar cannot be used (``cryptography`` missing, invalid key)."""
+
+
+@dataclass
+class StoredCookie:
+    name: str
+    value: str
+    domain: str
+    path: str = "/"
+    secure: bool = True
+    expires: float | None = None  # epoch seconds; session cookies get the session TTL when stored
+
+    def belongs_to(self, site: str) -> bool:
+        """True for cookies of *site* and its subdomains (``.theprotocol.it``, ``apus-api.theprotocol.it``)."""
+        bare = self.domain.lstrip(".")
+        return bare == site or bare.endswith("." + site)
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.domain, self.path, self.name
+
+
+def _import_fernet():
+    try:
+        from cryptography.fernet import Fernet, InvalidToken
+    except ImportError:
+        raise CookieJarError("the cookie jar requires the 'cryptography' package (pip install cryptography)") from None
+    return Fernet, InvalidToken
+
+
+def _load_key() -> bytes:
+    key = os.environ.get(KEY_ENV, "").strip()
+    if key:
+        return key.encode("ascii")
+    key_file = Path(os.environ.get(KEY_FILE_ENV, "").strip() or DEFAULT_KEY_FILE).expanduser()
+    try:
+        return key_file.read_bytes().strip()
+    except FileNotFoundError:
+        pass
+    Fernet, _ = _import_fernet()
+    key_file.parent.mkdir(parents=True, exist_ok=True)
+    new_key = Fernet.generate_key()
+    # O_EXCL: if another process created the key meanwhile, use theirs.
+    try:
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return key_file.read_bytes().strip()
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(new_key)
+    logger.info("Generated cookie jar key in %s", key_file)
+    return new_key
+
+
+class EncryptedCookieJar:
+    """Cookies persisted in one Fernet-encrypted JSON file, with expiry tracking."""
+
+    def __init__(self, path: str | Path, key: bytes, session_ttl: float = DEFAULT_SESSION_TTL) -> None:
+        Fernet, self._invalid_token = _import_fernet()
+        try:
+            self._fernet = Fernet(key)
+        except (ValueError, TypeError) as exc:
+            raise CookieJarError(f"invalid cookie jar key: {exc}") from None
+        self.path = Path(path)
+        self.session_ttl = session_ttl
+
+    def _read(self) -> dict:
+        try:
+            token = self.path.read_bytes()
+        except FileNotFoundError:
+            return {"version": _FORMAT_VERSION, "cookies": [], "user_agents": {}}
+        try:
+            data = json.loads(self._fernet.decrypt(token))
+        except (self._invalid_token, ValueError):
+            # Unreadable (other key, damaged file): start over, the next save replaces it.
+            logger.warning("Cannot decrypt cookie jar %s (wrong key?); ignoring it", self.path)
+            data = None
+        if not isinstance(data, dict) or data.get("version") != _FORMAT_VERSION:
+            return {"version": _FORMAT_VERSION, "cookies": [], "user_agents": {}}
+        return data
+
+    def _write(self, data: dict) -> None:
+        token = self._fernet.encrypt(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".cookies-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(token)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def cookies(self, site: str | None = None) -> list[StoredCookie]:
+        """Unexpired cookies, optionally only those of *site* and its subdomains."""
+        now = time.time()
+        with _lock:
+            data = self._read()
+        cookies = [StoredCookie(**item) for item in data["cookies"]]
+        return [
+            cookie
+            for cookie in cookies
+            if (cookie.expires is None or cookie.expires > now) and (site is None or cookie.belongs_to(site))
+        ]
+
+    def user_agent(self, site: str) -> str | None:
+        """User-Agent of the browser that produced the cookies of *site*."""
+        with _lock:
+            return self._read()["user_agents"].get(site)
+
+    def expires_at(self, site: str, name: str) -> float | None:
+        for cookie in self.cookies(site):
+            if cookie.name == name:
+                return cookie.expires
+        return None
+
+    def update(self, cookies: list[StoredCookie], site: str, user_agent: str | None = None) -> int:
+        """Merge *cookies* (newer values win) and drop expired ones; return how many were stored."""
+        now = time.time()
+        with _lock:
+            data = self._read()
+            merged = {StoredCookie(**item).key: StoredCookie(**item) for item in data["cookies"]}
+            for cookie in cookies:
+                if cookie.expires is None:
+                    cookie.expires = now + self.session_ttl
+                merged[cookie.key] = cookie
+            data["cookies"] = [asdict(cookie) for cookie in merged.values() if cookie.expires > now]
+            if user_agent:
+                data["user_agents"][site] = user_agent
+            self._write(data)
+        return len(cookies)
+
+    def discard(self, site: str) -> int:
+        """Forget all cookies of *site* (e.g. after the server rejected them)."""
+        with _lock:
+            data = self._read()
+            kept = [item for item in data["cookies"] if not StoredCookie(**item).belongs_to(site)]
+            removed = len(data["cookies"]) - len(kept)
+            if removed:
+                data["cookies"] = kept
+                self._write(data)
+        return removed
+
+    def save_selenium_cookies(self, driver_cookies: list[dict], site: str, user_agent: str | None = None) -> int:
+        """Store cookies from ``driver.get_cookies()`` (``expiry`` is epoch seconds, absent for session cookies)."""
+        cookies = [
+            StoredCookie(
+                name=item["name"],
+                value=item["value"],
+                domain=item.get("domain") or site,
+                path=item.get("path") or "/",
+                secure=bool(item.get("secure", True)),
+                expires=float(item["expiry"]) if item.get("expiry") else None,
+            )
+            for item in driver_cookies
+            if item.get("name") and item.get("value") is not None
+        ]
+        stored = self.update(cookies, site, user_agent)
+        logger.info("Saved %d browser cookies for %s to the cookie jar", stored, site)
+        return stored
+
+    def save_session_cookies(self, jar: CookieJar, site: str) -> int:
+        """Store cookies a ``requests`` session holds for *site* (servers refresh ``__cf_bm``)."""
+        cookies = [
+            StoredCookie(
+                name=cookie.name,
+                value=cookie.value or "",
+                domain=cookie.domain or site,
+                path=cookie.path or "/",
+                secure=cookie.secure,
+                expires=float(cookie.expires) if cookie.expires else None,
+            )
+            for cookie in jar
+            if StoredCookie(cookie.name, "", cookie.domain or site).belongs_to(site)
+        ]
+        return self.update(cookies, site) if cookies else 0
+
+    def apply_to_session(self, session: requests.Session, site: str) -> int:
+        """Load unexpired cookies of *site* into *session*; return how many."""
+        cookies = self.cookies(site)
+        for cookie in cookies:
+            session.cookies.set(
+                cookie.name,
+                cookie.value,
+                domain=cookie.domain,
+                path=cookie.path,
+                secure=cookie.secure,
+                expires=int(cookie.expires) if cookie.expires else None,
+            )
+        return len(cookies)
+
+    def apply_to_driver(self, driver, site: str) -> int:
+        """Add cookies of *site* to a Selenium *driver* (must already be on a page of that site)."""
+        added = 0
+        for cookie in self.cookies(site):
+            entry = {"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path}
+            if cookie.expires:
+                entry["expiry"] = int(cookie.expires)
+            try:
+                driver.add_cookie(entry)
+                added += 1
+            except Exception:
+                continue
+        return added
+
+
+def open_cookie_jar() -> EncryptedCookieJar | None:
+    """Open the jar configured by the environment, or ``None`` if it is disabled or unusable."""
+    global _warned_disabled
+    path = os.environ.get(JAR_PATH_ENV, DEFAULT_JAR_PATH).strip()
+    if not path:
+        return None
+    try:
+        session_ttl = float(os.environ.get(SESSION_TTL_ENV, "").strip() or DEFAULT_SESSION_TTL)
+    except ValueError:
+        logger.warning("Ignoring %s (expected seconds)", SESSION_TTL_ENV)
+        session_ttl = DEFAULT_SESSION_TTL
+    try:
+        return EncryptedCookieJar(path, _load_key(), session_ttl=session_ttl)
+    except (CookieJarError, OSError) as exc:
+        if not _warned_disabled:
+            logger.info("Cookie jar disabled: %s", exc)
+            _warned_disabled = True
+        return None
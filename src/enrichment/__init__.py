@@ -0,0 +1,4 @@
+from .jsonld import parse_job_posting
+from .worker import DetailEnricher, enrich_pending
+
+__all__ = ["DetailEnricher", "enrich_pending", "parse_job_posting"]
@@ -0,0 +1,121 @@
+"""Extract offer details from the schema.org ``JobPosting`` JSON-LD on detail pages.
+
+Both boards embed a ``<script type="application/ld+json">`` block on offer pages;
+it carries the publish date, contract type, salary and the full skill list that
+listing cards only show in part.
+"""
+
+import json
+import re
+from datetime import datetime
+
+_JSON_LD_RE = re.compile(
+    r"<script[^>]+type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+_UNIT_TO_MONTH = {"HOUR": 168, "DAY": 21, "WEEK": 4.33, "MONTH": 1, "YEAR": 1 / 12}
+
+
+def _iter_nodes(document: object):
+    if isinstance(document, list):
+        for item in document:
+            yield from _iter_nodes(item)
+    elif isinstance(document, dict):
+        yield document
+        if isinstance(document.get("@graph"), list):
+            yield from _iter_nodes(document["@graph"])
+
+
+def _find_job_posting(html: str) -> dict | None:
+    for match in _JSON_LD_RE.finditer(html):
+        try:
+            document = json.loads(match.group(1).strip())
+        except json.JSONDecodeError:
+            continue
+        for node in _iter_nodes(document):
+            node_type = node.get("@type")
+            types = node_type if isinstance(node_type, list) else [node_type]
+            if "JobPosting" in types:
+                return node
+    return None
+
+
+def _parse_date(raw: object) -> str | None:
+    if not isinstance(raw, str) or not raw.strip():
+        return None
+    try:
+        return datetime.fromisoformat(raw.strip().replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        return None
+
+
+def _employment_type(raw: object) -> str | None:
+    values = raw if isinstance(raw, list) else [raw]
+    lowered = " ".join(str(value).lower() for value in values if value)
+    if "b2b" in lowered or "contractor" in lowered:
+        return "b2b"
+    if "mandate" in lowered or "zlecenie" in lowered:
+        return "uz"
+    if "full_time" in lowered or "part_time" in lowered or "permanent" in lowered or "employee" in lowered:
+        return "permanent"
+    return None
+
+
+def _salary(raw: object) -> tuple[int | None, int | None]:
+    if not isinstance(raw, dict) or str(raw.get("currency") or "PLN").upper() != "PLN":
+        return None, None
+    value = raw.get("value")
+    if not isinstance(value, dict):
+        return None, None
+    factor = _UNIT_TO_MONTH.get(str(value.get("unitText") or "MONTH").upper(), 1)
+
+    def _amount(key: str) -> int | None:
+        amount = value.get(key)
+        if amount is None and key == "minValue":
+            amount = value.get("value")
+        try:
+            return int(round(float(amount) * factor)) if amount is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    return _amount("minValue"), _amount("maxValue")
+
+
+def _skills(raw: object) -> list[str]:
+    if isinstance(raw, str):
+        items = raw.split(",")
+    elif isinstance(raw, list):
+        items = [item.get("name") if isinstance(item, dict) else item for item in raw]
+    else:
+        return []
+    skills: list[str] = []
+    for item in items:
+        name = str(item or "").strip()
+        if name and name not in skills:
+            skills.append(name)
+    return skills
+
+
+def parse_job_posting(html: str) -> dict:
+    """Return detail fields found in *html* (keys absent when unknown)."""
+    posting = _find_job_posting(html)
+    if posting is None:
+        return {}
+
+    details: dict = {}
+    published_at = _parse_date(posting.get("datePosted"))
+    if published_at:
+        details["published_at"] = published_at
+    employment_type = _employment_type(posting.get("employmentType"))
+    if employment_type:
+        details["employment_type"] = employment_type
+    if str(posting.get("jobLocationType") or "").upper() == "TELECOMMUTE":
+        details["workplace_type"] = "remote"
+    salary_min, salary_max = _salary(posting.get("baseSalary"))
+    if salary_min is not None or salary_max is not None:
+        details["salary_min_pln"] = salary_min
+        details["salary_max_pln"] = salary_max
+    skills = _skills(posting.get("skills"))
+    if skills:
+        details["skills"] = skills
+    return details
@@ -0,0 +1,203 @@
+"""Fetch detail pages of newly stored offers and fill in the missing fields.
+
+Only rows the store reports as pending (new, or failed on an earlier run) are
+fetched, so known offers never cost a request. Requests run in a bounded thread
+pool; each host gets its own concurrency limit and request spacing taken from
+the source scraper's ``ScraperCapabilities``. Parsed details are cached per URL
+together with the response ``ETag``/``Last-Modified`` so a retry costs a 304.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+
+from src.enrichment.jsonld import parse_job_posting
+from src.scrapers.registry import UnknownSourceError, get_capabilities
+from src.storage import OfferStore, SQLiteOfferStore
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+def ensure_detail_cache_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS offer_detail_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at TEXT NOT NULL,
+            details TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+
+
+@dataclass
+class _HostLimit:
+    slots: threading.BoundedSemaphore
+    min_interval: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    next_request_at: float = 0.0
+
+    def wait_turn(self) -> None:
+        if self.min_interval <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_request_at - now
+            self.next_request_at = max(now, self.next_request_at) + self.min_interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+@dataclass
+class DetailResult:
+    offer_id: int
+    url: str
+    details: dict | None  # None when the fetch or parse failed
+    etag: str | None = None
+    last_modified: str | None = None
+    from_cache: bool = False
+
+
+class DetailEnricher:
+    def __init__(self, max_workers: int = 8, timeout: int = 15, per_host_limit: int | None = None) -> None:
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        self._hosts: dict[str, _HostLimit] = {}
+        self._hosts_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+        return session
+
+    def _host_limit(self, host: str, source: str) -> _HostLimit:
+        with self._hosts_lock:
+            limit = self._hosts.get(host)
+            if limit is None:
+                try:
+                    capabilities = get_capabilities(source)
+                    concurrency, rate = capabilities.max_concurrency, capabilities.rate_limit_per_sec
+                except UnknownSourceError:
+                    concurrency, rate = 1, None
+                if self.per_host_limit is not None:
+                    concurrency = self.per_host_limit
+                limit = self._hosts[host] = _HostLimit(
+                    slots=threading.BoundedSemaphore(max(1, concurrency)),
+                    min_interval=1 / rate if rate else 0.0,
+                )
+            return limit
+
+    def _fetch(self, row: dict, cached: tuple | None) -> DetailResult:
+        url = row["offer_url"]
+        headers: dict[str, str] = {}
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        host_limit = self._host_limit(urlparse(url).netloc, row["source"])
+        with host_limit.slots:
+            host_limit.wait_turn()
+            try:
+                response = self._session().get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as exc:
+                logger.warning("Detail fetch failed for %s: %s", url, exc)
+                return DetailResult(row["id"], url, None)
+
+        if response.status_code == 304 and cached is not None:
+            return DetailResult(row["id"], url, json.loads(cached[2]), cached[0], cached[1], from_cache=True)
+        if response.status_code != 200:
+            logger.warning("Detail fetch for %s returned HTTP %d", url, response.status_code)
+            return DetailResult(row["id"], url, None)
+
+        return DetailResult(
+            row["id"],
+            url,
+            parse_job_posting(response.text),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    def enrich(self, store: OfferStore, limit: int = 200, max_attempts: int = 3) -> dict[str, int]:
+        """Enrich up to *limit* pending offers in *store*; return run counters."""
+        rows = store.pending_enrichment(limit=limit, max_attempts=max_attempts)
+        if not rows:
+            return {"pending": 0, "enriched": 0, "failed": 0, "not_modified": 0}
+
+        # The conditional-request cache lives next to the offers in SQLite only.
+        cache_db = store.db_path if isinstance(store, SQLiteOfferStore) else None
+        cache: dict[str, tuple] = {}
+        if cache_db is not None:
+            urls = [row["offer_url"] for row in rows]
+            with sqlite3.connect(cache_db) as conn:
+                ensure_detail_cache_schema(conn)
+                placeholders = ", ".join("?" for _ in urls)
+                cache = {
+                    url: (etag, last_modified, details)
+                    for url, etag, last_modified, details in conn.execute(
+                        f"SELECT url, etag, last_modified, details FROM offer_detail_cache WHERE url IN ({placeholders})",
+                        urls,
+                    )
+                }
+
+        logger.info("Fetching %d offer detail pages (workers=%d)", len(rows), self.max_workers)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="detail") as pool:
+            results = list(pool.map(lambda row: self._fetch(row, cache.get(row["offer_url"])), rows))
+
+        fetched_at = datetime.utcnow().isoformat()
+        if cache_db is not None:
+            with sqlite3.connect(cache_db) as conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO offer_detail_cache (url, etag, last_modified, fetched_at, details)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (r.url, r.etag, r.last_modified, fetched_at, json.dumps(r.details, ensure_ascii=False))
+                        for r in results
+                        if r.details is not None and not r.from_cache
+                    ],
+                )
+        store.apply_enrichment([(r.offer_id, r.details) for r in results])
+
+        stats = {
+            "pending": len(rows),
+            "enriched": sum(1 for r in results if r.details),
+            "failed": sum(1 for r in results if r.details is None),
+            "not_modified": sum(1 for r in results if r.from_cache),
+        }
+        logger.info(
+            "Detail enrichment: %d/%d enriched, %d failed, %d not modified (%.2fs)",
+            stats["enriched"],
+            stats["pending"],
+            stats["failed"],
+            stats["not_modified"],
+            time.perf_counter() - start,
+        )
+        return stats
+
+
+def enrich_pending(store: OfferStore, limit: int = 200, max_workers: int = 8) -> dict[str, int]:
+    return DetailEnricher(max_workers=max_workers).enrich(store, limit=limit)
@@ -0,0 +1,4 @@
+from .base import ExportError, OfferExporter
+from .registry import export_rows, get_exporter, supported_extensions
+
+__all__ = ["ExportError", "OfferExporter", "export_rows", "get_exporter", "supported_extensions"]
@@ -0,0 +1,98 @@
+"""Columnar exporters (Parquet, Arrow IPC). Require the optional ``pyarrow`` package."""
+
+from itertools import islice
+from pathlib import Path
+from typing import Iterable
+
+from src.exporters.base import ExportError
+
+BATCH_SIZE = 10_000
+INT_COLUMNS = {"id", "salary_min_pln", "salary_max_pln"}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ExportError("Parquet/Arrow export requires the 'pyarrow' package (pip install pyarrow)") from None
+    return pyarrow
+
+
+def _infer_schema(pa, batch: list[dict], fieldnames: list[str] | None):
+    names = fieldnames or list(batch[0].keys())
+    fields = []
+    for name in names:
+        if name in INT_COLUMNS:
+            fields.append(pa.field(name, pa.int64()))
+            continue
+        sample = next((row.get(name) for row in batch if row.get(name) is not None), None)
+        if isinstance(sample, list):
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        elif isinstance(sample, bool):
+            fields.append(pa.field(name, pa.bool_()))
+        elif isinstance(sample, int):
+            fields.append(pa.field(name, pa.int64()))
+        elif isinstance(sample, float):
+            fields.append(pa.field(name, pa.float64()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def _batches(rows: Iterable[dict]) -> Iterable[list[dict]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+class _ArrowExporterBase:
+    supports_compression = False
+
+    def _open_writer(self, pa, path: Path, schema):
+        raise NotImplementedError
+
+    def export(self, rows: Iterable[dict], path: Path, fieldnames: list[str] | None = None) -> int:
+        pa = _import_pyarrow()
+        writer = None
+        schema = None
+        written = 0
+        try:
+            for batch in _batches(rows):
+                if writer is None:
+                    # The schema is fixed by the first batch; later batches are cast to it.
+                    schema = _infer_schema(pa, batch, fieldnames)
+                    writer = self._open_writer(pa, path, schema)
+                columns = {name: [row.get(name) for row in batch] for name in schema.names}
+                writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+                written += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+
+
+class ParquetExporter(_ArrowExporterBase):
+    """Parquet file written in row groups of ``BATCH_SIZE`` rows (zstd compressed)."""
+
+    format = "parquet"
+    extensions = (".parquet",)
+
+    def _open_writer(self, pa, path: Path, schema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(str(path), schema, compression="zstd")
+
+
+class ArrowExporter(_ArrowExporterBase):
+    """Arrow IPC file (a.k.a. Feather v2), readable with zero-copy memory mapping."""
+
+    format = "arrow"
+    extensions = (".arrow", ".feather")
+
+    def _open_writer(self, pa, path: Path, schema):
+        import pyarrow.ipc
+
+        return pyarrow.ipc.new_file(str(path), schema, options=pyarrow.ipc.IpcWriteOptions(compression="zstd"))
@@ -0,0 +1,56 @@
+import io
+from pathlib import Path
+from typing import IO, Iterable, Protocol
+
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+
+
+class ExportError(Exception):
+    """Raised when an export target cannot be written (format, missing dependency)."""
+
+
+class OfferExporter(Protocol):
+    format: str
+    extensions: tuple[str, ...]
+    supports_compression: bool
+
+    def export(self, rows: Iterable[dict], path: Path, fieldnames: list[str] | None = None) -> int:
+        """Write *rows* to *path* incrementally; return number of rows written."""
+        ...
+
+
+def split_compression(path: Path) -> tuple[str, str | None]:
+    """Return (format extension, compression suffix) for *path*.
+
+    ``offers.jsonl.zst`` -> (".jsonl", ".zst"); ``offers.csv`` -> (".csv", None).
+    """
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        return (suffixes[-2] if len(suffixes) > 1 else ""), suffixes[-1]
+    return (suffixes[-1] if suffixes else ""), None
+
+
+def open_text_output(path: Path, newline: str | None = None) -> IO[str]:
+    """Open *path* for text writing, compressing according to its suffix."""
+    _, compression = split_compression(path)
+    # Codec modules are imported on demand to keep CLI startup light.
+    if compression == ".gz":
+        import gzip
+
+        return gzip.open(path, "wt", encoding="utf-8", newline=newline)
+    if compression == ".bz2":
+        import bz2
+
+        return bz2.open(path, "wt", encoding="utf-8", newline=newline)
+    if compression == ".xz":
+        import lzma
+
+        return lzma.open(path, "wt", encoding="utf-8", newline=newline)
+    if compression == ".zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ExportError(f"{path}: .zst output requires the 'zstandard' package") from None
+        writer = zstandard.ZstdCompressor(level=10).stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8", newline=newline)
+    return open(path, "w", encoding="utf-8", newline=newline)
@@ -0,0 +1,43 @@
+import logging
+from pathlib import Path
+from typing import Iterable
+
+from src.exporters.arrow import ArrowExporter, ParquetExporter
+from src.exporters.base import ExportError, OfferExporter, split_compression
+from src.exporters.text import CsvExporter, JsonExporter, JsonLinesExporter
+
+logger = logging.getLogger(__name__)
+
+_EXPORTERS: list[OfferExporter] = [
+    JsonExporter(),
+    JsonLinesExporter(),
+    CsvExporter(),
+    ParquetExporter(),
+    ArrowExporter(),
+]
+
+
+def supported_extensions() -> list[str]:
+    return [extension for exporter in _EXPORTERS for extension in exporter.extensions]
+
+
+def get_exporter(path: str | Path) -> OfferExporter:
+    """Pick the exporter for *path* from its extension (``.csv.gz``, ``.parquet``...)."""
+    extension, compression = split_compression(Path(path))
+    for exporter in _EXPORTERS:
+        if extension in exporter.extensions:
+            if compression and not exporter.supports_compression:
+                raise ExportError(f"{path}: {exporter.format} output is compressed internally, drop '{compression}'")
+            return exporter
+    raise ExportError(
+        f"Unsupported output format for {path} (use one of: {', '.join(supported_extensions())}; "
+        "text formats accept .gz/.bz2/.xz/.zst)"
+    )
+
+
+def export_rows(rows: Iterable[dict], path: str | Path, fieldnames: list[str] | None = None) -> int:
+    """Stream *rows* into *path* using the exporter chosen by its extension."""
+    exporter = get_exporter(path)
+    written = exporter.export(rows, Path(path), fieldnames=fieldnames)
+    logger.info("Exported %d offers to %s (%s)", written, path, exporter.format)
+    return written
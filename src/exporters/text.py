@@ -0,0 +1,78 @@
+import csv
+import json
+import textwrap
+from itertools import chain
+from pathlib import Path
+from typing import Iterable
+
+from src.exporters.base import open_text_output
+
+
+def _csv_value(value: object) -> object:
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return value
+
+
+class JsonExporter:
+    """Pretty-printed JSON array, written one element at a time."""
+
+    format = "json"
+    extensions = (".json",)
+    supports_compression = True
+
+    def export(self, rows: Iterable[dict], path: Path, fieldnames: list[str] | None = None) -> int:
+        written = 0
+        with open_text_output(path) as handle:
+            for row in rows:
+                handle.write("[\n" if written == 0 else ",\n")
+                handle.write(textwrap.indent(json.dumps(row, ensure_ascii=False, indent=2), "  "))
+                written += 1
+            handle.write("[]\n" if written == 0 else "\n]\n")
+        return written
+
+
+class JsonLinesExporter:
+    """One compact JSON object per line."""
+
+    format = "jsonl"
+    extensions = (".jsonl", ".ndjson")
+    supports_compression = True
+
+    def export(self, rows: Iterable[dict], path: Path, fieldnames: list[str] | None = None) -> int:
+        written = 0
+        with open_text_output(path) as handle:
+            for row in rows:
+                handle.write(json.dumps(row, ensure_ascii=False))
+                handle.write("\n")
+                written += 1
+        return written
+
+
+class CsvExporter:
+    """CSV with a header row; list values are joined with ", "."""
+
+    format = "csv"
+    extensions = (".csv",)
+    supports_compression = True
+
+    def export(self, rows: Iterable[dict], path: Path, fieldnames: list[str] | None = None) -> int:
+        written = 0
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None and fieldnames is None:
+            return 0
+
+        with open_text_output(path, newline="") as handle:
+            writer = csv.DictWriter(
+                handle,
+                fieldnames=fieldnames or list(first.keys()),
+                extrasaction="ignore",
+            )
+            writer.writeheader()
+            if first is None:
+                return 0
+            for row in chain([first], rows):
+                writer.writerow({key: _csv_value(value) for key, value in row.items()})
+                written += 1
+        return written
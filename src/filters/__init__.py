@@ -1,3 +1,3 @@
-from .simple_filter import OfferFilter, filter_offers
+from .simple_filter import OfferFilter, filter_offers, lookup_key, normalize_skill, profile_filter, regexp
 
-__all__ = ["OfferFilter", "filter_offers"]
+__all__ = ["OfferFilter", "filter_offers", "lookup_key", "normalize_skill", "profile_filter", "regexp"]
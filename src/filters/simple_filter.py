@@ -1,19 +1,34 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import re
+from typing import TYPE_CHECKING
 
-from src.models import JobOffer
+from src.skills import DEFAULT_DICTIONARY
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
 
 
 @dataclass
 class OfferFilter:
+    """Offer filter that runs in Python (:meth:`matches`) or in SQLite (:meth:`to_sql`).
+
+    Both forms give the same result, except that SQLite folds case for ASCII
+    letters only when comparing city and workplace type.
+    """
+
     min_salary_pln: int | None = None
     city: str | None = None
     must_have_skills: list[str] | None = None
     skills_match: str = "all"  # "all" or "any"
     title_regex: str | None = None
     workplace_type: str | None = None
+    sources: list[str] | None = None
+
+    def matches(self, offer: "JobOffer") -> bool:
+        if self.sources and offer.source not in self.sources:
+            return False
 
-    def matches(self, offer: JobOffer) -> bool:
         if self.min_salary_pln is not None:
             salary_floor = offer.salary_min_pln
             if salary_floor is None:
@@ -22,7 +37,7 @@ class OfferFilter:
                 return False
 
         if self.city:
-            if not offer.city or offer.city.lower() != self.city.lower():
+            if not offer.city or lookup_key(offer.city) != lookup_key(self.city):
                 return False
 
         if self.workplace_type:
@@ -30,8 +45,8 @@ class OfferFilter:
                 return False
 
         if self.must_have_skills:
-            normalized = {_normalize_skill(skill) for skill in offer.skills}
-            required_set = {_normalize_skill(required) for required in self.must_have_skills}
+            normalized = {normalize_skill(skill) for skill in offer.skills}
+            required_set = {normalize_skill(required) for required in self.must_have_skills}
             if self.skills_match == "any":
                 if not (normalized & required_set):
                     return False
@@ -41,16 +56,83 @@ class OfferFilter:
                         return False
 
         if self.title_regex:
-            if not re.search(self.title_regex, offer.title, flags=re.IGNORECASE):
+            if not regexp(self.title_regex, offer.title):
                 return False
 
         return True
 
+    def to_sql(self, schema: str = "") -> tuple[list[str], list[object]]:
+        """Return (AND-ed WHERE clauses, params) over ``offers`` columns.
 
-def filter_offers(offers: list[JobOffer], offer_filter: OfferFilter) -> list[JobOffer]:
+        The city is looked up by :func:`lookup_key` in ``cities`` and skills in
+        ``offer_skills`` (one row per offer and :func:`normalize_skill` key),
+        both qualified with *schema* when given. ``title_regex`` needs the
+        ``REGEXP`` function from :func:`src.storage.sqlite_store.register_functions`.
+        """
+        prefix = f"{schema}." if schema else ""
+        clauses: list[str] = []
+        params: list[object] = []
+        if self.sources:
+            clauses.append(f"source IN ({', '.join('?' for _ in self.sources)})")
+            params.extend(self.sources)
+        if self.min_salary_pln is not None:
+            # The salary floor is salary_min_pln, or salary_max_pln when the minimum is unknown.
+            clauses.append("(salary_min_pln >= ? OR (salary_min_pln IS NULL AND salary_max_pln >= ?))")
+            params.extend([self.min_salary_pln, self.min_salary_pln])
+        if self.city:
+            clauses.append(f"city_id = (SELECT id FROM {prefix}cities WHERE key = ?)")
+            params.append(lookup_key(self.city))
+        if self.workplace_type:
+            clauses.append("workplace_type = ? COLLATE NOCASE")
+            params.append(self.workplace_type)
+        if self.must_have_skills:
+            required = list(dict.fromkeys(normalize_skill(skill) for skill in self.must_have_skills))
+            if self.skills_match == "any":
+                placeholders = ", ".join("?" for _ in required)
+                clauses.append(f"id IN (SELECT offer_id FROM {prefix}offer_skills WHERE skill IN ({placeholders}))")
+                params.extend(required)
+            else:
+                for skill in required:
+                    clauses.append(f"id IN (SELECT offer_id FROM {prefix}offer_skills WHERE skill = ?)")
+                    params.append(skill)
+        if self.title_regex:
+            clauses.append("title REGEXP ?")
+            params.append(self.title_regex)
+        return clauses, params
+
+
+def filter_offers(offers: list["JobOffer"], offer_filter: OfferFilter) -> list["JobOffer"]:
     return [offer for offer in offers if offer_filter.matches(offer)]
 
 
-def _normalize_skill(skill: str) -> str:
-    cleaned = re.sub(r"[^a-z0-9]+", " ", skill.lower()).strip()
-    return " ".join(cleaned.split())
+def lookup_key(name: str) -> str:
+    """Key of a company or city name: case-folded, whitespace collapsed."""
+    return " ".join(name.casefold().split())
+
+
+def normalize_skill(skill: str) -> str:
+    """Key of the canonical skill (aliases resolved: ``"k8s"`` -> ``"kubernetes"``)."""
+    return DEFAULT_DICTIONARY.canonical_key(skill)
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str) -> re.Pattern:
+    return re.compile(pattern, flags=re.IGNORECASE)
+
+
+def regexp(pattern: str, value: str | None) -> bool:
+    """Case-insensitive ``re.search``; also serves as SQLite's ``REGEXP`` function."""
+    return value is not None and _compile(pattern).search(value) is not None
+
+
+def profile_filter(profile_data: dict) -> OfferFilter:
+    """Build an :class:`OfferFilter` from a ``profiles.json`` entry (filters at the root or under ``"filters"``)."""
+    filters = profile_data.get("filters")
+    if not isinstance(filters, dict):
+        filters = profile_data
+    return OfferFilter(
+        min_salary_pln=filters.get("min_salary_pln"),
+        city=filters.get("city"),
+        must_have_skills=filters.get("must_have_skills") or None,
+        sources=profile_data.get("sources") if isinstance(profile_data.get("sources"), list) else None,
+    )
@@ -0,0 +1,311 @@
+"""On-disk HTTP response cache mounted behind scraper ``requests`` sessions.
+
+Set ``JOBPULSE_HTTP_CACHE_DIR`` to enable it. Bodies are stored once per
+content hash (zlib-compressed files under ``objects/``); ``index.sqlite`` maps
+each request key (method, URL and the headers that select a representation)
+to a body, its response headers and freshness data. Headers a response lists
+in ``Vary`` are recorded with it and must match for the entry to be used.
+
+* Fresh entries (``Cache-Control: max-age``/``Expires``) are served without a
+  request; stale ones are revalidated with ``If-None-Match``/``If-Modified-Since``
+  and a 304 refreshes the entry. ``no-store`` responses are never stored, and
+  a request or response ``no-cache`` forces revalidation.
+* ``JOBPULSE_HTTP_CACHE_MAX_AGE`` (seconds) overrides the server's freshness
+  rules, including ``no-store``/``no-cache``.
+* ``JOBPULSE_HTTP_CACHE_OFFLINE=1`` serves any stored entry regardless of age
+  and fails misses without touching the network, which turns a cache directory
+  into an offline fixture set.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "JOBPULSE_HTTP_CACHE_DIR"
+MAX_AGE_ENV = "JOBPULSE_HTTP_CACHE_MAX_AGE"
+OFFLINE_ENV = "JOBPULSE_HTTP_CACHE_OFFLINE"
+
+# Request headers that select a different representation of the same URL. Cookie is left
+# out: rotating cookies (Cloudflare's __cf_bm) would change the key on every run, and a
+# response that really depends on cookies says so with ``Vary: Cookie``.
+KEY_HEADERS = ("Accept", "Accept-Language", "Version")
+# Describe the stored (already decoded) body no longer.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _parse_cache_control(value: str | None) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _freshness_lifetime(headers: CaseInsensitiveDict) -> float:
+    directives = _parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return 0.0
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return max(0.0, float(max_age))
+        except ValueError:
+            return 0.0
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return max(0.0, parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
+
+
+def _vary_values(headers: CaseInsensitiveDict, request: requests.PreparedRequest | None) -> dict[str, str] | None:
+    """Request header values named by the response's ``Vary``; None for ``Vary: *`` (never reusable)."""
+    names = [name.strip().lower() for name in (headers.get("Vary") or "").split(",") if name.strip()]
+    if "*" in names:
+        return None
+    request_headers = request.headers if request is not None else {}
+    return {name: request_headers.get(name, "") for name in names}
+
+
+def _vary_matches(entry: dict, request: requests.PreparedRequest) -> bool:
+    return all(request.headers.get(name, "") == value for name, value in entry["vary"].items())
+
+
+class HttpCache:
+    def __init__(self, directory: str | Path, forced_max_age: float | None = None, offline: bool = False) -> None:
+        self.directory = Path(directory)
+        self.objects_dir = self.directory / "objects"
+        self.index_path = self.directory / "index.sqlite"
+        self.forced_max_age = forced_max_age
+        self.offline = offline
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body_sha256 TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    fresh_until REAL NOT NULL,
+                    vary TEXT
+                ) WITHOUT ROWID
+                """
+            )
+            if "vary" not in {row[1] for row in conn.execute("PRAGMA table_info(responses)")}:
+                conn.execute("ALTER TABLE responses ADD COLUMN vary TEXT")
+
+    @staticmethod
+    def request_key(request: requests.PreparedRequest) -> str:
+        parts = [request.method or "GET", request.url or ""]
+        parts.extend(f"{name.lower()}={request.headers.get(name, '')}" for name in KEY_HEADERS)
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _write_body(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(zlib.compress(body, 6))
+            os.replace(tmp_path, path)
+        return digest
+
+    def lookup(self, key: str) -> dict | None:
+        with sqlite3.connect(self.index_path) as conn:
+            row = conn.execute(
+                "SELECT url, status, headers, body_sha256, stored_at, fresh_until, vary FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            body = zlib.decompress(self._object_path(row[3]).read_bytes())
+        except (OSError, zlib.error) as exc:
+            logger.warning("Dropping unreadable HTTP cache entry for %s: %s", row[0], exc)
+            self.discard(key)
+            return None
+        return {
+            "url": row[0],
+            "status": row[1],
+            "headers": CaseInsensitiveDict(json.loads(row[2])),
+            "body": body,
+            "stored_at": row[4],
+            "fresh_until": row[5],
+            "vary": json.loads(row[6]) if row[6] else {},
+        }
+
+    def _lifetime(self, headers: CaseInsensitiveDict) -> float | None:
+        """Seconds the response stays fresh, or None if it must not be stored."""
+        if self.forced_max_age is not None:
+            return self.forced_max_age
+        if "no-store" in _parse_cache_control(headers.get("Cache-Control")):
+            return None
+        return _freshness_lifetime(headers)
+
+    def store(self, key: str, response: requests.Response) -> None:
+        headers = CaseInsensitiveDict(
+            {name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS}
+        )
+        lifetime = self._lifetime(headers)
+        vary = _vary_values(headers, response.request)
+        if lifetime is None or vary is None:
+            return
+        now = time.time()
+        digest = self._write_body(response.content)
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, url, status, headers, body_sha256, stored_at, fresh_until, vary)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    response.url,
+                    response.status_code,
+                    json.dumps(dict(headers)),
+                    digest,
+                    now,
+                    now + lifetime,
+                    json.dumps(vary) if vary else None,
+                ),
+            )
+
+    def refresh(self, key: str, entry: dict, not_modified: requests.Response) -> None:
+        """Apply a 304's headers to *entry* and restart its freshness window."""
+        headers = CaseInsensitiveDict(entry["headers"])
+        for name, value in not_modified.headers.items():
+            if name.lower() not in _DROPPED_HEADERS:
+                headers[name] = value
+        entry["headers"] = headers
+        lifetime = self._lifetime(headers) or 0.0
+        now = time.time()
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute(
+                "UPDATE responses SET headers = ?, stored_at = ?, fresh_until = ? WHERE key = ?",
+                (json.dumps(dict(headers)), now, now + lifetime, key),
+            )
+
+    def discard(self, key: str) -> None:
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+
+def _cached_response(adapter: HTTPAdapter, request: requests.PreparedRequest, entry: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"]
+    response.url = request.url
+    response.request = request
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.reason = "OK"
+    response.connection = adapter
+    response.from_cache = True
+    return response
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that answers GET requests from :class:`HttpCache` when it can."""
+
+    def __init__(self, cache: HttpCache, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        conditional = "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+        if request.method != "GET" or conditional:
+            return super().send(request, **kwargs)
+
+        key = self.cache.request_key(request)
+        entry = self.cache.lookup(key)
+        if entry is not None and not _vary_matches(entry, request):
+            logger.debug("HTTP cache entry for %s varies on other header values", request.url)
+            entry = None
+        if self.cache.offline:
+            if entry is None:
+                raise requests.ConnectionError(f"{request.url} is not in the offline HTTP cache")
+            return _cached_response(self, request, entry)
+
+        revalidate = "no-cache" in _parse_cache_control(request.headers.get("Cache-Control"))
+        if entry is not None and time.time() < entry["fresh_until"]:
+            if not revalidate or self.cache.forced_max_age is not None:
+                logger.debug("HTTP cache hit for %s", request.url)
+                return _cached_response(self, request, entry)
+
+        if entry is not None:
+            etag = entry["headers"].get("ETag")
+            last_modified = entry["headers"].get("Last-Modified")
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            logger.debug("HTTP cache revalidated %s (304)", request.url)
+            self.cache.refresh(key, entry, response)
+            # Hand the connection back to the pool; the caller gets the cached body instead.
+            response.close()
+            return _cached_response(self, request, entry)
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        response.from_cache = False
+        return response
+
+
+def _env_float(name: str) -> float | None:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning("Ignoring %s=%r (expected seconds)", name, raw)
+        return None
+
+
+def install_http_cache(session: requests.Session) -> requests.Session:
+    """Mount the response cache on *session* if ``JOBPULSE_HTTP_CACHE_DIR`` is set."""
+    directory = os.environ.get(CACHE_DIR_ENV, "").strip()
+    if not directory:
+        return session
+    cache = HttpCache(
+        directory,
+        forced_max_age=_env_float(MAX_AGE_ENV),
+        offline=os.environ.get(OFFLINE_ENV, "").strip().lower() in {"1", "true", "yes"},
+    )
+    adapter = CachingAdapter(cache)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def discard_cached(response: requests.Response) -> None:
+    """Forget a cached response the caller found unusable (e.g. a challenge page)."""
+    adapter = getattr(response, "connection", None)
+    if isinstance(adapter, CachingAdapter) and response.request is not None:
+        adapter.cache.discard(adapter.cache.request_key(response.request))
@@ -1,19 +1,123 @@
+"""Logging setup: console plus a rotating log file, written from a background thread.
+
+File records are handed to a ``QueueHandler`` on the calling thread and written
+by a ``QueueListener``, so scraper hot paths never block on disk I/O; the file
+level defaults to DEBUG (``JOBPULSE_LOG_FILE_LEVEL``). The log file
+rotates by size (``JOBPULSE_LOG_MAX_BYTES``, ``JOBPULSE_LOG_BACKUPS``) or, when
+``JOBPULSE_LOG_ROTATE_WHEN`` is set (e.g. ``midnight``, ``H``), by time.
+
+Repeated warnings with the same message template (per-item "Failed to parse
+offer ..." lines) are sampled: the first few pass, then at most one per
+interval, and the number suppressed is logged per template at shutdown.
+"""
+
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from pathlib import Path
+import threading
+import time
+
+MAX_BYTES_ENV = "JOBPULSE_LOG_MAX_BYTES"
+BACKUPS_ENV = "JOBPULSE_LOG_BACKUPS"
+ROTATE_WHEN_ENV = "JOBPULSE_LOG_ROTATE_WHEN"
+FILE_LEVEL_ENV = "JOBPULSE_LOG_FILE_LEVEL"
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
 
 # Prevent adding handlers multiple times when re-importing in notebooks/tests
 _logging_setup_done = False
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+_sampler: "WarningSampler | None" = None
+
+
+class WarningSampler(logging.Filter):
+    """Let through the first *burst* warnings per message template, then one per *interval* seconds.
+
+    ERROR and above always pass. Attach the same instance to several handlers:
+    the decision is made once per record.
+    """
+
+    def __init__(self, burst: int = 5, interval: float = 10.0) -> None:
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._seen: dict[tuple[str, str], list] = {}  # key -> [emitted, suppressed, last emitted at]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING:
+            return True
+        decision = getattr(record, "_jobpulse_sampled", None)
+        if decision is not None:
+            return decision
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.setdefault(key, [0, 0, 0.0])
+            decision = state[0] < self.burst or now - state[2] >= self.interval
+            if decision:
+                state[0] += 1
+                state[2] = now
+            else:
+                state[1] += 1
+        record._jobpulse_sampled = decision
+        return decision
+
+    def reset(self) -> None:
+        with self._lock:
+            self._seen.clear()
+
+    def suppressed(self) -> dict[tuple[str, str], int]:
+        """Suppressed record counts keyed by (logger name, message template)."""
+        with self._lock:
+            return {key: state[1] for key, state in self._seen.items() if state[1]}
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        sys.stderr.write(f"Warning: ignoring {name}={raw!r} (expected an integer).\n")
+        return default
+
+
+def _file_handler(log_file: str) -> logging.Handler:
+    backups = _env_int(BACKUPS_ENV, DEFAULT_BACKUPS)
+    when = os.environ.get(ROTATE_WHEN_ENV, "").strip()
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when=when, backupCount=backups, encoding="utf-8", delay=True
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=_env_int(MAX_BYTES_ENV, DEFAULT_MAX_BYTES),
+        backupCount=backups,
+        encoding="utf-8",
+        delay=True,
+    )
 
 
 def setup_logging(log_level: str = "INFO", log_file: str = "jobpulse.log") -> None:
-    """Configure logging to console (stdout) and rotating file."""
-    global _logging_setup_done
+    """Configure logging to console (stdout) and a rotating file written off-thread."""
+    global _logging_setup_done, _listener, _queue_handler, _sampler
     if _logging_setup_done:
         return
 
+    console_level = getattr(logging, log_level.upper(), logging.INFO)
+    file_level = getattr(logging, os.environ.get(FILE_LEVEL_ENV, "DEBUG").strip().upper(), logging.DEBUG)
+
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)  # Capture everything, handlers will filter by level
+    # Records below both handler levels are dropped before they are built.
+    root_logger.setLevel(min(console_level, file_level))
 
     # Define formatters
     console_format = logging.Formatter("%(levelname)-8s | %(name)s | %(message)s")
@@ -22,21 +126,31 @@ def setup_logging(log_level: str = "INFO", log_file: str = "jobpulse.log") -> No
         datefmt="%Y-%m-%d %H:%M:%S"
     )
 
-    # Console Handler (stdout)
+    _sampler = WarningSampler()
+
+    # Console Handler (stdout); stays synchronous so it interleaves with print() output.
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    console_handler.setLevel(console_level)
     console_handler.setFormatter(console_format)
+    console_handler.addFilter(_sampler)
     root_logger.addHandler(console_handler)
 
-    # File Handler
+    # File Handler, written by the listener thread; callers only enqueue.
     try:
-        # Use FileHandler or RotatingFileHandler if you want rotation
-        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
-        file_handler.setLevel(logging.DEBUG)  # Always log DEBUG to file
+        file_handler = _file_handler(log_file)
         file_handler.setFormatter(file_format)
-        root_logger.addHandler(file_handler)
-    except IOError:
-        sys.stderr.write(f"Warning: Could not open log file '{log_file}' for writing.\n")
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Warning: Could not open log file '{log_file}' for writing ({exc}).\n")
+    else:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(file_level)
+        queue_handler.addFilter(_sampler)
+        root_logger.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(log_queue, file_handler)
+        _listener.start()
+        _queue_handler = queue_handler
+    atexit.register(shutdown_logging)
 
     # Mute noisy libraries slightly
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -45,3 +159,19 @@ def setup_logging(log_level: str = "INFO", log_file: str = "jobpulse.log") -> No
 
     _logging_setup_done = True
     logging.info("Logging configured. Writing detailed logs to %s", log_file)
+
+
+def shutdown_logging() -> None:
+    """Report suppressed warnings, then flush the log file and stop the writer thread."""
+    global _listener, _queue_handler
+    if _sampler is not None:
+        for (name, template), count in sorted(_sampler.suppressed().items()):
+            logging.getLogger(name).warning(
+                "Suppressed %d more warnings like: %s", count, template, extra={"_jobpulse_sampled": True}
+            )
+        _sampler.reset()
+    if _listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
@@ -1,7 +1,9 @@
 from datetime import datetime
 from typing import Literal
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator
+
+from src.skills import canonicalize_skills, extract_skills
 
 
 class JobOffer(BaseModel):
@@ -18,4 +20,16 @@ class JobOffer(BaseModel):
     skills: list[str] = Field(default_factory=list)
     offer_url: HttpUrl
     published_at: datetime | None = None
-    scraped_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    scraped_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @field_validator("skills")
+    @classmethod
+    def _canonical_skills(cls, skills: list[str]) -> list[str]:
+        # "k8s" -> "Kubernetes"; names are interned, so offers share one string per skill.
+        return canonicalize_skills(skills)
+
+    @model_validator(mode="after")
+    def _skills_from_title(self) -> "JobOffer":
+        if not self.skills:
+            self.skills = extract_skills(self.title)
+        return self
@@ -0,0 +1,88 @@
+"""Record raw scraper inputs and load them back for offline replay.
+
+Set ``JOBPULSE_RECORD_DIR`` to make scrapers save what they fetched (JustJoinIT
+card lines and API pages, TheProtocol HTML and API payloads) before any parsing
+happens.
+``benchmarks/bench_parsers.py`` replays these files through the parsers.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+RECORD_DIR_ENV = "JOBPULSE_RECORD_DIR"
+
+# (source, kind) pairs understood by the replay stages.
+KIND_JUSTJOINIT_CARDS = "cards"
+KIND_JUSTJOINIT_API = "api"
+KIND_THEPROTOCOL_HTML = "html"
+KIND_THEPROTOCOL_API = "api"
+
+
+@dataclass
+class Recording:
+    source: str
+    kind: str
+    recorded_at: str
+    payload: object
+    path: Path | None = None
+
+
+def record_input(source: str, kind: str, payload: object) -> Path | None:
+    """Save *payload* under ``$JOBPULSE_RECORD_DIR`` if recording is enabled."""
+    output_dir = os.environ.get(RECORD_DIR_ENV, "").strip()
+    if not output_dir:
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+    path = Path(output_dir) / f"{timestamp}_{source}_{kind}.json"
+    document = {
+        "source": source,
+        "kind": kind,
+        "recorded_at": datetime.utcnow().isoformat(),
+        "payload": payload,
+    }
+    try:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, ensure_ascii=False)
+        logger.info("Recorded %s %s input to %s", source, kind, path)
+        return path
+    except (OSError, TypeError) as exc:
+        logger.warning("Failed to record %s %s input: %s", source, kind, exc)
+        return None
+
+
+def load_recording(path: str | Path) -> Recording:
+    """Load a recording file.
+
+    Bare TheProtocol API dumps (``JOBPULSE_THEPROTOCOL_API_DUMP``) and plain
+    ``.html`` snapshots are accepted as well and wrapped on the fly.
+    """
+    path = Path(path)
+    if path.suffix.lower() in {".html", ".htm"}:
+        source = "justjoinit" if "justjoinit" in path.name else "theprotocol"
+        return Recording(source, KIND_THEPROTOCOL_HTML, "", path.read_text(encoding="utf-8"), path)
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict) and {"source", "kind", "payload"} <= data.keys():
+        return Recording(data["source"], data["kind"], data.get("recorded_at", ""), data["payload"], path)
+    return Recording("theprotocol", KIND_THEPROTOCOL_API, "", data, path)
+
+
+def load_recordings(directory: str | Path) -> list[Recording]:
+    """Load every recording in *directory*, oldest first."""
+    recordings: list[Recording] = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() not in {".json", ".html", ".htm"}:
+            continue
+        try:
+            recordings.append(load_recording(path))
+        except (OSError, ValueError) as exc:
+            logger.warning("Skipping unreadable recording %s: %s", path, exc)
+    return recordings
@@ -1,6 +1,35 @@
-from .base import JobScraper
-from .justjoinit import JustJoinItScraper
-from .theprotocol import TheProtocolScraper
-from .registry import get_scrapers
+import importlib
 
-__all__ = ["JobScraper", "JustJoinItScraper", "TheProtocolScraper", "get_scrapers"]
+from .base import JobScraper, PagedJobScraper, ScraperCapabilities
+from .registry import UnknownSourceError, available_sources, check_sources, get_capabilities, get_scrapers
+from .scheduler import browser_slot, run_scrapers
+
+__all__ = [
+    "JobScraper",
+    "JustJoinItScraper",
+    "PagedJobScraper",
+    "ScraperCapabilities",
+    "TheProtocolScraper",
+    "UnknownSourceError",
+    "available_sources",
+    "browser_slot",
+    "check_sources",
+    "get_capabilities",
+    "get_scrapers",
+    "run_scrapers",
+]
+
+# Scraper classes pull in Selenium/requests/bs4, so they are resolved on first access.
+_LAZY_EXPORTS = {
+    "JustJoinItScraper": ".justjoinit",
+    "TheProtocolScraper": ".theprotocol",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
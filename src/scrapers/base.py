@@ -1,10 +1,40 @@
-from typing import Protocol
+from dataclasses import dataclass
+from typing import ClassVar, Protocol, TYPE_CHECKING
 
-from src.models import JobOffer
+if TYPE_CHECKING:
+    from src.models import JobOffer
+
+
+@dataclass(frozen=True)
+class ScraperCapabilities:
+    """What a scraper can do and how hard it may be driven by the orchestrator."""
+
+    supports_pagination: bool = False
+    incremental: bool = False  # can fetch only offers newer than the last run
+    needs_browser: bool = False  # holds a WebDriver session for the whole fetch
+    max_concurrency: int = 1  # parallel requests the source tolerates
+    rate_limit_per_sec: float | None = None  # request rate cap, None = unlimited
+
+
+DEFAULT_CAPABILITIES = ScraperCapabilities()
 
 
 class JobScraper(Protocol):
     source: str
+    capabilities: ClassVar[ScraperCapabilities]
+
+    def fetch_offers(self, limit: int = 20, timeout: int = 15) -> list["JobOffer"]:
+        ...
+
+
+class PagedJobScraper(JobScraper, Protocol):
+    """A scraper that can fetch an explicit page range (``supports_pagination``).
+
+    Page numbers start at 1 and hold ``page_size`` offers each, so disjoint
+    ranges never return the same listing page (see :mod:`src.workqueue`).
+    """
+
+    page_size: ClassVar[int]
 
-    def fetch_offers(self, limit: int = 20, timeout: int = 15) -> list[JobOffer]:
+    def fetch_pages(self, first_page: int, last_page: int) -> list["JobOffer"]:
         ...
@@ -3,19 +3,28 @@ import os
 import re
 import time
 from datetime import datetime
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+import requests
 
+from src.http_cache import install_http_cache
 from src.models import JobOffer
+from src.recording import KIND_JUSTJOINIT_API, KIND_JUSTJOINIT_CARDS, record_input
+from src.scrapers.base import ScraperCapabilities
+from src.scrapers.parallel import map_candidates
+from src.scrapers.scheduler import browser_slot
+
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 logger = logging.getLogger(__name__)
 
 JUSTJOINIT_OFFERS_URL = "https://justjoin.it/job-offers/all-locations"
+JUSTJOINIT_OFFER_URL = "https://justjoin.it/job-offer/{slug}"
+JUSTJOINIT_API_URL = "https://api.justjoin.it/v2/user-panel/offers"
+JUSTJOINIT_API_PAGE_SIZE = 100
+FETCH_MODE_ENV = "JOBPULSE_JUSTJOINIT_MODE"  # "api" (default, browser fallback) or "browser"
 
 
 def _parse_iso_datetime(raw_value: str | None) -> datetime | None:
@@ -34,16 +43,39 @@ def _normalize_company(lines: list[str], title: str) -> str:
     return "Unknown company"
 
 
-def _is_salary_line(line: str) -> bool:
-    lowered = line.lower()
+_SALARY_RANGE_RE = re.compile(r"(\d[\d\s]*)\s*-\s*(\d[\d\s]*)\s*PLN", flags=re.IGNORECASE)
+_DAYS_LEFT_RE = re.compile(r"\d+d left")
+_MORE_LOCATIONS_RE = re.compile(r",\s*\+\d+")
+_META_WORDS = frozenset({"new", "locations", "1-click apply", "super offer"})
+
+# Tags assigned by classify_card_lines().
+LINE_TITLE = "title"
+LINE_SALARY = "salary"
+LINE_COMPANY = "company"
+LINE_CITY = "city"
+LINE_META = "meta"
+LINE_SKILL = "skill"
+LINE_SKIPPED = "skipped"  # repeats a title/company/city/salary line, too short or a duplicate skill
+
+# Intrinsic kind of a line, independent of its position on the card.
+_KIND_TEXT = 0
+_KIND_META = 1
+_KIND_SALARY = 2
+
+
+def _is_salary_lowered(lowered: str) -> bool:
     return "pln/" in lowered or "undisclosed salary" in lowered
 
 
+def _is_salary_line(line: str) -> bool:
+    return _is_salary_lowered(line.lower())
+
+
 def _parse_salary_line(line: str) -> tuple[int | None, int | None]:
     if not _is_salary_line(line):
         return None, None
 
-    match = re.search(r"(\d[\d\s]*)\s*-\s*(\d[\d\s]*)\s*PLN", line, flags=re.IGNORECASE)
+    match = _SALARY_RANGE_RE.search(line)
     if not match:
         return None, None
 
@@ -56,52 +88,120 @@ def _is_meta_line(line: str) -> bool:
     stripped = line.strip()
     lowered = stripped.lower()
 
-    if lowered in {"new", "locations", "1-click apply", "super offer"}:
+    if lowered in _META_WORDS:
         return True
-    if re.fullmatch(r"\d+d left", lowered):
+    if _DAYS_LEFT_RE.fullmatch(lowered):
         return True
-    if re.fullmatch(r",\s*\+\d+", stripped):
+    if _MORE_LOCATIONS_RE.fullmatch(stripped):
         return True
     return False
 
 
-def _extract_core_fields(lines: list[str], offer_url: str) -> tuple[str, str, str | None, str | None, int | None, int | None, list[str], str]:
-    cleaned_lines = [line for line in lines if line and line.strip()]
-    if not cleaned_lines:
-        fallback_title = _extract_slug(offer_url).replace("-", " ").title()
-        return fallback_title, "Unknown company", None, None, None, None, [], "unknown"
+def _line_kind(line: str) -> int:
+    lowered = line.lower()
+    if _is_salary_lowered(lowered):
+        # Salary wins over meta; no meta word/pattern can contain "pln/" anyway.
+        return _KIND_SALARY
+    stripped_lowered = lowered.strip()
+    if (
+        stripped_lowered in _META_WORDS
+        or _DAYS_LEFT_RE.fullmatch(stripped_lowered)
+        or _MORE_LOCATIONS_RE.fullmatch(line.strip())
+    ):
+        return _KIND_META
+    return _KIND_TEXT
+
+
+def classify_card_lines(lines: list[str]) -> list[tuple[str, str]]:
+    """Tag every non-blank card line once as title/salary/company/city/meta/skill.
+
+    Each line is lower-cased and matched against the precompiled patterns a
+    single time; positional rules (title first, salary right after it, company
+    is the first plain line, city the next different one) then work on the
+    cached kinds. Skills are de-duplicated with a set, so the whole card is
+    classified in linear time.
+    """
+    cleaned = [line for line in lines if line and line.strip()]
+    if not cleaned:
+        return []
+
+    kinds = [_line_kind(line) for line in cleaned]
+    tags: list[str | None] = [None] * len(cleaned)
 
     cursor = 0
-    if cleaned_lines[0].strip().lower() == "super offer" and len(cleaned_lines) > 1:
+    if len(cleaned) > 1 and cleaned[0].strip().lower() == "super offer":
         cursor = 1
 
-    title = cleaned_lines[cursor]
+    tags[cursor] = LINE_TITLE
+    title = cleaned[cursor]
     cursor += 1
 
     salary_line: str | None = None
-    if cursor < len(cleaned_lines) and _is_salary_line(cleaned_lines[cursor]):
-        salary_line = cleaned_lines[cursor]
+    if cursor < len(cleaned) and kinds[cursor] == _KIND_SALARY:
+        tags[cursor] = LINE_SALARY
+        salary_line = cleaned[cursor]
         cursor += 1
 
     company = "Unknown company"
     company_index = -1
-    for index in range(cursor, len(cleaned_lines)):
-        candidate = cleaned_lines[index]
-        if _is_meta_line(candidate) or _is_salary_line(candidate):
-            continue
-        company = candidate
-        company_index = index
-        break
+    for index in range(cursor, len(cleaned)):
+        if kinds[index] == _KIND_TEXT:
+            company = cleaned[index]
+            company_index = index
+            tags[index] = LINE_COMPANY
+            break
 
     city: str | None = None
-    search_city_from = company_index + 1 if company_index >= 0 else cursor
-    for index in range(search_city_from, len(cleaned_lines)):
-        candidate = cleaned_lines[index]
-        if _is_meta_line(candidate) or _is_salary_line(candidate):
+    if company_index >= 0:
+        for index in range(company_index + 1, len(cleaned)):
+            if kinds[index] == _KIND_TEXT and cleaned[index] != company:
+                city = cleaned[index]
+                tags[index] = LINE_CITY
+                break
+
+    excluded = {title, company}
+    if salary_line:
+        excluded.add(salary_line)
+    if city:
+        excluded.add(city)
+
+    seen_skills: set[str] = set()
+    for index, line in enumerate(cleaned):
+        if tags[index] is not None:
             continue
-        if candidate != company:
-            city = candidate
-            break
+        if kinds[index] != _KIND_TEXT:
+            tags[index] = LINE_META
+        elif line in excluded or len(line) < 2 or line in seen_skills:
+            tags[index] = LINE_SKIPPED
+        else:
+            tags[index] = LINE_SKILL
+            seen_skills.add(line)
+
+    return list(zip(tags, cleaned))
+
+
+def _extract_core_fields(lines: list[str], offer_url: str) -> tuple[str, str, str | None, str | None, int | None, int | None, list[str], str]:
+    tagged = classify_card_lines(lines)
+    if not tagged:
+        fallback_title = _extract_slug(offer_url).replace("-", " ").title()
+        return fallback_title, "Unknown company", None, None, None, None, [], "unknown"
+
+    title = ""
+    company = "Unknown company"
+    city: str | None = None
+    salary_line: str | None = None
+    skills: list[str] = []
+    for tag, line in tagged:
+        if tag == LINE_SKILL:
+            skills.append(line)
+        elif tag == LINE_TITLE:
+            title = line
+        elif tag == LINE_COMPANY:
+            company = line
+        elif tag == LINE_CITY:
+            city = line
+        elif tag == LINE_SALARY:
+            salary_line = line
 
     salary_min, salary_max = _parse_salary_line(salary_line or "")
 
@@ -113,21 +213,6 @@ def _extract_core_fields(lines: list[str], offer_url: str) -> tuple[str, str, st
     if workplace_type == "unknown" and "remote" in slug_lower:
         workplace_type = "remote"
 
-    excluded = {title, company}
-    if salary_line:
-        excluded.add(salary_line)
-    if city:
-        excluded.add(city)
-
-    skills: list[str] = []
-    for line in cleaned_lines:
-        if line in excluded or _is_meta_line(line) or _is_salary_line(line):
-            continue
-        if len(line) < 2:
-            continue
-        if line not in skills:
-            skills.append(line)
-
     return title, company, city, salary_line, salary_min, salary_max, skills, workplace_type
 
 
@@ -140,12 +225,54 @@ def _extract_slug(offer_url: str) -> str:
 
 class JustJoinItScraper:
     source = "justjoinit"
+    # JSON API first; the Selenium fallback takes a browser slot itself.
+    capabilities = ScraperCapabilities(supports_pagination=True, max_concurrency=2, rate_limit_per_sec=2.0)
+    page_size = JUSTJOINIT_API_PAGE_SIZE
 
     def __init__(self, driver_timeout: int = 15, retries: int = 2) -> None:
         self.driver_timeout = driver_timeout
         self.retries = retries
 
     def fetch_offers(self, limit: int = 20) -> list[JobOffer]:
+        mode = os.environ.get(FETCH_MODE_ENV, "api").strip().lower()
+        if mode != "browser":
+            offers = self._fetch_from_api(limit)
+            if offers:
+                return offers
+            logger.warning("JustJoinIT API gave no offers; falling back to the browser scraper")
+
+        with browser_slot(self.source):
+            return self._fetch_with_browser(limit)
+
+    def fetch_pages(self, first_page: int, last_page: int) -> list[JobOffer]:
+        """Fetch API pages *first_page*..*last_page* (inclusive, ``page_size`` offers each)."""
+        limit = (last_page - first_page + 1) * self.page_size
+        return self._fetch_from_api(limit, first_page=first_page)
+
+    def _fetch_from_api(self, limit: int, first_page: int = 1) -> list[JobOffer]:
+        logger.info(
+            "Starting JustJoinIT API fetch (limit=%d, first page=%d, timeout=%ds)",
+            limit,
+            first_page,
+            self.driver_timeout,
+        )
+        items = _fetch_api_items(
+            limit=limit, timeout=self.driver_timeout, retries=self.retries, first_page=first_page
+        )
+        if not items:
+            return []
+
+        offers, _ = map_candidates(
+            items[:limit],
+            _api_item_to_job_offer,
+            on_failure=lambda item, error: logger.warning("Failed to map JustJoinIT API offer %s: %s", item.get("slug"), error),
+        )
+        logger.info("Successfully mapped %d offers from the JustJoinIT API", len(offers))
+        return offers
+
+    def _fetch_with_browser(self, limit: int) -> list[JobOffer]:
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
         logger.info(
             "Starting JustJoinIT scrape (limit=%d, timeout=%ds, retries=%d)",
             limit,
@@ -174,52 +301,213 @@ class JustJoinItScraper:
             logger.warning("No offers found on JustJoinIT main page")
             return []
 
-        offers: list[JobOffer] = []
-        for index, (offer_url, lines) in enumerate(raw_items, 1):
-            if len(offers) >= limit:
-                break
-            try:
-                offer = self._to_job_offer(offer_url, lines)
-                offers.append(offer)
-            except Exception as exc:
-                logger.warning("Failed to parse offer %s: %s", offer_url, exc)
-                continue
+        record_input(self.source, KIND_JUSTJOINIT_CARDS, [[href, lines] for href, lines in raw_items])
+
+        offers, _ = map_candidates(
+            raw_items,
+            _raw_item_to_job_offer,
+            on_failure=lambda item, error: logger.warning("Failed to parse offer %s: %s", item[0], error),
+        )
+        offers = offers[:limit]
 
         logger.info("Successfully parsed %d offers", len(offers))
         return offers
 
     def _to_job_offer(self, offer_url: str, lines: list[str]) -> JobOffer:
-        title, company, city, salary_line, salary_min, salary_max, skills, workplace_type = _extract_core_fields(lines, offer_url)
-
-        employment_type: str | None = None
-        if salary_line:
-            lowered = salary_line.lower()
-            if "/h" in lowered:
-                employment_type = "b2b"
-            elif "/month" in lowered or "/year" in lowered:
-                employment_type = "permanent"
-
-        # Safe extraction of slug
-        slug = _extract_slug(offer_url)
-
-        return JobOffer(
-            source="justjoinit",
-            external_id=slug,
-            title=title or "Unknown Title",
-            company=company,
-            city=city,
-            workplace_type=workplace_type,
-            employment_type=employment_type,
-            salary_min_pln=salary_min,
-            salary_max_pln=salary_max,
-            currency="PLN",
-            skills=skills[:12],  # Take top 12 skills
-            offer_url=offer_url,
-            published_at=None,
+        return _raw_item_to_job_offer((offer_url, lines))
+
+
+def _raw_item_to_job_offer(raw_item: tuple[str, list[str]]) -> JobOffer:
+    """Map one ``(href, lines)`` card to a JobOffer (module-level so worker processes can pickle it)."""
+    offer_url, lines = raw_item
+    title, company, city, salary_line, salary_min, salary_max, skills, workplace_type = _extract_core_fields(lines, offer_url)
+
+    employment_type: str | None = None
+    if salary_line:
+        lowered = salary_line.lower()
+        if "/h" in lowered:
+            employment_type = "b2b"
+        elif "/month" in lowered or "/year" in lowered:
+            employment_type = "permanent"
+
+    # Safe extraction of slug
+    slug = _extract_slug(offer_url)
+
+    return JobOffer(
+        source="justjoinit",
+        external_id=slug,
+        title=title or "Unknown Title",
+        company=company,
+        city=city,
+        workplace_type=workplace_type,
+        employment_type=employment_type,
+        salary_min_pln=salary_min,
+        salary_max_pln=salary_max,
+        currency="PLN",
+        skills=skills[:12],  # Take top 12 skills
+        offer_url=offer_url,
+        published_at=None,
+    )
+
+
+def _build_api_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(
+        {
+            "User-Agent": os.environ.get(
+                "JOBPULSE_JUSTJOINIT_USER_AGENT",
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+            ),
+            "Accept": "application/json",
+            "Version": "2",
+        }
+    )
+    return install_http_cache(session)
+
+
+def extract_offers_from_api(payload: object) -> tuple[list[dict], int | None]:
+    """Return ``(offer items, next page)`` from one page of the offers API."""
+    if isinstance(payload, list):
+        return [item for item in payload if isinstance(item, dict)], None
+    if not isinstance(payload, dict):
+        return [], None
+
+    data = payload.get("data")
+    items = [item for item in data if isinstance(item, dict)] if isinstance(data, list) else []
+    meta = payload.get("meta")
+    next_page = meta.get("nextPage") if isinstance(meta, dict) else None
+    return items, next_page if isinstance(next_page, int) else None
+
+
+def _fetch_api_items(
+    limit: int,
+    timeout: int,
+    retries: int = 2,
+    session: requests.Session | None = None,
+    first_page: int = 1,
+) -> list[dict]:
+    session = session or _build_api_session()
+    # Page numbers only line up with fetch_pages() ranges when every page is full size.
+    per_page = JUSTJOINIT_API_PAGE_SIZE if first_page > 1 else min(JUSTJOINIT_API_PAGE_SIZE, max(limit, 1))
+    min_interval = 1 / JustJoinItScraper.capabilities.rate_limit_per_sec
+    items: list[dict] = []
+    page: int | None = first_page
+    while page is not None and len(items) < limit:
+        params = {
+            "page": page,
+            "perPage": per_page,
+            "sortBy": "published",
+            "orderBy": "DESC",
+            "salaryCurrencies": "PLN",
+        }
+        payload = None
+        for attempt in range(retries + 1):
+            try:
+                response = session.get(JUSTJOINIT_API_URL, params=params, timeout=timeout)
+                response.raise_for_status()
+                payload = response.json()
+                break
+            except requests.RequestException as exc:
+                logger.warning(
+                    "JustJoinIT API request failed (page %d, attempt %d/%d): %s", page, attempt + 1, retries + 1, exc
+                )
+                time.sleep(1 + attempt)
+            except ValueError as exc:
+                logger.warning("JustJoinIT API response is not JSON: %s", exc)
+                break
+        if payload is None:
+            break
+
+        record_input("justjoinit", KIND_JUSTJOINIT_API, payload)
+        page_items, next_page = extract_offers_from_api(payload)
+        items.extend(page_items)
+        if not page_items:
+            break
+        page = next_page
+        if page is not None and len(items) < limit:
+            time.sleep(min_interval)
+
+    logger.info("JustJoinIT API returned %d offers", len(items))
+    return items
+
+
+_API_UNIT_TO_MONTH = {"hour": 168, "day": 21, "month": 1, "year": 1 / 12}
+_API_EMPLOYMENT_TYPES = {"b2b": "b2b", "permanent": "permanent", "mandate_contract": "uz", "any": None}
+_API_WORKPLACE_TYPES = {"remote": "remote", "hybrid": "hybrid", "office": "office"}
+
+
+def _api_salary(employment_types: object) -> tuple[int | None, int | None, str | None]:
+    """Pick the first employment type with a PLN salary; hourly/yearly rates become monthly."""
+    if not isinstance(employment_types, list):
+        return None, None, None
+    first_type: str | None = None
+    for entry in employment_types:
+        if not isinstance(entry, dict):
+            continue
+        employment_type = _normalize_api_employment(entry.get("type"))
+        first_type = first_type or employment_type
+        salary_from = entry.get("fromPln")
+        salary_to = entry.get("toPln")
+        if salary_from is None and salary_to is None and str(entry.get("currency") or "").lower() == "pln":
+            salary_from, salary_to = entry.get("from"), entry.get("to")
+        if salary_from is None and salary_to is None:
+            continue
+        factor = _API_UNIT_TO_MONTH.get(str(entry.get("unit") or "month").lower(), 1)
+        return (
+            int(round(salary_from * factor)) if salary_from is not None else None,
+            int(round(salary_to * factor)) if salary_to is not None else None,
+            employment_type,
         )
+    return None, None, first_type
+
+
+def _normalize_api_employment(raw_type: object) -> str | None:
+    if not raw_type:
+        return None
+    lowered = str(raw_type).strip().lower()
+    return _API_EMPLOYMENT_TYPES.get(lowered, lowered)
+
+
+def _api_skills(raw_skills: object) -> list[str]:
+    if not isinstance(raw_skills, list):
+        return []
+    skills: list[str] = []
+    for skill in raw_skills:
+        name = skill.get("name") if isinstance(skill, dict) else skill
+        if name and str(name).strip():
+            skills.append(str(name).strip())
+    return skills
+
+
+def _api_item_to_job_offer(item: dict) -> JobOffer:
+    """Map one offers-API item to a JobOffer (module-level so worker processes can pickle it)."""
+    slug = str(item.get("slug") or "").strip()
+    salary_min, salary_max, employment_type = _api_salary(item.get("employmentTypes"))
+    return JobOffer(
+        source="justjoinit",
+        external_id=slug,
+        title=item.get("title") or "Unknown Title",
+        company=item.get("companyName") or "Unknown company",
+        city=item.get("city") or None,
+        workplace_type=_API_WORKPLACE_TYPES.get(str(item.get("workplaceType") or "").lower(), "unknown"),
+        employment_type=employment_type,
+        salary_min_pln=salary_min,
+        salary_max_pln=salary_max,
+        currency="PLN",
+        skills=(_api_skills(item.get("requiredSkills")) + _api_skills(item.get("niceToHaveSkills")))[:12],
+        offer_url=JUSTJOINIT_OFFER_URL.format(slug=slug),
+        published_at=_parse_iso_datetime(item.get("publishedAt")),
+    )
 
 
 def _collect_offer_links(timeout: int, limit: int) -> list[tuple[str, list[str]]]:
+    from selenium import webdriver
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
     logger.debug("Initializing headless Chrome...")
     options = Options()
     options.add_argument("--headless=new")
@@ -284,7 +572,7 @@ def _collect_offer_links(timeout: int, limit: int) -> list[tuple[str, list[str]]
         driver.quit()
 
 
-def _dump_snapshot(driver: webdriver.Chrome, reason: str) -> None:
+def _dump_snapshot(driver: "webdriver.Chrome", reason: str) -> None:
     output_dir = os.environ.get("JOBPULSE_SNAPSHOT_DIR", "snapshots")
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
@@ -0,0 +1,120 @@
+"""Optional process-pool stage for mapping raw scraper candidates to ``JobOffer``.
+
+Field extraction, salary regexes and Pydantic validation are CPU-bound, so
+large harvests are split into chunks and mapped in worker processes. Workers
+send back offers as plain field tuples (already validated), which the parent
+turns into ``JobOffer`` objects with ``model_construct`` – no second
+validation pass. Small batches stay in-process to avoid pool startup cost.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Sequence, TypeVar
+
+from src.models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PARALLEL_THRESHOLD_ENV = "JOBPULSE_PARALLEL_MAP_THRESHOLD"
+MAP_WORKERS_ENV = "JOBPULSE_MAP_WORKERS"
+DEFAULT_PARALLEL_THRESHOLD = 5000
+
+_FIELDS = tuple(JobOffer.model_fields)
+
+
+def _pack(offer: JobOffer) -> tuple:
+    return tuple(getattr(offer, name) for name in _FIELDS), tuple(offer.model_fields_set)
+
+
+def _unpack(packed: tuple) -> JobOffer:
+    values, fields_set = packed
+    return JobOffer.model_construct(_fields_set=set(fields_set), **dict(zip(_FIELDS, values)))
+
+
+def _map_chunk(
+    mapper: Callable[[T], JobOffer], chunk: list[tuple[int, T]]
+) -> tuple[list[tuple[int, tuple]], list[tuple[int, str]]]:
+    packed: list[tuple[int, tuple]] = []
+    failures: list[tuple[int, str]] = []
+    for index, item in chunk:
+        try:
+            packed.append((index, _pack(mapper(item))))
+        except Exception as exc:
+            failures.append((index, str(exc)))
+    return packed, failures
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Ignoring %s=%r (expected an integer)", name, raw)
+        return default
+
+
+def map_candidates(
+    items: Sequence[T],
+    mapper: Callable[[T], JobOffer],
+    on_failure: Callable[[T, str], None],
+    threshold: int | None = None,
+    max_workers: int | None = None,
+) -> tuple[list[JobOffer], int]:
+    """Map *items* with *mapper*, in a process pool above *threshold* items.
+
+    *mapper* must be a module-level function (it is pickled by reference).
+    *on_failure* is called in the parent process, in input order, for each item
+    whose mapping raised. Returns ``(offers, failures)`` with offers in input order.
+    """
+    if threshold is None:
+        threshold = _env_int(PARALLEL_THRESHOLD_ENV, DEFAULT_PARALLEL_THRESHOLD)
+    if max_workers is None:
+        max_workers = _env_int(MAP_WORKERS_ENV, os.cpu_count() or 1)
+
+    if threshold <= 0 or len(items) < threshold or max_workers <= 1:
+        return _map_serial(items, mapper, on_failure)
+
+    indexed = list(enumerate(items))
+    chunk_size = max(200, len(indexed) // (max_workers * 4) + 1)
+    chunks = [indexed[start:start + chunk_size] for start in range(0, len(indexed), chunk_size)]
+    logger.info(
+        "Mapping %d candidates in a process pool (workers=%d, chunks=%d)",
+        len(indexed),
+        max_workers,
+        len(chunks),
+    )
+
+    results: list[tuple[int, tuple]] = []
+    failures: list[tuple[int, str]] = []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for packed, chunk_failures in pool.map(_map_chunk, [mapper] * len(chunks), chunks):
+                results.extend(packed)
+                failures.extend(chunk_failures)
+    except (OSError, RuntimeError) as exc:
+        logger.warning("Process pool unavailable (%s); mapping serially", exc)
+        return _map_serial(items, mapper, on_failure)
+
+    for index, error in failures:
+        on_failure(items[index], error)
+
+    return [_unpack(values) for _, values in results], len(failures)
+
+
+def _map_serial(
+    items: Sequence[T], mapper: Callable[[T], JobOffer], on_failure: Callable[[T, str], None]
+) -> tuple[list[JobOffer], int]:
+    offers: list[JobOffer] = []
+    failures = 0
+    for item in items:
+        try:
+            offers.append(mapper(item))
+        except Exception as exc:
+            failures += 1
+            on_failure(item, str(exc))
+    return offers, failures
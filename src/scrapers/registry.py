@@ -1,16 +1,95 @@
-from src.scrapers import JobScraper, JustJoinItScraper, TheProtocolScraper
+"""Scraper plugin registry.
+
+Built-in scrapers are listed in ``_BUILTIN_SCRAPERS``; third-party packages add
+sources through the ``jobpulse.scrapers`` entry-point group, e.g. in their
+``pyproject.toml``::
+
+    [project.entry-points."jobpulse.scrapers"]
+    nofluffjobs = "jobpulse_nfj.scraper:NoFluffJobsScraper"
+
+Scraper modules import Selenium/requests/bs4 at module level, so a class is
+imported only when its source is requested.
+"""
+
+import importlib
+import logging
+
+from src.scrapers.base import DEFAULT_CAPABILITIES, JobScraper, ScraperCapabilities
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "jobpulse.scrapers"
+
+_BUILTIN_SCRAPERS = {
+    "justjoinit": "src.scrapers.justjoinit:JustJoinItScraper",
+    "theprotocol": "src.scrapers.theprotocol:TheProtocolScraper",
+}
+
+_plugin_entry_points: dict | None = None
+_loaded_classes: dict[str, type] = {}
+
+
+class UnknownSourceError(ValueError):
+    """Raised when a requested source has no registered scraper."""
+
+    def __init__(self, unknown: list[str], available: list[str]) -> None:
+        self.unknown = unknown
+        self.available = available
+        super().__init__(
+            f"Unknown source(s): {', '.join(unknown)}. Available sources: {', '.join(available)}"
+        )
+
+
+def _plugins() -> dict:
+    global _plugin_entry_points
+    if _plugin_entry_points is None:
+        from importlib.metadata import entry_points
+
+        _plugin_entry_points = {}
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name in _BUILTIN_SCRAPERS:
+                logger.warning(
+                    "Ignoring plugin %s for source '%s' (built-in scraper takes precedence)",
+                    entry_point.value,
+                    entry_point.name,
+                )
+                continue
+            _plugin_entry_points[entry_point.name] = entry_point
+    return _plugin_entry_points
+
+
+def available_sources() -> list[str]:
+    return [*_BUILTIN_SCRAPERS, *sorted(_plugins())]
+
+
+def check_sources(sources: list[str]) -> None:
+    """Raise :class:`UnknownSourceError` if any of *sources* is not registered."""
+    unknown = [source for source in sources if source not in _BUILTIN_SCRAPERS and source not in _plugins()]
+    if unknown:
+        raise UnknownSourceError(unknown, available_sources())
+
+
+def get_scraper_class(source: str) -> type:
+    scraper_cls = _loaded_classes.get(source)
+    if scraper_cls is not None:
+        return scraper_cls
+
+    check_sources([source])
+    path = _BUILTIN_SCRAPERS.get(source)
+    if path is not None:
+        module_name, class_name = path.split(":")
+        scraper_cls = getattr(importlib.import_module(module_name), class_name)
+    else:
+        scraper_cls = _plugins()[source].load()
+        logger.debug("Loaded scraper plugin '%s' from %s", source, _plugins()[source].value)
+    _loaded_classes[source] = scraper_cls
+    return scraper_cls
+
+
+def get_capabilities(source: str) -> ScraperCapabilities:
+    return getattr(get_scraper_class(source), "capabilities", DEFAULT_CAPABILITIES)
 
 
 def get_scrapers(sources: list[str]) -> list[JobScraper]:
-    available = {
-        "justjoinit": JustJoinItScraper,
-        "theprotocol": TheProtocolScraper,
-    }
-
-    scrapers: list[JobScraper] = []
-    for source in sources:
-        scraper_cls = available.get(source)
-        if scraper_cls:
-            scrapers.append(scraper_cls())
-
-    return scrapers
+    check_sources(sources)
+    return [get_scraper_class(source)() for source in sources]
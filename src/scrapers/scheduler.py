@@ -0,0 +1,89 @@
+"""Run scrapers concurrently according to their declared capabilities.
+
+HTTP sources run side by side, one thread each. Browser-bound sources
+(``needs_browser``) share a WebDriver budget: each holds one browser slot for
+its whole fetch, so at most ``webdriver_budget`` Chrome instances are alive at
+a time. Scrapers with a browser *fallback* take a slot with
+:func:`browser_slot` around the fallback only.
+
+A failed source is left out of the result instead of reporting no offers,
+so callers can tell it apart from an empty listing (and not cache it).
+
+``max_concurrency`` and ``rate_limit_per_sec`` are advisory here: each
+source is fetched by a single ``fetch_offers`` call, so the scheduler has no
+requests of its own to spread. The paged JustJoinIT fetch and the detail
+enrichment worker enforce them.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, TYPE_CHECKING
+
+from src.scrapers.base import DEFAULT_CAPABILITIES, JobScraper
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+_browser_slots = threading.BoundedSemaphore(1)
+
+
+def set_webdriver_budget(budget: int) -> None:
+    """Set how many WebDriver sessions may run at once (minimum 1)."""
+    global _browser_slots
+    _browser_slots = threading.BoundedSemaphore(max(1, budget))
+
+
+@contextmanager
+def browser_slot(source: str) -> Iterator[None]:
+    slots = _browser_slots
+    if not slots.acquire(blocking=False):
+        logger.info("%s waiting for a free WebDriver slot", source)
+        slots.acquire()
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def _run_scraper(scraper: JobScraper, limit: int) -> list["JobOffer"] | None:
+    """Offers of one source, or None if its fetch raised."""
+    capabilities = getattr(scraper, "capabilities", DEFAULT_CAPABILITIES)
+    start = time.perf_counter()
+    try:
+        if capabilities.needs_browser:
+            with browser_slot(scraper.source):
+                offers = scraper.fetch_offers(limit=limit)
+        else:
+            offers = scraper.fetch_offers(limit=limit)
+    except Exception:
+        logger.exception("Scraper %s failed", scraper.source)
+        return None
+    logger.info("%s returned %d offers in %.2fs", scraper.source, len(offers), time.perf_counter() - start)
+    return offers
+
+
+def run_scrapers(
+    scrapers: list[JobScraper], limit: int, webdriver_budget: int = 1
+) -> dict[str, list["JobOffer"]]:
+    """Fetch from all *scrapers*; return offers keyed by source, without the sources that failed."""
+    set_webdriver_budget(webdriver_budget)
+    if len(scrapers) <= 1:
+        results = {scraper.source: _run_scraper(scraper, limit) for scraper in scrapers}
+        return {source: offers for source, offers in results.items() if offers is not None}
+
+    browser_bound = [s.source for s in scrapers if getattr(s, "capabilities", DEFAULT_CAPABILITIES).needs_browser]
+    logger.info(
+        "Scheduling %d sources (browser-bound: %s, webdriver budget=%d)",
+        len(scrapers),
+        ", ".join(browser_bound) or "none",
+        max(1, webdriver_budget),
+    )
+    with ThreadPoolExecutor(max_workers=len(scrapers), thread_name_prefix="scraper") as pool:
+        futures = {scraper.source: pool.submit(_run_scraper, scraper, limit) for scraper in scrapers}
+        results = {source: future.result() for source, future in futures.items()}
+    return {source: offers for source, offers in results.items() if offers is not None}
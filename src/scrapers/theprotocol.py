@@ -2,19 +2,34 @@ import logging
 import os
 import re
 import time
+from dataclasses import dataclass
+from typing import Callable, TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import json
 
+from src.cookie_jar import open_cookie_jar
+from src.http_cache import discard_cached, install_http_cache
 from src.models import JobOffer
+from src.recording import KIND_THEPROTOCOL_API, KIND_THEPROTOCOL_HTML, record_input
+from src.scrapers.base import ScraperCapabilities
+from src.scrapers.parallel import map_candidates
+from src.scrapers.scheduler import browser_slot
+
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 logger = logging.getLogger(__name__)
 
+THEPROTOCOL_SITE = "theprotocol.it"
 THEPROTOCOL_OFFERS_URL = "https://theprotocol.it/praca"
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
 THEPROTOCOL_API_URL = (
     "https://apus-api.theprotocol.it/v2/recommendations"
     "?context=listing&source=protocol&offset={offset}&limit={limit}"
@@ -36,14 +51,21 @@ def _parse_cookie_header(cookie_header: str) -> dict[str, str]:
 
 def _build_session() -> requests.Session:
     session = requests.Session()
-    user_agent = os.environ.get(
-        "JOBPULSE_THEPROTOCOL_USER_AGENT",
-        (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/124.0.0.0 Safari/537.36"
-        ),
-    )
+    user_agent = os.environ.get("JOBPULSE_THEPROTOCOL_USER_AGENT", DEFAULT_USER_AGENT)
+    cookie_header = os.environ.get("JOBPULSE_THEPROTOCOL_COOKIE", "").strip()
+    # Cookies pasted into JOBPULSE_THEPROTOCOL_COOKIE take precedence over saved ones.
+    jar = None if cookie_header else open_cookie_jar()
+    if jar is not None:
+        saved = jar.apply_to_session(session, THEPROTOCOL_SITE)
+        if saved:
+            # Clearance is bound to the User-Agent of the browser that earned it.
+            user_agent = jar.user_agent(THEPROTOCOL_SITE) or user_agent
+            clearance = jar.expires_at(THEPROTOCOL_SITE, "cf_clearance")
+            logger.info(
+                "Using %d saved TheProtocol cookies from the cookie jar (clearance %s)",
+                saved,
+                f"valid for {(clearance - time.time()) / 60:.0f} min" if clearance else "absent",
+            )
     session.headers.update(
         {
             "User-Agent": user_agent,
@@ -54,13 +76,25 @@ def _build_session() -> requests.Session:
         }
     )
 
-    cookie_header = os.environ.get("JOBPULSE_THEPROTOCOL_COOKIE", "").strip()
     if cookie_header:
         parsed = _parse_cookie_header(cookie_header)
         session.cookies.update(parsed)
         logger.info("Using custom TheProtocol cookies from JOBPULSE_THEPROTOCOL_COOKIE (%d keys)", len(parsed))
 
-    return session
+    return install_http_cache(session)
+
+
+def _remember_session_cookies(session: requests.Session) -> None:
+    """Save cookies the server set or refreshed (e.g. ``__cf_bm``) back to the cookie jar."""
+    jar = open_cookie_jar()
+    if jar is not None:
+        jar.save_session_cookies(session.cookies, THEPROTOCOL_SITE)
+
+
+def _forget_rejected_cookies() -> None:
+    jar = open_cookie_jar()
+    if jar is not None and jar.discard(THEPROTOCOL_SITE):
+        logger.info("Saved TheProtocol cookies no longer pass the challenge; dropped them from the cookie jar")
 
 
 def _looks_like_challenge(html: str) -> bool:
@@ -130,71 +164,230 @@ def _safe_get(item: dict, keys: list[str]) -> str | None:
     return None
 
 
+# Absolute paths urljoin would return unchanged (no dot segments, query, fragment or params).
+_PLAIN_PATH_RE = re.compile(r"(?:/(?!\.)[\w\-,~%!$&'()*+=:@]*)+")
+
+
 def _normalize_offer_url(raw: str | None) -> str | None:
     if not raw:
         return None
     if raw.startswith("http"):
         return raw
+    if raw.startswith("/") and not raw.startswith("//") and _PLAIN_PATH_RE.fullmatch(raw):
+        # Plain absolute path: same result as urljoin without parsing both URLs.
+        return "https://theprotocol.it" + raw
     return urljoin("https://theprotocol.it/", raw)
 
 
-def _extract_candidates_from_api(payload: object) -> list[dict]:
-    if payload is None:
-        return []
-
+_API_CONTAINER_KEYS = ("offers", "items", "results", "data", "payload", "elements", "hits", "list")
+_API_NESTED_KEYS = ("data", "payload")
+_API_NESTED_CONTAINER_KEYS = ("offers", "items", "results", "list")
+# Candidate field -> item keys probed in priority order by the generic extractor.
+_API_FIELD_KEYS = {
+    "title": ("title", "position", "name"),
+    "company": ("companyName", "company", "employer", "brandName", "organization"),
+    "city": ("city", "location", "cityName"),
+    "offer_url": ("offerUrl", "url", "link", "applyUrl", "slug"),
+    "salary_text": ("salary", "salaryText", "salaryRange", "salaryPln"),
+    "workplace_text": ("workplaceType", "workplace", "remote", "mode"),
+    "employment_text": ("employmentType", "contractType", "contract"),
+}
+_API_SKILL_KEYS = ("skills", "tech", "stack")
+_API_PROBED_KEYS = frozenset(key for keys in (*_API_FIELD_KEYS.values(), _API_SKILL_KEYS) for key in keys)
+
+
+def _locate_api_items(payload: object) -> tuple[list[dict], tuple[str, ...] | None]:
+    """Return the offer items in *payload* and the container path they were found at."""
     items: list[dict] = []
+    path: tuple[str, ...] | None = None
 
     if isinstance(payload, list):
         items = [item for item in payload if isinstance(item, dict)]
+        path = ()
     elif isinstance(payload, dict):
         # Try common containers
-        for key in ["offers", "items", "results", "data", "payload", "elements", "hits", "list"]:
+        for key in _API_CONTAINER_KEYS:
             value = payload.get(key)
             if isinstance(value, list):
                 items = [item for item in value if isinstance(item, dict)]
+                path = (key,)
                 break
         if not items:
             # Try nested
-            for key in ["data", "payload"]:
+            for key in _API_NESTED_KEYS:
                 value = payload.get(key)
                 if isinstance(value, dict):
-                    for inner in ["offers", "items", "results", "list"]:
+                    for inner in _API_NESTED_CONTAINER_KEYS:
                         inner_value = value.get(inner)
                         if isinstance(inner_value, list):
                             items = [item for item in inner_value if isinstance(item, dict)]
+                            path = (key, inner)
                             break
+    return items, path
+
+
+def _candidate_from_fields(
+    title: str | None,
+    company: str | None,
+    city: str | None,
+    offer_url: str | None,
+    salary_text: str | None,
+    workplace_text: str | None,
+    employment_text: str | None,
+    skills: object,
+) -> dict:
+    if isinstance(skills, list):
+        skills_list = [str(s).strip() for s in skills if str(s).strip()]
+    else:
+        skills_list = []
+    return {
+        "title": title or "Unknown title",
+        "company": company or "Unknown company",
+        "city": city,
+        "salary_text": salary_text or "",
+        "workplace_text": workplace_text or "",
+        "employment_text": employment_text or "",
+        "skills": skills_list,
+        "offer_url": _normalize_offer_url(offer_url or "") or THEPROTOCOL_OFFERS_URL,
+    }
 
-    candidates: list[dict] = []
-    for item in items:
-        title = _safe_get(item, ["title", "position", "name"])
-        company = _safe_get(item, ["companyName", "company", "employer", "brandName", "organization"])
-        city = _safe_get(item, ["city", "location", "cityName"])
-        offer_url = _normalize_offer_url(
-            _safe_get(item, ["offerUrl", "url", "link", "applyUrl", "slug"]) or ""
+
+def _generic_candidate(item: dict) -> dict:
+    return _candidate_from_fields(
+        *(_safe_get(item, list(keys)) for keys in _API_FIELD_KEYS.values()),
+        item.get("skills") or item.get("tech") or item.get("stack"),
+    )
+
+
+@dataclass(frozen=True)
+class ApiSchema:
+    """Item layout learned from one API page: where the items live and which keys they use."""
+
+    path: tuple[str, ...]
+    field_keys: tuple[tuple[str, ...], ...]  # per _API_FIELD_KEYS entry, probed keys that occur
+    skill_keys: tuple[str, ...]
+    unseen_keys: frozenset[str]  # probed keys absent from the sample; their presence means drift
+
+    @classmethod
+    def learn(cls, path: tuple[str, ...], items: list[dict], previous: "ApiSchema | None" = None) -> "ApiSchema":
+        """Learn from *items*; keys known to *previous* (same container) stay in the schema."""
+        seen: set[str] = set()
+        if previous is not None and previous.path == path:
+            seen.update(_API_PROBED_KEYS - previous.unseen_keys)
+        for item in items:
+            seen.update(_API_PROBED_KEYS.intersection(item))
+        return cls(
+            path=path,
+            field_keys=tuple(tuple(key for key in keys if key in seen) for keys in _API_FIELD_KEYS.values()),
+            skill_keys=tuple(key for key in _API_SKILL_KEYS if key in seen),
+            unseen_keys=_API_PROBED_KEYS - seen,
         )
 
-        salary_text = _safe_get(item, ["salary", "salaryText", "salaryRange", "salaryPln"]) or ""
-        workplace_text = _safe_get(item, ["workplaceType", "workplace", "remote", "mode"]) or ""
-        employment_text = _safe_get(item, ["employmentType", "contractType", "contract"]) or ""
+    def build_extractor(self) -> Callable[[dict], dict | None]:
+        """Return an item -> candidate function that reads the learned keys directly.
+
+        It returns ``None`` for an item carrying a probed key the learned page did
+        not have; the caller then uses the generic path for that item.
+        """
+        unseen_keys = self.unseen_keys
+        field_keys = self.field_keys
+        skill_keys = self.skill_keys
+
+        def extract(item: dict) -> dict | None:
+            if not unseen_keys.isdisjoint(item):
+                return None
+            get = item.get
+            values: list[str | None] = []
+            for keys in field_keys:
+                value = None
+                for key in keys:
+                    raw = get(key)
+                    if isinstance(raw, str):
+                        raw = raw.strip()
+                        if raw:
+                            value = raw
+                            break
+                values.append(value)
+            skills = None
+            for key in skill_keys:
+                skills = get(key)
+                if skills:
+                    break
+            return _candidate_from_fields(*values, skills)
 
-        skills = item.get("skills") or item.get("tech") or item.get("stack")
-        if isinstance(skills, list):
-            skills_list = [str(s).strip() for s in skills if str(s).strip()]
-        else:
-            skills_list = []
+        return extract
 
-        candidates.append(
-            {
-                "title": title or "Unknown title",
-                "company": company or "Unknown company",
-                "city": city,
-                "salary_text": salary_text,
-                "workplace_text": workplace_text,
-                "employment_text": employment_text,
-                "skills": skills_list,
-                "offer_url": offer_url or THEPROTOCOL_OFFERS_URL,
-            }
+
+# Schema learned from the last API page and its extractor, reused for the following pages.
+_api_schema: tuple[ApiSchema, Callable[[dict], dict | None]] | None = None
+_api_schema_stats = {"fast_pages": 0, "learned": 0, "drifted_pages": 0, "drifted_items": 0}
+
+
+def api_schema_stats() -> dict[str, int]:
+    """Counters of the API schema fast path (pages served, relearns, drift)."""
+    return dict(_api_schema_stats)
+
+
+def _learn_api_schema(path: tuple[str, ...], items: list[dict]) -> Callable[[dict], dict | None]:
+    global _api_schema
+    schema = ApiSchema.learn(path, items, _api_schema[0] if _api_schema else None)
+    extractor = schema.build_extractor()
+    _api_schema = (schema, extractor)
+    _api_schema_stats["learned"] += 1
+    logger.debug(
+        "TheProtocol API schema learned at %s: %s",
+        "/".join(path) or "<root>",
+        {name: keys for name, keys in zip(_API_FIELD_KEYS, schema.field_keys)},
+    )
+    return extractor
+
+
+def _extract_candidates_from_api(payload: object) -> list[dict]:
+    if payload is None:
+        return []
+
+    items, path = _locate_api_items(payload)
+    if not items or path is None:
+        logger.debug("TheProtocol API extraction produced 0 candidate offers")
+        return []
+
+    state = _api_schema
+    if state is None:
+        extractor = _learn_api_schema(path, items)
+    elif state[0].path != path:
+        _api_schema_stats["drifted_pages"] += 1
+        logger.warning(
+            "TheProtocol API schema drift: offers moved from %s to %s; relearning (stats: %s)",
+            "/".join(state[0].path) or "<root>",
+            "/".join(path) or "<root>",
+            _api_schema_stats,
+        )
+        extractor = _learn_api_schema(path, items)
+    else:
+        extractor = state[1]
+
+    candidates: list[dict] = []
+    drifted = 0
+    for item in items:
+        candidate = extractor(item)
+        if candidate is None:
+            drifted += 1
+            candidate = _generic_candidate(item)
+        candidates.append(candidate)
+
+    if drifted:
+        _api_schema_stats["drifted_pages"] += 1
+        _api_schema_stats["drifted_items"] += drifted
+        logger.warning(
+            "TheProtocol API schema drift: %d/%d items use keys outside the learned schema; "
+            "parsed them generically and relearning (stats: %s)",
+            drifted,
+            len(items),
+            _api_schema_stats,
         )
+        _learn_api_schema(path, items)
+    else:
+        _api_schema_stats["fast_pages"] += 1
 
     logger.debug("TheProtocol API extraction produced %d candidate offers", len(candidates))
     return candidates
@@ -311,14 +504,18 @@ def _fetch_with_requests(timeout: int, retries: int = 2) -> tuple[str | None, st
             )
             response.raise_for_status()
             html = response.text
+            record_input("theprotocol", KIND_THEPROTOCOL_HTML, html)
             challenge = _challenge_reason(html)
             if challenge is not None:
+                discard_cached(response)
                 logger.warning(
                     "TheProtocol responded with challenge page (%s) on attempt %d",
                     challenge,
                     attempt + 1,
                 )
+                _forget_rejected_cookies()
                 return None, "requests:challenge"
+            _remember_session_cookies(session)
             return html, "requests"
         except requests.RequestException as exc:
             is_last = attempt >= retries
@@ -339,6 +536,8 @@ def _fetch_api_with_requests(limit: int, timeout: int) -> list[dict]:
         response = session.get(url, timeout=timeout)
         response.raise_for_status()
         payload = response.json()
+        record_input("theprotocol", KIND_THEPROTOCOL_API, payload)
+        _remember_session_cookies(session)
         return _extract_candidates_from_api(payload)
     except requests.RequestException as exc:
         logger.warning("TheProtocol API request failed: %s", exc)
@@ -350,6 +549,10 @@ def _fetch_api_with_requests(limit: int, timeout: int) -> list[dict]:
 
 def _fetch_with_selenium(timeout: int) -> tuple[str | None, str, list[dict] | None]:
     logger.info("Trying Selenium fallback for TheProtocol")
+    # Selenium is only needed for this fallback; keep it off the requests/API import path.
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     options = Options()
     headless_env = os.environ.get("JOBPULSE_THEPROTOCOL_HEADLESS", "1").strip().lower()
     interactive_env = os.environ.get("JOBPULSE_THEPROTOCOL_INTERACTIVE", "0").strip().lower()
@@ -366,14 +569,10 @@ def _fetch_with_selenium(timeout: int) -> tuple[str | None, str, list[dict] | No
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-blink-features=AutomationControlled")
 
-    user_agent = os.environ.get(
-        "JOBPULSE_THEPROTOCOL_USER_AGENT",
-        (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/124.0.0.0 Safari/537.36"
-        ),
-    )
+    jar = open_cookie_jar()
+    user_agent = os.environ.get("JOBPULSE_THEPROTOCOL_USER_AGENT", DEFAULT_USER_AGENT)
+    if jar is not None and jar.cookies(THEPROTOCOL_SITE):
+        user_agent = jar.user_agent(THEPROTOCOL_SITE) or user_agent
     options.add_argument(f"--user-agent={user_agent}")
 
     debug_net = os.environ.get("JOBPULSE_THEPROTOCOL_DEBUG_NET", "0").strip().lower() in {"1", "true", "yes"}
@@ -397,8 +596,10 @@ def _fetch_with_selenium(timeout: int) -> tuple[str | None, str, list[dict] | No
 
         start = time.perf_counter()
         cookie_header = os.environ.get("JOBPULSE_THEPROTOCOL_COOKIE", "").strip()
-        if cookie_header:
+        if cookie_header or (jar is not None and jar.cookies(THEPROTOCOL_SITE)):
             driver.get("https://theprotocol.it/")
+            if jar is not None:
+                jar.apply_to_driver(driver, THEPROTOCOL_SITE)
             for name, value in _parse_cookie_header(cookie_header).items():
                 try:
                     driver.add_cookie({"name": name, "value": value, "domain": ".theprotocol.it", "path": "/"})
@@ -409,6 +610,7 @@ def _fetch_with_selenium(timeout: int) -> tuple[str | None, str, list[dict] | No
         driver.get(THEPROTOCOL_OFFERS_URL)
         elapsed = time.perf_counter() - start
         html = driver.page_source
+        record_input("theprotocol", KIND_THEPROTOCOL_HTML, html)
         challenge = _challenge_reason(html)
         if debug_net:
             _dump_network_requests(driver)
@@ -434,7 +636,10 @@ def _fetch_with_selenium(timeout: int) -> tuple[str | None, str, list[dict] | No
             else:
                 return None, "selenium:challenge", None
 
-        if interactive:
+        if jar is not None:
+            # Later runs reuse the clearance over plain HTTP until it expires.
+            jar.save_selenium_cookies(driver.get_cookies(), THEPROTOCOL_SITE, user_agent=user_agent)
+        elif interactive:
             logger.info("Tip: you can export cookies for reuse via JOBPULSE_THEPROTOCOL_COOKIE")
             logger.info("Example: cf_clearance=...; __cf_bm=... (copy from your browser devtools)")
         logger.debug("Selenium fallback succeeded in %.2fs (bytes=%d)", elapsed, len(html))
@@ -467,7 +672,7 @@ def _fetch_with_selenium(timeout: int) -> tuple[str | None, str, list[dict] | No
         driver.quit()
 
 
-def _extract_candidates_from_dom(driver: webdriver.Chrome) -> list[dict]:
+def _extract_candidates_from_dom(driver: "webdriver.Chrome") -> list[dict]:
     try:
         raw_links = driver.execute_script(
             """
@@ -507,12 +712,12 @@ def _extract_candidates_from_dom(driver: webdriver.Chrome) -> list[dict]:
     return candidates
 
 
-def _fetch_api_with_selenium(driver: webdriver.Chrome, limit: int) -> list[dict]:
+def _fetch_api_with_selenium(driver: "webdriver.Chrome", limit: int) -> list[dict]:
     url = THEPROTOCOL_API_URL.format(offset=0, limit=limit)
     return _fetch_api_url_with_selenium(driver, url)
 
 
-def _fetch_api_url_with_selenium(driver: webdriver.Chrome, url: str) -> list[dict]:
+def _fetch_api_url_with_selenium(driver: "webdriver.Chrome", url: str) -> list[dict]:
     try:
         payload = driver.execute_script(
             """
@@ -533,6 +738,8 @@ def _fetch_api_url_with_selenium(driver: webdriver.Chrome, url: str) -> list[dic
         logger.debug("Selenium API fetch returned no data")
         return []
 
+    record_input("theprotocol", KIND_THEPROTOCOL_API, payload.get("data"))
+
     if os.environ.get("JOBPULSE_THEPROTOCOL_API_DUMP", "0").strip().lower() in {"1", "true", "yes"}:
         dump_path = os.environ.get("JOBPULSE_THEPROTOCOL_API_DUMP_PATH", "theprotocol_api_dump.json")
         try:
@@ -545,7 +752,7 @@ def _fetch_api_url_with_selenium(driver: webdriver.Chrome, url: str) -> list[dic
     return _extract_candidates_from_api(payload.get("data"))
 
 
-def _discover_api_url_from_logs(driver: webdriver.Chrome) -> str | None:
+def _discover_api_url_from_logs(driver: "webdriver.Chrome") -> str | None:
     try:
         entries = driver.get_log("performance")
     except Exception as exc:
@@ -595,7 +802,7 @@ def _discover_api_url_from_dump_file() -> str | None:
     return None
 
 
-def _dump_network_requests(driver: webdriver.Chrome) -> None:
+def _dump_network_requests(driver: "webdriver.Chrome") -> None:
     """Dump network request URLs seen by Selenium to help find API endpoints."""
     try:
         entries = driver.get_log("performance")
@@ -633,6 +840,8 @@ class TheProtocolScraper:
     """Scraper for theprotocol.it job board."""
 
     source = "theprotocol"
+    # requests/API first; Selenium is only a fallback and takes a browser slot itself.
+    capabilities = ScraperCapabilities(max_concurrency=2, rate_limit_per_sec=1.0)
 
     def fetch_offers(self, limit: int = 20, timeout: int = 15) -> list[JobOffer]:
         run_start = time.perf_counter()
@@ -650,14 +859,17 @@ class TheProtocolScraper:
             raw_candidates = []
 
         if html is None:
-            html, mode, dom_candidates = _fetch_with_selenium(timeout=timeout)
+            with browser_slot(self.source):
+                html, mode, dom_candidates = _fetch_with_selenium(timeout=timeout)
         else:
             dom_candidates = None
 
         if html is None and not raw_candidates:
             logger.warning("TheProtocol scrape finished with no HTML (mode=%s)", mode)
             logger.warning(
-                "If TheProtocol is challenge-protected, set JOBPULSE_THEPROTOCOL_COOKIE with browser cookies (e.g. cf_clearance=...; __cf_bm=...)"
+                "If TheProtocol is challenge-protected, set JOBPULSE_THEPROTOCOL_COOKIE with browser cookies "
+                "(e.g. cf_clearance=...; __cf_bm=...) or run once with JOBPULSE_THEPROTOCOL_INTERACTIVE=1 "
+                "so the cookie jar keeps the clearance"
             )
             return []
 
@@ -674,15 +886,11 @@ class TheProtocolScraper:
 
         logger.info("TheProtocol candidate pool size: %d", len(raw_candidates))
 
-        offers: list[JobOffer] = []
-        map_failures = 0
-        for candidate in raw_candidates[:limit]:
-            try:
-                offers.append(_to_job_offer(candidate))
-            except Exception as exc:
-                map_failures += 1
-                logger.warning("Failed to map TheProtocol offer: %s", exc)
-                continue
+        offers, map_failures = map_candidates(
+            raw_candidates[:limit],
+            _to_job_offer,
+            on_failure=lambda candidate, error: logger.warning("Failed to map TheProtocol offer: %s", error),
+        )
 
         duration = time.perf_counter() - run_start
         logger.info(
@@ -0,0 +1,24 @@
+from .aliases import DICTIONARY_VERSION, SKILL_ALIASES
+from .dictionary import (
+    DEFAULT_DICTIONARY,
+    SkillDictionary,
+    canonical_skill,
+    canonicalize_skills,
+    extract_skills,
+    skill_id,
+    skill_key,
+)
+from .matcher import SkillMatcher
+
+__all__ = [
+    "DEFAULT_DICTIONARY",
+    "DICTIONARY_VERSION",
+    "SKILL_ALIASES",
+    "SkillDictionary",
+    "SkillMatcher",
+    "canonical_skill",
+    "canonicalize_skills",
+    "extract_skills",
+    "skill_id",
+    "skill_key",
+]
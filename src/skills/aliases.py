@@ -0,0 +1,117 @@
+"""Curated skill aliases: canonical display name -> other spellings.
+
+Spellings are compared by :func:`src.skills.dictionary.skill_key`
+(lowercase, ``+`` -> ``plus``, ``#`` -> ``sharp``, other punctuation
+collapsed to spaces), so ``"Node.js"``, ``"node js"`` and ``"NODE-JS"`` need
+no separate entries. Bump ``DICTIONARY_VERSION`` whenever a change moves a
+spelling to a different canonical skill: stores re-key their skill indexes
+and market rollups when they see a newer version.
+"""
+
+DICTIONARY_VERSION = 1
+
+SKILL_ALIASES: dict[str, tuple[str, ...]] = {
+    # Languages
+    "Python": ("python3", "python 3"),
+    "Java": ("java se", "java ee", "jakarta ee"),
+    "JavaScript": ("js", "java script", "ecmascript", "es6"),
+    "TypeScript": ("ts", "type script"),
+    "Go": ("golang", "go lang"),
+    "C#": ("csharp",),
+    "C++": ("cpp",),
+    "C": ("ansi c", "c language"),
+    "Kotlin": (),
+    "Scala": (),
+    "Rust": ("rustlang",),
+    "PHP": ("php8", "php 8"),
+    "Ruby": (),
+    "Swift": (),
+    "Objective-C": ("objc",),
+    "Dart": (),
+    "R": ("r language",),
+    "Bash": ("shell", "shell scripting", "bash scripting"),
+    "SQL": ("t sql", "tsql", "pl sql", "plsql"),
+    # Frameworks and runtimes
+    ".NET": ("dotnet", "net core", "dotnet core", "asp net", "asp net core"),
+    "Node.js": ("node", "nodejs"),
+    "React": ("react js", "reactjs"),
+    "React Native": ("reactnative",),
+    "Angular": ("angular 2", "angular2"),
+    "Vue.js": ("vue", "vuejs", "vue 3"),
+    "Next.js": ("nextjs",),
+    "Spring": ("spring framework",),
+    "Spring Boot": ("springboot",),
+    "Hibernate": (),
+    "Django": ("django rest framework", "drf"),
+    "FastAPI": ("fast api",),
+    "Flask": (),
+    "Ruby on Rails": ("rails", "ror"),
+    "Laravel": (),
+    "Symfony": (),
+    "Flutter": (),
+    "Android": ("android sdk",),
+    "iOS": ("ios sdk",),
+    "Pandas": (),
+    "NumPy": (),
+    "PyTorch": ("torch",),
+    "TensorFlow": ("tensor flow",),
+    "Spark": ("apache spark", "pyspark", "spark sql"),
+    "Airflow": ("apache airflow",),
+    # Data stores and messaging
+    "PostgreSQL": ("postgres", "postgre", "postgre sql", "psql", "pgsql"),
+    "MySQL": ("my sql",),
+    "MS SQL": ("mssql", "sql server", "microsoft sql server", "ms sql server"),
+    "Oracle": ("oracle db", "oracle database"),
+    "MongoDB": ("mongo", "mongo db"),
+    "Redis": (),
+    "Elasticsearch": ("elastic search", "elastic", "elk"),
+    "Kafka": ("apache kafka",),
+    "RabbitMQ": ("rabbit mq", "rabbit"),
+    "Snowflake": (),
+    "BigQuery": ("big query", "google bigquery"),
+    # Cloud and infrastructure
+    "AWS": ("amazon web services", "amazon aws"),
+    "Azure": ("microsoft azure", "ms azure"),
+    "GCP": ("google cloud", "google cloud platform"),
+    "Docker": ("docker compose",),
+    "Kubernetes": ("k8s", "kube"),
+    "Terraform": ("tf cloud",),
+    "Ansible": (),
+    "Helm": (),
+    "Linux": ("gnu linux",),
+    "Git": (),
+    "CI/CD": ("cicd", "ci", "continuous integration"),
+    "Jenkins": (),
+    "GitHub Actions": ("gh actions",),
+    "GitLab CI": ("gitlab ci cd",),
+    "Grafana": (),
+    "Prometheus": (),
+    # Practices and other
+    "REST": ("rest api", "restful", "restful api", "rest apis"),
+    "GraphQL": ("graph ql",),
+    "Microservices": ("microservice", "micro services"),
+    "Machine Learning": ("ml",),
+    "Artificial Intelligence": ("ai",),
+    "LLM": ("llms", "large language models", "genai", "generative ai"),
+    "Selenium": ("selenium webdriver",),
+    "Pytest": ("py test",),
+    "Cypress": (),
+    "Playwright": (),
+    "JUnit": ("junit5", "junit 5"),
+    "Power BI": ("powerbi", "pbi"),
+    "Tableau": (),
+    "Excel": ("ms excel", "microsoft excel"),
+    "Jira": ("atlassian jira",),
+    "Scrum": ("agile scrum",),
+    "Agile": (),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+    "Figma": (),
+}
+
+# Spellings matched only as a whole skill entry, never inside free text such as
+# titles ("Go-to-market", "R&D", "C-level", "Rust Belt", "AI-driven sales").
+AMBIGUOUS_KEYS = frozenset(
+    {"go", "r", "c", "net", "js", "ts", "ml", "ai", "ci", "node", "shell", "elastic", "rabbit", "kube", "spark",
+     "spring", "swift", "rust", "dart", "oracle", "excel", "agile", "helm", "rest", "git", "torch"}
+)
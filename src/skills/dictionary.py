@@ -0,0 +1,155 @@
+"""Skill dictionary: canonical names, alias resolution and interned skill ids.
+
+Every spelling is reduced to a key by :func:`skill_key` and resolved through
+the curated alias table, so ``"k8s"`` and ``"Kubernetes"`` share one id and
+one canonical name. Skills outside the table keep their own spelling and
+their :func:`skill_key`; canonicalizing them stores nothing, so a long-running
+worker that sees free-text skills does not grow the dictionary. Only
+:meth:`SkillDictionary.skill_id` assigns them ids, for at most ``max_learned``
+of them. Names are ``sys.intern``-ed, so a batch of offers holds one string
+object per distinct skill instead of one per offer.
+"""
+
+import re
+import sys
+import threading
+from array import array
+from typing import Iterable
+
+from src.skills.aliases import AMBIGUOUS_KEYS, SKILL_ALIASES
+from src.skills.matcher import SkillMatcher
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def skill_key(text: str) -> str:
+    """Lowercase, spell out ``+``/``#`` (``c++`` -> ``c plus plus``) and collapse other punctuation to spaces."""
+    lowered = text.lower().replace("+", " plus ").replace("#", " sharp ")
+    return " ".join(_NON_ALNUM.sub(" ", lowered).split())
+
+
+class SkillDictionary:
+    def __init__(
+        self,
+        aliases: dict[str, tuple[str, ...]] = SKILL_ALIASES,
+        ambiguous: Iterable[str] = AMBIGUOUS_KEYS,
+        max_learned: int = 10_000,
+    ) -> None:
+        self.max_learned = max_learned
+        self.names: list[str] = []  # id -> display name
+        self.keys: list[str] = []  # id -> canonical key
+        self._ids: dict[str, int] = {}  # key of any known spelling -> id
+        self._lock = threading.Lock()  # scraper threads intern new skills concurrently
+        for name, spellings in aliases.items():
+            skill = self._intern(name)
+            for spelling in spellings:
+                self._ids.setdefault(skill_key(spelling), skill)
+        ambiguous = set(ambiguous)
+        self.curated = len(self.names)
+        self._matcher = SkillMatcher(
+            {tuple(key.split()): skill for key, skill in self._ids.items() if key not in ambiguous}
+        )
+
+    def _intern(self, name: str) -> int:
+        key = skill_key(name)
+        skill = self._ids.get(key)
+        if skill is None:
+            skill = len(self.names)
+            self.names.append(sys.intern(name))
+            self.keys.append(sys.intern(key))
+            self._ids[key] = skill
+        return skill
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def skill_id(self, name: str) -> int:
+        """Id of *name*, assigned on first request; ``-1`` for names without letters or digits.
+
+        Also ``-1`` for an unknown skill once ``max_learned`` skills outside the
+        curated table have ids, which keeps the dictionary bounded.
+        """
+        key = skill_key(name)
+        skill = self._ids.get(key)
+        if skill is None:
+            if not key:
+                return -1
+            with self._lock:
+                if len(self.names) - self.curated >= self.max_learned and key not in self._ids:
+                    return -1
+                skill = self._intern(name.strip())
+        return skill
+
+    def _curated(self, key: str) -> int | None:
+        skill = self._ids.get(key)
+        return skill if skill is not None and skill < self.curated else None
+
+    def canonical(self, name: str) -> str:
+        """Curated display name for known spellings, otherwise *name* itself (interned)."""
+        key = skill_key(name)
+        if not key:
+            return name
+        skill = self._curated(key)
+        return self.names[skill] if skill is not None else sys.intern(name.strip())
+
+    def canonical_key(self, name: str) -> str:
+        """Key of the canonical skill: ``"kubernetes"`` for ``"k8s"``; ``""`` for empty names."""
+        key = skill_key(name)
+        skill = self._curated(key)
+        return self.keys[skill] if skill is not None else key
+
+    def canonicalize(self, skills: Iterable[str]) -> list[str]:
+        """Canonical names of *skills* in order, dropping empty entries and repeats of the same skill."""
+        seen: set[str] = set()
+        result: list[str] = []
+        for name in skills:
+            key = skill_key(name)
+            if not key:
+                continue
+            skill = self._curated(key)
+            if skill is not None:
+                key = self.keys[skill]
+            if key not in seen:
+                seen.add(key)
+                result.append(self.names[skill] if skill is not None else sys.intern(name.strip()))
+        return result
+
+    def encode(self, skills: Iterable[str]) -> array:
+        """Skill ids as a compact ``array('I')`` (4 bytes per skill)."""
+        return array("I", (skill for skill in map(self.skill_id, skills) if skill >= 0))
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        return [self.names[skill] for skill in ids]
+
+    def extract(self, text: str) -> list[str]:
+        """Curated skills mentioned in free text (titles, card lines), in order of appearance.
+
+        Short or ambiguous spellings (``go``, ``r``, ``rest``) are skipped here;
+        they only count as a whole skill entry.
+        """
+        seen: set[int] = set()
+        result: list[str] = []
+        for _, _, skill in self._matcher.find(skill_key(text).split()):
+            if skill not in seen:
+                seen.add(skill)
+                result.append(self.names[skill])
+        return result
+
+
+DEFAULT_DICTIONARY = SkillDictionary()
+
+
+def canonical_skill(name: str) -> str:
+    return DEFAULT_DICTIONARY.canonical(name)
+
+
+def canonicalize_skills(skills: Iterable[str]) -> list[str]:
+    return DEFAULT_DICTIONARY.canonicalize(skills)
+
+
+def skill_id(name: str) -> int:
+    return DEFAULT_DICTIONARY.skill_id(name)
+
+
+def extract_skills(text: str) -> list[str]:
+    return DEFAULT_DICTIONARY.extract(text)
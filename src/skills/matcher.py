@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Sequence
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over word tokens.
+
+    Patterns are token sequences (``("spring", "boot")``) mapped to a value.
+    :meth:`find` walks the tokens of a text once, whatever the number of
+    patterns, and matching whole tokens means ``"java"`` never fires inside
+    ``"javascript"``.
+    """
+
+    def __init__(self, patterns: dict[tuple[str, ...], int]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, int]]] = [[]]  # (pattern length, value) ending in this state
+        for tokens, value in patterns.items():
+            if tokens:
+                self._add(tokens, value)
+        self._link()
+
+    def _add(self, tokens: tuple[str, ...], value: int) -> None:
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][token] = next_state
+            state = next_state
+        self._out[state].append((len(tokens), value))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, tokens: Sequence[str]) -> list[tuple[int, int, int]]:
+        """Return ``(start, end, value)`` matches, leftmost-longest and non-overlapping."""
+        found: list[tuple[int, int, int]] = []
+        state = 0
+        for index, token in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for length, value in self._out[state]:
+                found.append((index + 1 - length, index + 1, value))
+        found.sort(key=lambda match: (match[0], match[0] - match[1]))
+        chosen: list[tuple[int, int, int]] = []
+        for match in found:
+            if not chosen or match[0] >= chosen[-1][1]:
+                chosen.append(match)
+        return chosen
@@ -1,3 +1,37 @@
-from .sqlite_store import OfferQuery, SQLiteOfferStore
+import importlib
 
-__all__ = ["OfferQuery", "SQLiteOfferStore"]
+from .base import OfferStore, open_store
+
+__all__ = [
+    "AsyncOfferStore",
+    "OfferQuery",
+    "OfferSnapshot",
+    "OfferStore",
+    "PartitionedSQLiteStore",
+    "PostgresOfferStore",
+    "SQLiteOfferStore",
+    "build_snapshot",
+    "open_store",
+]
+
+# Backends pull in sqlite3, analytics and the skill dictionary (asyncio/aiosqlite, psycopg,
+# mmap/array for the others), so they are resolved on first access. ``base`` stays eager:
+# config validation only needs its DSN check.
+_LAZY_EXPORTS = {
+    "AsyncOfferStore": ".async_store",
+    "OfferQuery": ".sqlite_store",
+    "OfferSnapshot": ".snapshot",
+    "PartitionedSQLiteStore": ".partitioned_store",
+    "PostgresOfferStore": ".postgres_store",
+    "SQLiteOfferStore": ".sqlite_store",
+    "build_snapshot": ".snapshot",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,184 @@
+"""Asyncio front-end to the offer database for the bot and other event-loop code.
+
+Writes go through one writer task: ``save_offers`` calls queue their offers and
+the task commits everything queued so far in a single transaction on a
+dedicated connection thread (sharing :func:`write_offers` with the sync store,
+so history and rollups stay in step). Reads use a small pool of read-only
+``aiosqlite`` connections. The database is switched to WAL so readers never
+wait for an ingest in progress.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, TYPE_CHECKING
+
+import aiosqlite
+
+from src.filters import regexp
+from src.storage.sqlite_store import LookupCache, OfferQuery, SQLiteOfferStore, write_offers
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _WriteRequest:
+    offers: list["JobOffer"]
+    done: asyncio.Future = field(repr=False)
+
+
+class AsyncOfferStore:
+    """Async counterpart of :class:`SQLiteOfferStore` (``save_offers``, ``query_offers``, ``count``).
+
+    Use as ``async with AsyncOfferStore(path) as store: ...`` or call
+    :meth:`open` and :meth:`close` explicitly.
+    """
+
+    def __init__(self, db_path: str | Path = "jobpulse.db", readers: int = 4, max_batch: int = 5000) -> None:
+        self.db_path = str(db_path)
+        self.readers = max(1, readers)
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[_WriteRequest | None] | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._write_executor: ThreadPoolExecutor | None = None
+        self._write_conn: sqlite3.Connection | None = None
+        self._lookups = LookupCache()  # only touched on the writer thread
+        self._read_pool: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._read_conns: list[aiosqlite.Connection] = []
+
+    async def __aenter__(self) -> "AsyncOfferStore":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="offer-writer")
+        self._write_conn = await loop.run_in_executor(self._write_executor, self._open_writer)
+
+        self._read_pool = asyncio.Queue()
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        for _ in range(self.readers):
+            conn = await aiosqlite.connect(uri, uri=True)
+            conn.row_factory = sqlite3.Row
+            await conn.create_function("regexp", 2, regexp, deterministic=True)
+            self._read_conns.append(conn)
+            self._read_pool.put_nowait(conn)
+
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop(), name="offer-writer")
+        logger.debug("Opened async store at %s (%d readers)", self.db_path, self.readers)
+
+    def _open_writer(self) -> sqlite3.Connection:
+        SQLiteOfferStore(self.db_path)  # creates or migrates the schema
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    async def close(self) -> None:
+        if self._writer_task is not None:
+            await self._queue.put(None)
+            await self._writer_task
+            self._writer_task = None
+        for conn in self._read_conns:
+            await conn.close()
+        self._read_conns.clear()
+        if self._write_executor is not None:
+            await asyncio.get_running_loop().run_in_executor(self._write_executor, self._write_conn.close)
+            self._write_executor.shutdown()
+            self._write_executor = None
+            self._write_conn = None
+
+    async def save_offers(self, offers: list["JobOffer"]) -> int:
+        """Queue *offers* for the writer task; return how many were new once committed."""
+        if not offers:
+            return 0
+        if self._queue is None:
+            raise RuntimeError("AsyncOfferStore is not open")
+        request = _WriteRequest(list(offers), asyncio.get_running_loop().create_future())
+        await self._queue.put(request)
+        return await request.done
+
+    async def _writer_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            request = await self._queue.get()
+            if request is None:
+                break
+            batch = [request]
+            size = len(request.offers)
+            # Coalesce whatever else was queued while the previous batch committed.
+            while size < self.max_batch and not self._queue.empty():
+                request = self._queue.get_nowait()
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+                size += len(request.offers)
+
+            try:
+                results = await loop.run_in_executor(self._write_executor, self._write_batch, batch)
+            except Exception as exc:
+                logger.exception("Async store batch of %d offers failed", size)
+                for request in batch:
+                    if not request.done.done():
+                        request.done.set_exception(exc)
+                continue
+            for request, inserted in zip(batch, results):
+                if not request.done.done():
+                    request.done.set_result(inserted)
+
+    def _write_batch(self, batch: list[_WriteRequest]) -> list[int]:
+        results: list[int] = []
+        observations = 0
+        try:
+            with self._write_conn:
+                for request in batch:
+                    inserted, opened = write_offers(self._write_conn, request.offers, self._lookups)
+                    results.append(inserted)
+                    observations += opened
+        except Exception:
+            self._lookups.clear()
+            raise
+        logger.info(
+            "Committed %d save requests (%d offers, %d new, %d history observations)",
+            len(batch),
+            sum(len(request.offers) for request in batch),
+            sum(results),
+            observations,
+        )
+        return results
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        if self._read_pool is None:
+            raise RuntimeError("AsyncOfferStore is not open")
+        conn = await self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put_nowait(conn)
+
+    async def query_offers(self, query: OfferQuery | None = None) -> list[dict]:
+        """Return offers matching *query* newest first, like :meth:`SQLiteOfferStore.query_offers`."""
+        sql, params = SQLiteOfferStore._select_sql(query or OfferQuery())
+        async with self._reader() as conn, conn.execute(sql, params) as cursor:
+            rows = await cursor.fetchall()
+        return [SQLiteOfferStore._row_to_dict(row) for row in rows]
+
+    async def count(self) -> int:
+        """Return total number of stored offers."""
+        async with self._reader() as conn, conn.execute("SELECT count(*) FROM offers") as cursor:
+            row = await cursor.fetchone()
+        return row[0]
@@ -0,0 +1,96 @@
+from pathlib import Path
+from typing import ClassVar, Iterator, Protocol, TYPE_CHECKING
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+    from src.storage.sqlite_store import OfferQuery
+
+POSTGRES_SCHEMES = ("postgresql", "postgres")
+SQLITE_SCHEME = "sqlite"
+PARTITIONED_SCHEME = "sqlite+monthly"
+
+
+class OfferStore(Protocol):
+    """Storage backend for job offers.
+
+    ``supports_history`` tells whether the backend also keeps offer history
+    and market rollups (``compact_history``, ``offer_history``, ``market_stats``).
+    """
+
+    supports_history: ClassVar[bool]
+
+    def save_offers(self, offers: list["JobOffer"]) -> int:
+        """Insert new offers (duplicates by ``source + external_id`` skipped); return how many were new."""
+        ...
+
+    def query_offers(self, query: "OfferQuery | None" = None) -> list[dict]:
+        ...
+
+    def iter_offers(self, query: "OfferQuery | None" = None, page_size: int = 1000) -> Iterator[dict]:
+        ...
+
+    def count(self) -> int:
+        ...
+
+    def explain_query(self, query: "OfferQuery") -> list[str]:
+        ...
+
+    def pending_enrichment(self, limit: int = 200, max_attempts: int = 3) -> list[dict]:
+        ...
+
+    def apply_enrichment(self, results: list[tuple[int, dict | None]]) -> int:
+        ...
+
+
+def dsn_scheme(dsn: str) -> str:
+    """Return the backend scheme of *dsn*; plain file paths are SQLite."""
+    scheme = urlparse(dsn).scheme.lower()
+    # A Windows drive letter ("C:\\...") parses as a one-letter scheme.
+    return scheme if len(scheme) > 1 else SQLITE_SCHEME
+
+
+def sqlite_path(dsn: str) -> str:
+    """Return the database file (or partition directory) for a SQLite DSN (``sqlite:///path`` or a plain path)."""
+    if dsn_scheme(dsn) not in (SQLITE_SCHEME, PARTITIONED_SCHEME) or "://" not in dsn:
+        return dsn
+    path = dsn.split("://", 1)[1]
+    # sqlite:///relative.db -> relative.db, sqlite:////abs/path.db -> /abs/path.db
+    return path[1:] if path.startswith("/") else path
+
+
+def check_dsn(dsn: str) -> str:
+    """Validate that *dsn* names a supported backend; return it unchanged."""
+    scheme = dsn_scheme(dsn)
+    if scheme not in (SQLITE_SCHEME, PARTITIONED_SCHEME, *POSTGRES_SCHEMES):
+        raise ValueError(
+            f"unsupported database scheme {scheme!r} (use a file path, sqlite:///, sqlite+monthly:/// or postgresql://)"
+        )
+    return dsn
+
+
+def escape_like(value: str) -> str:
+    """Escape ``%``, ``_`` and backslashes for a LIKE pattern using ``\\`` as the escape character."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def open_store(dsn: str | Path) -> OfferStore:
+    """Open the offer store for *dsn*.
+
+    A SQLite path / ``sqlite:///`` URL, a ``sqlite+monthly:///directory`` URL
+    (monthly partition files) or a ``postgresql://`` DSN.
+    """
+    dsn = check_dsn(str(dsn))
+    scheme = dsn_scheme(dsn)
+    if scheme in POSTGRES_SCHEMES:
+        from src.storage.postgres_store import PostgresOfferStore  # needs psycopg
+
+        return PostgresOfferStore(dsn)
+    if scheme == PARTITIONED_SCHEME:
+        from src.storage.partitioned_store import PartitionedSQLiteStore
+
+        return PartitionedSQLiteStore(sqlite_path(dsn))
+
+    from src.storage.sqlite_store import SQLiteOfferStore
+
+    return SQLiteOfferStore(db_path=sqlite_path(dsn))
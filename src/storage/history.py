@@ -0,0 +1,286 @@
+"""Append-only offer observation log with daily compaction.
+
+Every ``save_offers`` call records one observation per offer. Consecutive
+sightings with unchanged fields extend the current observation (``last_seen``,
+``seen_count``); a change opens a new observation whose ``changes`` column holds
+only the fields that differ from the previous state. ``offer_observation_heads``
+keeps the latest full state per offer so deltas never require replaying the log.
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = (
+    "title",
+    "company",
+    "city",
+    "workplace_type",
+    "employment_type",
+    "salary_min_pln",
+    "salary_max_pln",
+    "currency",
+    "skills",
+)
+
+
+def ensure_history_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS offer_observations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            external_id TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            seen_count INTEGER NOT NULL DEFAULT 1,
+            changes TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_offer_observations_offer
+        ON offer_observations(source, external_id, id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_offer_observations_last_seen
+        ON offer_observations(last_seen)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS offer_observation_heads (
+            source TEXT NOT NULL,
+            external_id TEXT NOT NULL,
+            observation_id INTEGER NOT NULL,
+            last_seen TEXT NOT NULL,
+            state TEXT NOT NULL,
+            PRIMARY KEY (source, external_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS offer_daily_history (
+            source TEXT NOT NULL,
+            external_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            observations INTEGER NOT NULL,
+            changes TEXT NOT NULL,
+            PRIMARY KEY (source, external_id, day)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _offer_state(offer: "JobOffer") -> dict:
+    return {name: getattr(offer, name) for name in TRACKED_FIELDS}
+
+
+def _state_delta(previous: dict, current: dict) -> dict:
+    return {key: value for key, value in current.items() if previous.get(key) != value}
+
+
+def record_observations(conn: sqlite3.Connection, offers: list["JobOffer"]) -> int:
+    """Record one observation per offer; return number of new observation rows."""
+    opened = 0
+    for offer in offers:
+        seen_at = offer.scraped_at.isoformat() if isinstance(offer.scraped_at, datetime) else datetime.utcnow().isoformat()
+        state = _offer_state(offer)
+        head = conn.execute(
+            "SELECT observation_id, state FROM offer_observation_heads WHERE source = ? AND external_id = ?",
+            (offer.source, offer.external_id),
+        ).fetchone()
+
+        if head is not None:
+            observation_id, raw_state = head
+            previous = json.loads(raw_state)
+            delta = _state_delta(previous, state)
+            if not delta:
+                updated = conn.execute(
+                    """
+                    UPDATE offer_observations
+                    SET last_seen = max(last_seen, ?), seen_count = seen_count + 1
+                    WHERE id = ?
+                    """,
+                    (seen_at, observation_id),
+                ).rowcount
+                if updated:
+                    conn.execute(
+                        "UPDATE offer_observation_heads SET last_seen = max(last_seen, ?) WHERE source = ? AND external_id = ?",
+                        (seen_at, offer.source, offer.external_id),
+                    )
+                    continue
+                # Head observation was compacted away – open a fresh one below.
+        else:
+            delta = state
+
+        cursor = conn.execute(
+            """
+            INSERT INTO offer_observations (source, external_id, first_seen, last_seen, changes)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (offer.source, offer.external_id, seen_at, seen_at, json.dumps(delta, ensure_ascii=False)),
+        )
+        conn.execute(
+            """
+            INSERT INTO offer_observation_heads (source, external_id, observation_id, last_seen, state)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(source, external_id) DO UPDATE SET
+                observation_id = excluded.observation_id,
+                last_seen = excluded.last_seen,
+                state = excluded.state
+            """,
+            (offer.source, offer.external_id, cursor.lastrowid, seen_at, json.dumps(state, ensure_ascii=False)),
+        )
+        opened += 1
+    return opened
+
+
+def compact_history(
+    conn: sqlite3.Connection,
+    raw_days: int = 30,
+    retention_days: int = 365,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """Downsample old observations into daily rows and apply retention.
+
+    Observations whose ``last_seen`` is older than *raw_days* are merged into
+    ``offer_daily_history`` (one row per offer per day). Daily rows and offers
+    not seen for *retention_days* are dropped. Head observations are kept so
+    later sightings can still be diffed against them.
+    """
+    now = now or datetime.utcnow()
+    raw_cutoff = (now - timedelta(days=raw_days)).isoformat()
+    retention_cutoff = (now - timedelta(days=retention_days)).isoformat()
+
+    rows = conn.execute(
+        """
+        SELECT o.id, o.source, o.external_id, o.first_seen, o.last_seen, o.seen_count, o.changes
+        FROM offer_observations AS o
+        WHERE o.last_seen < ?
+          AND o.id NOT IN (SELECT observation_id FROM offer_observation_heads)
+        ORDER BY o.source, o.external_id, o.id
+        """,
+        (raw_cutoff,),
+    ).fetchall()
+
+    compacted_ids: list[int] = []
+    daily_rows = 0
+    for (source, external_id, day), group in groupby(rows, key=lambda r: (r[1], r[2], r[3][:10])):
+        group = list(group)
+        first_seen = min(r[3] for r in group)
+        last_seen = max(r[4] for r in group)
+        observations = sum(r[5] for r in group)
+        merged: dict = {}
+
+        existing = conn.execute(
+            """
+            SELECT first_seen, last_seen, observations, changes FROM offer_daily_history
+            WHERE source = ? AND external_id = ? AND day = ?
+            """,
+            (source, external_id, day),
+        ).fetchone()
+        if existing is not None:
+            first_seen = min(first_seen, existing[0])
+            last_seen = max(last_seen, existing[1])
+            observations += existing[2]
+            merged.update(json.loads(existing[3]))
+
+        for row in group:
+            merged.update(json.loads(row[6]))
+            compacted_ids.append(row[0])
+
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO offer_daily_history
+                (source, external_id, day, first_seen, last_seen, observations, changes)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (source, external_id, day, first_seen, last_seen, observations, json.dumps(merged, ensure_ascii=False)),
+        )
+        daily_rows += 1
+
+    conn.executemany("DELETE FROM offer_observations WHERE id = ?", [(i,) for i in compacted_ids])
+
+    expired_daily = conn.execute(
+        "DELETE FROM offer_daily_history WHERE day < ?", (retention_cutoff[:10],)
+    ).rowcount
+    expired_offers = conn.execute(
+        """
+        DELETE FROM offer_observations WHERE id IN (
+            SELECT observation_id FROM offer_observation_heads WHERE last_seen < ?
+        )
+        """,
+        (retention_cutoff,),
+    ).rowcount
+    conn.execute("DELETE FROM offer_observation_heads WHERE last_seen < ?", (retention_cutoff,))
+
+    stats = {
+        "compacted_observations": len(compacted_ids),
+        "daily_rows": daily_rows,
+        "expired_daily_rows": expired_daily,
+        "expired_offers": expired_offers,
+    }
+    if any(stats.values()):
+        logger.info(
+            "History compaction: compacted=%d daily=%d expired_daily=%d expired_offers=%d",
+            stats["compacted_observations"],
+            stats["daily_rows"],
+            stats["expired_daily_rows"],
+            stats["expired_offers"],
+        )
+    return stats
+
+
+def offer_history(conn: sqlite3.Connection, source: str, external_id: str) -> list[dict]:
+    """Return daily aggregates followed by raw observations, oldest first."""
+    history: list[dict] = []
+    for day, first_seen, last_seen, observations, changes in conn.execute(
+        """
+        SELECT day, first_seen, last_seen, observations, changes FROM offer_daily_history
+        WHERE source = ? AND external_id = ? ORDER BY day
+        """,
+        (source, external_id),
+    ):
+        history.append(
+            {
+                "kind": "daily",
+                "day": day,
+                "first_seen": first_seen,
+                "last_seen": last_seen,
+                "seen_count": observations,
+                "changes": json.loads(changes),
+            }
+        )
+    for first_seen, last_seen, seen_count, changes in conn.execute(
+        """
+        SELECT first_seen, last_seen, seen_count, changes FROM offer_observations
+        WHERE source = ? AND external_id = ? ORDER BY id
+        """,
+        (source, external_id),
+    ):
+        history.append(
+            {
+                "kind": "observation",
+                "day": first_seen[:10],
+                "first_seen": first_seen,
+                "last_seen": last_seen,
+                "seen_count": seen_count,
+                "changes": json.loads(changes),
+            }
+        )
+    return history
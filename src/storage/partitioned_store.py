@@ -0,0 +1,578 @@
+"""Offer store split into monthly SQLite files.
+
+Layout of the store directory::
+
+    index.db             offer keys (global ids), partition catalog, history, rollups
+    offers-2025-01.db    offers scraped in January 2025, with their company and city lookups
+    offers-2025-02.db    ...
+
+Offers go to the partition of their ``scraped_at`` month. Ids come from
+``offer_keys`` in ``index.db``, which also deduplicates across months, so an
+offer seen again next month is not stored twice. Each write attaches only the
+partitions it touches, and the key insert and offer insert commit together.
+
+Queries read the catalog, drop partitions outside the ``OfferQuery`` time
+window (``scraped_since``/``scraped_until``) or above ``before_id``, and
+``ATTACH`` the rest newest first, a few at a time, with ``UNION ALL`` over them.
+They stop as soon as older partitions cannot contribute to the requested page.
+
+:meth:`compact_partitions` vacuums months older than a cutoff and makes their
+files read-only. An archived month is just a file moved out of the
+directory: queries skip partitions whose file is missing, and moving it back
+restores it.
+"""
+
+import logging
+import os
+import sqlite3
+import stat
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import datetime, time
+from pathlib import Path
+from typing import ClassVar, Iterator, TYPE_CHECKING
+
+from src.analytics import rollups
+from src.skills import DICTIONARY_VERSION
+from src.storage import history
+from src.storage.sqlite_store import (
+    LookupCache,
+    OfferQuery,
+    SQLiteOfferStore,
+    _serialize_skills,
+    apply_offer_details,
+    ensure_offers_schema,
+    index_offer_skills,
+    register_functions,
+    rollup_row,
+)
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.db"
+PARTITION_PATTERN = "offers-{month}.db"
+# SQLite allows 10 attached databases by default; keep headroom.
+MAX_ATTACHED = 8
+
+_INSERT_COLUMNS = (
+    "id, source, external_id, title, company_id, city_id, workplace_type, employment_type, "
+    "salary_min_pln, salary_max_pln, currency, skills, offer_url, published_at, scraped_at"
+)
+
+
+@dataclass
+class Partition:
+    month: str  # YYYY-MM
+    path: Path
+    min_id: int
+    max_id: int
+    rows: int
+    read_only: bool
+
+
+def _scraped_at(offer: "JobOffer") -> str:
+    return offer.scraped_at.isoformat() if isinstance(offer.scraped_at, datetime) else datetime.utcnow().isoformat()
+
+
+def _month_bounds(query: OfferQuery) -> tuple[str | None, str | None]:
+    """First and last month (YYYY-MM) the query's time window can touch."""
+    first = query.scraped_since[:7] if query.scraped_since else None
+    last = None
+    if query.scraped_until:
+        last = query.scraped_until[:7]
+        until = query.scraped_until + "-01" if len(query.scraped_until) == 7 else query.scraped_until
+        try:
+            moment = datetime.fromisoformat(until)
+        except ValueError:
+            # Unparseable bounds keep their month: attaching one partition too many is harmless.
+            return first, last
+        if moment.day == 1 and moment.time() == time(0):
+            # Exclusive bound at the very start of a month ("2025-03", "2025-03-01T00:00").
+            year, month = (moment.year - 1, 12) if moment.month == 1 else (moment.year, moment.month - 1)
+            last = f"{year:04d}-{month:02d}"
+    return first, last
+
+
+def _attach(conn: sqlite3.Connection, partition_path: Path, alias: str, read_only: bool = False) -> None:
+    uri = partition_path.resolve().as_uri() + ("?mode=ro" if read_only else "")
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (uri,))
+
+
+class _Attachments:
+    """Partitions attached read-only to one connection, kept across pages until their slot is needed."""
+
+    def __init__(self, conn: sqlite3.Connection, size: int) -> None:
+        self.conn = conn
+        self.size = size
+        self._aliases: dict[str, str] = {}  # month -> schema alias
+
+    def attach(self, group: list[Partition]) -> list[str]:
+        wanted = {partition.month for partition in group}
+        missing = [partition for partition in group if partition.month not in self._aliases]
+        in_use = set(self._aliases.values())
+        free = [f"p{index}" for index in range(self.size) if f"p{index}" not in in_use]
+        for month in list(self._aliases):
+            if len(free) >= len(missing):
+                break
+            if month not in wanted:
+                alias = self._aliases.pop(month)
+                self.conn.execute(f"DETACH DATABASE {alias}")
+                free.append(alias)
+        for partition, alias in zip(missing, free):
+            _attach(self.conn, partition.path, alias, read_only=True)
+            self._aliases[partition.month] = alias
+        return [self._aliases[partition.month] for partition in group]
+
+
+class PartitionedSQLiteStore:
+    supports_history: ClassVar[bool] = True
+
+    def __init__(self, directory: str | Path, max_attached: int = MAX_ATTACHED) -> None:
+        self.directory = Path(directory)
+        self.max_attached = max(1, min(max_attached, MAX_ATTACHED))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / INDEX_FILE
+        # Each partition file has its own lookup tables, so ids are cached per month.
+        self._lookups: dict[str, LookupCache] = {}
+        logger.debug("Initializing partitioned SQLite store in %s", self.directory)
+        with self._connect() as conn:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS offer_keys (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    external_id TEXT NOT NULL,
+                    month TEXT NOT NULL,
+                    UNIQUE(source, external_id)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS offer_partitions (
+                    month TEXT PRIMARY KEY,
+                    min_id INTEGER NOT NULL,
+                    max_id INTEGER NOT NULL,
+                    rows INTEGER NOT NULL DEFAULT 0,
+                    read_only INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+                """
+            )
+            history.ensure_history_schema(conn)
+            rollups.ensure_rollup_schema(conn)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        self._migrate_partitions()
+        if version < DICTIONARY_VERSION:
+            self._rekey_skills()
+
+    def _migrate_partitions(self) -> None:
+        """Move partitions that still have a ``job_offers`` table to ``offers`` and the lookup tables.
+
+        Read-only partitions are made writable for the move, vacuumed and frozen again.
+        """
+        for partition in self.partitions():
+            conn = sqlite3.connect(partition.path.resolve().as_uri() + "?mode=ro", uri=True)
+            try:
+                legacy = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_offers'"
+                ).fetchone()
+            finally:
+                conn.close()
+            if not legacy:
+                continue
+            mode = os.stat(partition.path).st_mode
+            if partition.read_only:
+                os.chmod(partition.path, mode | stat.S_IWUSR)
+            try:
+                self._create_partition(partition.month)  # ensure_offers_schema moves the rows
+                if partition.read_only:
+                    conn = sqlite3.connect(partition.path)
+                    try:
+                        conn.execute("VACUUM")
+                    finally:
+                        conn.close()
+            finally:
+                os.chmod(partition.path, mode)
+            logger.info("Moved partition %s to company and city lookup tables", partition.month)
+
+    def _rekey_skills(self) -> None:
+        """Re-key partition skill indexes and rollups after a skill dictionary change."""
+        partitions = self.partitions()
+        frozen = [partition.month for partition in partitions if partition.read_only]
+        for partition in partitions:
+            if not partition.read_only:
+                self._create_partition(partition.month)  # ensure_offers_schema rebuilds offer_skills
+        if frozen:
+            logger.warning("Read-only partitions keep their previous skill keys: %s", ", ".join(frozen))
+        if partitions:
+            self.rebuild_market_stats()
+        with self._connect() as conn:
+            conn.execute(f"PRAGMA user_version = {DICTIONARY_VERSION}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # uri=True lets ATTACH open partitions read-only (file:...?mode=ro).
+        conn = sqlite3.connect(self.index_path.resolve().as_uri(), uri=True)
+        register_functions(conn)
+        return conn
+
+    def partition_path(self, month: str) -> Path:
+        return self.directory / PARTITION_PATTERN.format(month=month)
+
+    def partitions(self) -> list[Partition]:
+        """Catalogued partitions whose file is present, newest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT month, min_id, max_id, rows, read_only FROM offer_partitions ORDER BY max_id DESC"
+            ).fetchall()
+        found: list[Partition] = []
+        for month, min_id, max_id, count, read_only in rows:
+            path = self.partition_path(month)
+            if path.exists():
+                found.append(Partition(month, path, min_id, max_id, count, bool(read_only)))
+            else:
+                logger.debug("Partition %s is archived (no %s); skipping", month, path.name)
+        return found
+
+    def _create_partition(self, month: str) -> None:
+        conn = sqlite3.connect(self.partition_path(month))
+        try:
+            with conn:
+                ensure_offers_schema(conn)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _insert_month(
+        conn: sqlite3.Connection, alias: str, month: str, offers: list["JobOffer"], lookups: LookupCache
+    ) -> list["JobOffer"]:
+        """Insert *offers* into partition *alias* under fresh global ids; return the new ones."""
+        inserted: list["JobOffer"] = []
+        month_ids: list[int] = []
+        for offer in offers:
+            try:
+                offer_id = conn.execute(
+                    "INSERT INTO offer_keys (source, external_id, month) VALUES (?, ?, ?)",
+                    (offer.source, offer.external_id, month),
+                ).lastrowid
+            except sqlite3.IntegrityError:
+                continue
+            conn.execute(
+                f"INSERT INTO {alias}.offers ({_INSERT_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    offer_id,
+                    offer.source,
+                    offer.external_id,
+                    offer.title,
+                    lookups.id(conn, "companies", offer.company, schema=alias),
+                    lookups.id(conn, "cities", offer.city, schema=alias),
+                    offer.workplace_type,
+                    offer.employment_type,
+                    offer.salary_min_pln,
+                    offer.salary_max_pln,
+                    offer.currency,
+                    _serialize_skills(offer.skills),
+                    str(offer.offer_url),
+                    offer.published_at.isoformat() if offer.published_at else None,
+                    _scraped_at(offer),
+                ),
+            )
+            index_offer_skills(conn, offer_id, offer.skills, table=f"{alias}.offer_skills")
+            month_ids.append(offer_id)
+            inserted.append(offer)
+        if month_ids:
+            conn.execute(
+                """
+                INSERT INTO offer_partitions (month, min_id, max_id, rows) VALUES (?, ?, ?, ?)
+                ON CONFLICT(month) DO UPDATE SET
+                    min_id = min(min_id, excluded.min_id),
+                    max_id = max(max_id, excluded.max_id),
+                    rows = rows + excluded.rows
+                """,
+                (month, min(month_ids), max(month_ids), len(month_ids)),
+            )
+        return inserted
+
+    def save_offers(self, offers: list["JobOffer"]) -> int:
+        if not offers:
+            logger.debug("No offers to save")
+            return 0
+
+        logger.info("Saving %d offers to database...", len(offers))
+        by_month: dict[str, list["JobOffer"]] = defaultdict(list)
+        for offer in offers:
+            by_month[_scraped_at(offer)[:7]].append(offer)
+
+        inserted_offers: list["JobOffer"] = []
+        observations = 0
+        conn = self._connect()
+        try:
+            catalog = dict(conn.execute("SELECT month, read_only FROM offer_partitions"))
+            months: list[str] = []
+            for month in sorted(by_month):
+                if catalog.get(month):
+                    logger.warning(
+                        "Skipping %d offers scraped in %s: partition is compacted (read-only)",
+                        len(by_month[month]),
+                        month,
+                    )
+                    continue
+                if month not in catalog:
+                    self._create_partition(month)
+                months.append(month)
+
+            # One transaction per group of attached partitions; a batch rarely spans more than two months.
+            for start in range(0, len(months), self.max_attached):
+                group = months[start:start + self.max_attached]
+                aliases = [f"p{index}" for index in range(len(group))]
+                for month, alias in zip(group, aliases):
+                    _attach(conn, self.partition_path(month), alias)
+                try:
+                    with conn:
+                        group_inserted: list["JobOffer"] = []
+                        group_rows: list[dict] = []
+                        for month, alias in zip(group, aliases):
+                            lookups = self._lookups.setdefault(month, LookupCache())
+                            month_inserted = self._insert_month(conn, alias, month, by_month[month], lookups)
+                            group_inserted += month_inserted
+                            # Keyed by each partition's display names, like rebuild_market_stats.
+                            group_rows += [rollup_row(offer, lookups) for offer in month_inserted]
+                        observations += history.record_observations(
+                            conn, [offer for month in group for offer in by_month[month]]
+                        )
+                        rollups.update_rollups(conn, group_rows)
+                    inserted_offers += group_inserted
+                except Exception:
+                    for month in group:
+                        self._lookups.pop(month, None)
+                    raise
+                finally:
+                    for alias in aliases:
+                        conn.execute(f"DETACH DATABASE {alias}")
+        finally:
+            conn.close()
+
+        logger.info("Inserted %d new offers (duplicates skipped)", len(inserted_offers))
+        logger.debug("Opened %d new history observations", observations)
+        return len(inserted_offers)
+
+    def _candidates(self, query: OfferQuery) -> list[Partition]:
+        first, last = _month_bounds(query)
+        return [
+            partition
+            for partition in self.partitions()
+            if (first is None or partition.month >= first)
+            and (last is None or partition.month <= last)
+            and (query.before_id is None or partition.min_id < query.before_id)
+        ]
+
+    def _union_sql(self, query: OfferQuery, aliases: list[str]) -> tuple[str, list[object]]:
+        branches: list[str] = []
+        params: list[object] = []
+        for alias in aliases:
+            sql, branch_params = SQLiteOfferStore._select_sql(query, schema=alias)
+            branches.append(f"SELECT * FROM ({sql})")
+            params.extend(branch_params)
+        sql = " UNION ALL ".join(branches) + " ORDER BY id DESC"
+        if query.limit > 0:
+            sql += " LIMIT ?"
+            params.append(query.limit)
+        return sql, params
+
+    def _fetch_page(
+        self, attached: "_Attachments", candidates: list[Partition], query: OfferQuery
+    ) -> list[sqlite3.Row]:
+        """One ``ORDER BY id DESC`` page of *query* across *candidates* (``limit <= 0``: all rows)."""
+        if query.before_id is not None:
+            candidates = [partition for partition in candidates if partition.min_id < query.before_id]
+        rows: list[sqlite3.Row] = []
+        start, size = 0, 1
+        while start < len(candidates):
+            # Start with the newest partition alone: most pages never need the next one.
+            group = candidates[start:start + size]
+            if query.limit > 0 and len(rows) >= query.limit and group[0].max_id < rows[-1]["id"]:
+                break  # every remaining partition only holds older ids
+            sql, params = self._union_sql(query, attached.attach(group))
+            rows.extend(attached.conn.execute(sql, params).fetchall())
+            rows.sort(key=lambda row: row["id"], reverse=True)
+            if query.limit > 0:
+                del rows[query.limit:]
+            start, size = start + size, min(size * 2, self.max_attached)
+        return rows
+
+    def query_offers(self, query: OfferQuery | None = None) -> list[dict]:
+        """Return offers matching *query* as list of dicts, newest first."""
+        return list(self.iter_offers(query))
+
+    def iter_offers(self, query: OfferQuery | None = None, page_size: int = 1000) -> Iterator[dict]:
+        """Yield offers matching *query* newest first, one keyset page at a time."""
+        if query is None:
+            query = OfferQuery()
+
+        remaining = query.limit if query.limit > 0 else None
+        cursor_id = query.before_id
+        candidates = self._candidates(query)
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        attached = _Attachments(conn, self.max_attached)
+        try:
+            while remaining is None or remaining > 0:
+                batch = page_size if remaining is None else min(page_size, remaining)
+                rows = self._fetch_page(attached, candidates, replace(query, before_id=cursor_id, limit=batch))
+                for row in rows:
+                    yield SQLiteOfferStore._row_to_dict(row)
+                if len(rows) < batch:
+                    return
+                cursor_id = rows[-1]["id"]
+                if remaining is not None:
+                    remaining -= len(rows)
+        finally:
+            conn.close()
+
+    def explain_query(self, query: OfferQuery) -> list[str]:
+        """Return EXPLAIN QUERY PLAN access paths for the newest partitions *query* reads."""
+        group = self._candidates(query)[:self.max_attached]
+        if not group:
+            return ["no partitions in range"]
+        conn = self._connect()
+        try:
+            sql, params = self._union_sql(query, _Attachments(conn, self.max_attached).attach(group))
+            lines = [f"partitions: {', '.join(p.month for p in group)}"]
+            # Keep the per-partition access paths; drop the UNION ALL / subquery scaffolding.
+            lines += [
+                row[3]
+                for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                if any(f".{table} " in row[3] for table in ("offers", "companies", "cities", "offer_skills"))
+            ]
+            return lines
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        """Return number of offers in partitions that are present (not archived)."""
+        return sum(partition.rows for partition in self.partitions())
+
+    def pending_enrichment(self, limit: int = 200, max_attempts: int = 3) -> list[dict]:
+        """Return newest offers still waiting for detail enrichment (writable partitions only)."""
+        found: list[dict] = []
+        for partition in self.partitions():
+            if partition.read_only or len(found) >= limit:
+                continue
+            with sqlite3.connect(partition.path) as conn:
+                store_rows = conn.execute(
+                    """
+                    SELECT id, source, external_id, offer_url FROM offers
+                    WHERE detail_status IS NULL OR (detail_status = 'failed' AND detail_attempts < ?)
+                    ORDER BY id DESC LIMIT ?
+                    """,
+                    (max_attempts, limit - len(found)),
+                ).fetchall()
+            found.extend(
+                {"id": row[0], "source": row[1], "external_id": row[2], "offer_url": row[3]} for row in store_rows
+            )
+        return found
+
+    def apply_enrichment(self, results: list[tuple[int, dict | None]]) -> int:
+        """Merge detail fields into the partitions holding each offer (see :func:`apply_offer_details`)."""
+        if not results:
+            return 0
+        conn = self._connect()
+        try:
+            placeholders = ", ".join("?" for _ in results)
+            months = dict(
+                conn.execute(
+                    f"""
+                    SELECT offer_keys.id, offer_keys.month FROM offer_keys
+                    JOIN offer_partitions ON offer_partitions.month = offer_keys.month
+                    WHERE offer_keys.id IN ({placeholders}) AND offer_partitions.read_only = 0
+                    """,
+                    [offer_id for offer_id, _ in results],
+                )
+            )
+            by_month: dict[str, list[tuple[int, dict | None]]] = defaultdict(list)
+            for offer_id, details in results:
+                if offer_id in months:
+                    by_month[months[offer_id]].append((offer_id, details))
+            updated = 0
+            for month, month_results in by_month.items():
+                _attach(conn, self.partition_path(month), "p0")
+                try:
+                    with conn:
+                        updated += apply_offer_details(conn, month_results, schema="p0")
+                finally:
+                    conn.execute("DETACH DATABASE p0")
+        finally:
+            conn.close()
+        logger.info("Applied detail enrichment to %d offers", updated)
+        return updated
+
+    def compact_partitions(self, keep_months: int = 3) -> list[str]:
+        """Vacuum and freeze (read-only) partitions older than the newest *keep_months* months.
+
+        Returns the months compacted by this call.
+        """
+        now = datetime.utcnow()
+        index = now.year * 12 + now.month - 1 - keep_months
+        cutoff = f"{index // 12:04d}-{index % 12 + 1:02d}"
+        compacted: list[str] = []
+        for partition in self.partitions():
+            if partition.read_only or partition.month > cutoff:
+                continue
+            conn = sqlite3.connect(partition.path)
+            try:
+                conn.execute("PRAGMA journal_mode = DELETE")
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+            mode = os.stat(partition.path).st_mode
+            os.chmod(partition.path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+            with self._connect() as conn:
+                conn.execute("UPDATE offer_partitions SET read_only = 1 WHERE month = ?", (partition.month,))
+            logger.info("Compacted partition %s (%d offers) and made it read-only", partition.month, partition.rows)
+            compacted.append(partition.month)
+        return compacted
+
+    def rebuild_market_stats(self) -> int:
+        """Recompute market rollups from every present partition."""
+        partitions = self.partitions()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM offer_rollups")
+            total = 0
+            # ATTACH/DETACH are not allowed inside a transaction, so each group commits on its own.
+            for start in range(0, len(partitions), self.max_attached):
+                aliases = _Attachments(conn, self.max_attached).attach(partitions[start:start + self.max_attached])
+                with conn:
+                    for alias in aliases:
+                        total += rollups.rebuild_rollups(conn, table=f"{alias}.job_offers", clear=False)
+                for alias in aliases:
+                    conn.execute(f"DETACH DATABASE {alias}")
+            return total
+        finally:
+            conn.close()
+
+    def compact_history(self, raw_days: int = 30, retention_days: int = 365) -> dict[str, int]:
+        """Downsample old observations in the index and reclaim free pages."""
+        conn = self._connect()
+        try:
+            with conn:
+                stats = history.compact_history(conn, raw_days=raw_days, retention_days=retention_days)
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        finally:
+            conn.close()
+        return stats
+
+    def offer_history(self, source: str, external_id: str) -> list[dict]:
+        """Return the stored observation history for one offer."""
+        with self._connect() as conn:
+            return history.offer_history(conn, source, external_id)
+
+    def market_stats(self, **filters) -> list[dict]:
+        """Return offer counts and salary percentiles (see :meth:`SQLiteOfferStore.market_stats`)."""
+        with self._connect() as conn:
+            return rollups.query_rollups(conn, **filters)
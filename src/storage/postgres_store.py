@@ -0,0 +1,363 @@
+"""PostgreSQL offer store. Requires the optional ``psycopg`` and ``psycopg_pool`` packages.
+
+``save_offers`` streams each batch with ``COPY`` into a per-session staging
+table and merges it with one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``,
+so a large harvest costs a single round trip instead of one INSERT per offer.
+Connections come from a ``psycopg_pool.ConnectionPool``.
+
+``OfferQuery`` maps onto the same predicates as in SQLite. Exact and prefix
+city/company matches use ``lower(...)`` btree indexes, skills are ``jsonb``
+with a GIN index for whole-skill matches, and when the ``pg_trgm`` extension
+is available trigram indexes serve the substring (``contains``) searches;
+without it those scan, as they do in SQLite.
+"""
+
+import json
+import logging
+from dataclasses import replace
+from datetime import datetime
+from typing import ClassVar, Iterator, TYPE_CHECKING
+
+from src.skills import canonical_skill, canonicalize_skills
+from src.storage.base import escape_like
+from src.storage.sqlite_store import OfferQuery, TEXT_MATCH_MODES
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+_OFFER_COLUMNS = (
+    "source",
+    "external_id",
+    "title",
+    "company",
+    "city",
+    "workplace_type",
+    "employment_type",
+    "salary_min_pln",
+    "salary_max_pln",
+    "currency",
+    "skills",
+    "offer_url",
+    "published_at",
+    "scraped_at",
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS job_offers (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        source TEXT NOT NULL,
+        external_id TEXT NOT NULL,
+        title TEXT NOT NULL,
+        company TEXT NOT NULL,
+        city TEXT,
+        workplace_type TEXT NOT NULL,
+        employment_type TEXT,
+        salary_min_pln INTEGER,
+        salary_max_pln INTEGER,
+        currency TEXT,
+        skills JSONB NOT NULL DEFAULT '[]',
+        offer_url TEXT NOT NULL,
+        published_at TEXT,  -- ISO strings, as in the SQLite schema
+        scraped_at TEXT NOT NULL,
+        detail_status TEXT,
+        detail_attempts INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (source, external_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_source_id ON job_offers (source, id)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_salary ON job_offers (salary_min_pln, salary_max_pln)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_salary_max ON job_offers (salary_max_pln)",
+    # Exact and prefix matches on lower(...) seek these and walk ids in order.
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_city_lower ON job_offers (lower(city) text_pattern_ops, id)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_company_lower ON job_offers (lower(company) text_pattern_ops, id)",
+    # Whole-skill matches: lower(skills::text)::jsonb @> '["python"]'
+    """
+    CREATE INDEX IF NOT EXISTS idx_job_offers_skills
+    ON job_offers USING GIN ((lower(skills::text)::jsonb) jsonb_path_ops)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_job_offers_detail_pending
+    ON job_offers (id) WHERE detail_status IS NULL OR detail_status = 'failed'
+    """,
+)
+
+_TRIGRAM_SCHEMA = (
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_city_trgm ON job_offers USING GIN (city gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_company_trgm ON job_offers USING GIN (company gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_title_trgm ON job_offers USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_skills_trgm ON job_offers USING GIN ((skills::text) gin_trgm_ops)",
+)
+
+_STAGING_TABLE = "job_offers_staging"
+# Refresh planner statistics after bulk loads this large (autovacuum may lag behind).
+_ANALYZE_AFTER_ROWS = 10_000
+
+
+def _import_psycopg():
+    try:
+        import psycopg
+        import psycopg_pool
+    except ImportError:
+        raise ImportError(
+            "PostgreSQL storage requires the 'psycopg' and 'psycopg_pool' packages "
+            "(pip install 'psycopg[binary,pool]')"
+        ) from None
+    return psycopg, psycopg_pool
+
+
+def _text_clause(column: str, value: str, mode: str) -> tuple[str, object]:
+    """Postgres counterpart of ``sqlite_store._lookup_clause``: case-insensitive, ``%``/``_`` matched literally."""
+    if mode == "exact":
+        return f"lower({column}) = lower(%s)", value
+    if mode == "prefix":
+        return f"lower({column}) LIKE lower(%s)", f"{escape_like(value)}%"
+    if mode == "contains":
+        return f"{column} ILIKE %s", f"%{escape_like(value)}%"
+    raise ValueError(f"Unsupported match mode {mode!r} (use one of {', '.join(TEXT_MATCH_MODES)})")
+
+
+def query_to_sql(query: OfferQuery) -> tuple[str, list[object]]:
+    """Return (WHERE+ORDER+LIMIT SQL fragment, params) for *query* in Postgres syntax."""
+    if query.offer_filter is not None:
+        # OfferFilter.to_sql() relies on SQLite's offer_skills table and REGEXP function.
+        raise ValueError("OfferQuery.offer_filter is only supported by the SQLite stores")
+    clauses: list[str] = []
+    params: list[object] = []
+
+    if query.city:
+        clause, value = _text_clause("city", query.city, query.city_match)
+        clauses.append(clause)
+        params.append(value)
+    if query.company:
+        clause, value = _text_clause("company", query.company, query.company_match)
+        clauses.append(clause)
+        params.append(value)
+    if query.skill:
+        if query.skill_match == "exact":
+            clauses.append("lower(skills::text)::jsonb @> jsonb_build_array(lower(%s))")
+            params.append(canonical_skill(query.skill))
+        elif query.skill_match == "contains":
+            clauses.append("skills::text ILIKE %s")
+            params.append(f"%{escape_like(canonical_skill(query.skill))}%")
+        else:
+            raise ValueError(f"Unsupported skill match mode {query.skill_match!r} (use contains or exact)")
+    if query.title:
+        clauses.append("title ILIKE %s")
+        params.append(f"%{escape_like(query.title)}%")
+    if query.source:
+        clauses.append("source = %s")
+        params.append(query.source)
+    if query.min_salary is not None:
+        clauses.append("(salary_min_pln >= %s OR salary_max_pln >= %s)")
+        params.extend([query.min_salary, query.min_salary])
+    if query.scraped_since:
+        clauses.append("scraped_at >= %s")
+        params.append(query.scraped_since)
+    if query.scraped_until:
+        clauses.append("scraped_at < %s")
+        params.append(query.scraped_until)
+    if query.before_id is not None:
+        clauses.append("id < %s")
+        params.append(query.before_id)
+
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    params.append(query.limit if query.limit > 0 else None)  # LIMIT NULL means no limit
+    return f"{where} ORDER BY id DESC LIMIT %s", params
+
+
+def _offer_row(offer: "JobOffer") -> tuple:
+    return (
+        offer.source,
+        offer.external_id,
+        offer.title,
+        offer.company,
+        offer.city,
+        offer.workplace_type,
+        offer.employment_type,
+        offer.salary_min_pln,
+        offer.salary_max_pln,
+        offer.currency,
+        json.dumps(offer.skills, ensure_ascii=False),
+        str(offer.offer_url),
+        offer.published_at.isoformat() if offer.published_at else None,
+        offer.scraped_at.isoformat() if isinstance(offer.scraped_at, datetime) else datetime.utcnow().isoformat(),
+    )
+
+
+class PostgresOfferStore:
+    supports_history: ClassVar[bool] = False
+
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 4) -> None:
+        psycopg, psycopg_pool = _import_psycopg()
+        self._psycopg = psycopg
+        self.dsn = dsn
+        self.pool = psycopg_pool.ConnectionPool(
+            dsn, min_size=min_connections, max_size=max_connections, open=True, name="jobpulse"
+        )
+        self.trigram_indexes = False
+        logger.debug("Initializing PostgreSQL store (pool %d-%d)", min_connections, max_connections)
+        self._ensure_schema()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _ensure_schema(self) -> None:
+        with self.pool.connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            try:
+                with conn.transaction():
+                    conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                    for statement in _TRIGRAM_SCHEMA:
+                        conn.execute(statement)
+                self.trigram_indexes = True
+            except self._psycopg.Error as exc:
+                logger.warning("pg_trgm unavailable (%s); substring searches will scan", str(exc).splitlines()[0])
+
+    def save_offers(self, offers: list["JobOffer"]) -> int:
+        if not offers:
+            logger.debug("No offers to save")
+            return 0
+
+        logger.info("Saving %d offers to database...", len(offers))
+        columns = ", ".join(_OFFER_COLUMNS)
+        with self.pool.connection() as conn:
+            conn.execute(
+                f"""
+                CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} (
+                    seq BIGINT NOT NULL,
+                    source TEXT, external_id TEXT, title TEXT, company TEXT, city TEXT,
+                    workplace_type TEXT, employment_type TEXT, salary_min_pln INTEGER,
+                    salary_max_pln INTEGER, currency TEXT, skills JSONB, offer_url TEXT,
+                    published_at TEXT, scraped_at TEXT
+                ) ON COMMIT DELETE ROWS
+                """
+            )
+            with conn.cursor() as cursor:
+                with cursor.copy(f"COPY {_STAGING_TABLE} (seq, {columns}) FROM STDIN") as copy:
+                    for seq, offer in enumerate(offers):
+                        copy.write_row((seq, *_offer_row(offer)))
+                # First occurrence of a key within the batch wins and ids follow input
+                # order, as with the row-by-row SQLite insert.
+                cursor.execute(
+                    f"""
+                    INSERT INTO job_offers ({columns})
+                    SELECT {columns} FROM (
+                        SELECT DISTINCT ON (source, external_id) * FROM {_STAGING_TABLE}
+                        ORDER BY source, external_id, seq
+                    ) AS batch
+                    ORDER BY seq
+                    ON CONFLICT (source, external_id) DO NOTHING
+                    """
+                )
+                inserted = cursor.rowcount
+            if inserted >= _ANALYZE_AFTER_ROWS:
+                conn.execute("ANALYZE job_offers")
+        logger.info("Inserted %d new offers (duplicates skipped)", inserted)
+        return inserted
+
+    def pending_enrichment(self, limit: int = 200, max_attempts: int = 3) -> list[dict]:
+        """Return newest offers whose detail page was never fetched (or failed), up to *limit*."""
+        with self.pool.connection() as conn, conn.cursor(row_factory=self._psycopg.rows.dict_row) as cursor:
+            cursor.execute(
+                """
+                SELECT id, source, external_id, offer_url FROM job_offers
+                WHERE detail_status IS NULL OR (detail_status = 'failed' AND detail_attempts < %s)
+                ORDER BY id DESC LIMIT %s
+                """,
+                (max_attempts, limit),
+            )
+            return cursor.fetchall()
+
+    def apply_enrichment(self, results: list[tuple[int, dict | None]]) -> int:
+        """Merge detail fields into stored rows, with the same rules as the SQLite store."""
+        failed = [(offer_id,) for offer_id, details in results if details is None]
+        enriched = [
+            (
+                details.get("published_at"),
+                details.get("employment_type"),
+                details.get("workplace_type"),
+                details.get("salary_min_pln"),
+                details.get("salary_max_pln"),
+                (
+                    json.dumps(canonicalize_skills(details["skills"]), ensure_ascii=False)
+                    if details.get("skills")
+                    else None
+                ),
+                offer_id,
+            )
+            for offer_id, details in results
+            if details is not None
+        ]
+        with self.pool.connection() as conn, conn.cursor() as cursor:
+            if failed:
+                cursor.executemany(
+                    "UPDATE job_offers SET detail_status = 'failed', detail_attempts = detail_attempts + 1 WHERE id = %s",
+                    failed,
+                )
+            if enriched:
+                cursor.executemany(
+                    """
+                    UPDATE job_offers SET
+                        published_at = COALESCE(published_at, %s),
+                        employment_type = COALESCE(employment_type, %s),
+                        workplace_type = CASE WHEN workplace_type = 'unknown' THEN COALESCE(%s, workplace_type)
+                                              ELSE workplace_type END,
+                        salary_min_pln = COALESCE(salary_min_pln, %s),
+                        salary_max_pln = COALESCE(salary_max_pln, %s),
+                        skills = COALESCE(%s::jsonb, skills),
+                        detail_status = 'ok',
+                        detail_attempts = detail_attempts + 1
+                    WHERE id = %s
+                    """,
+                    enriched,
+                )
+        logger.info("Applied detail enrichment to %d offers", len(enriched))
+        return len(enriched)
+
+    def count(self) -> int:
+        """Return total number of stored offers."""
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT count(*) FROM job_offers").fetchone()[0]
+
+    @staticmethod
+    def _select_sql(query: OfferQuery) -> tuple[str, list[object]]:
+        where_sql, params = query_to_sql(query)
+        sql = (
+            "SELECT id, source, external_id, title, company, city, "
+            "salary_min_pln, salary_max_pln, skills, offer_url"
+            f" FROM job_offers{where_sql}"
+        )
+        return sql, params
+
+    def explain_query(self, query: OfferQuery) -> list[str]:
+        """Return PostgreSQL's EXPLAIN lines for *query*."""
+        sql, params = self._select_sql(query)
+        with self.pool.connection() as conn:
+            return [row[0] for row in conn.execute(f"EXPLAIN {sql}", params)]
+
+    def query_offers(self, query: OfferQuery | None = None) -> list[dict]:
+        """Return offers matching *query* as list of dicts."""
+        return list(self.iter_offers(query))
+
+    def iter_offers(self, query: OfferQuery | None = None, page_size: int = 1000) -> Iterator[dict]:
+        """Yield offers matching *query* newest first, one keyset page at a time (see the SQLite store)."""
+        if query is None:
+            query = OfferQuery()
+
+        remaining = query.limit if query.limit > 0 else None
+        cursor_id = query.before_id
+        with self.pool.connection() as conn, conn.cursor(row_factory=self._psycopg.rows.dict_row) as cursor:
+            while remaining is None or remaining > 0:
+                batch = page_size if remaining is None else min(page_size, remaining)
+                sql, params = self._select_sql(replace(query, before_id=cursor_id, limit=batch))
+                rows = cursor.execute(sql, params).fetchall()
+                yield from rows
+                if len(rows) < batch:
+                    return
+                cursor_id = rows[-1]["id"]
+                if remaining is not None:
+                    remaining -= len(rows)
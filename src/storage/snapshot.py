@@ -0,0 +1,367 @@
+"""Read-only columnar snapshot of recent offers, memory-mapped by any number of readers.
+
+:func:`build_snapshot` writes the offers of a store query into one file;
+:class:`OfferSnapshot` maps it and exposes the columns as NumPy arrays backed
+by the mapping, so every reader process shares the same page-cache pages and
+nothing is copied or parsed up front. Rebuilding replaces the file atomically:
+readers keep their old mapping until they call :meth:`OfferSnapshot.refresh`.
+
+File layout (little-endian)::
+
+    b"JPSNAP\\x00\\x01" | uint32 header length | JSON header | sections (64-byte aligned)
+
+The header lists every section as ``[offset, nbytes, dtype, shape]``:
+
+* ``id`` (int64), ``salary_min_pln``/``salary_max_pln`` (int32, -1 = unknown),
+  ``source`` (uint8 code into ``header["sources"]``);
+* ``city``/``company`` (int32 code, -1 = none) into a string dictionary
+  (``city_dict.offsets``/``city_dict.heap``);
+* ``title``, ``external_id``, ``offer_url``: one string per row in a UTF-8
+  heap, row *i* at ``heap[offsets[i]:offsets[i + 1]]``;
+* ``skills.bitmap``: ``rows x words`` uint64, one bit per canonical skill key
+  (``header["skills"]["keys"]``, see :func:`src.filters.normalize_skill`), for
+  filtering; ``skills.offsets``/``skills.ids`` keep each row's skill list as
+  written, for display.
+
+Rows are stored newest first (``id`` descending), like ``query_offers``.
+Building needs only the standard library; reading needs ``numpy``.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, TYPE_CHECKING
+
+from src.filters import normalize_skill
+from src.storage.sqlite_store import OfferQuery
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.storage.base import OfferStore
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"JPSNAP\x00\x01"
+_ALIGN = 64
+_NULL = -1
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("reading offer snapshots requires the 'numpy' package (pip install numpy)") from None
+    return numpy
+
+
+class _StringColumn:
+    """Offsets + UTF-8 heap, appended row by row."""
+
+    def __init__(self) -> None:
+        self.offsets = array("Q", [0])
+        self.heap = bytearray()
+
+    def append(self, value: str | None) -> None:
+        self.heap += (value or "").encode("utf-8")
+        self.offsets.append(len(self.heap))
+
+
+class _Dictionary:
+    """Distinct strings with int codes; the strings themselves go into a :class:`_StringColumn`."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.strings = _StringColumn()
+
+    def code(self, value: str | None) -> int:
+        if value is None:
+            return _NULL
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+            self.strings.append(value)
+        return code
+
+
+def _le(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def build_snapshot(store: "OfferStore", path: str | Path, days: int = 0, page_size: int = 5000) -> int:
+    """Write offers scraped in the last *days* (0 = all) from *store* to a snapshot at *path*; return the row count."""
+    since = (datetime.utcnow() - timedelta(days=days)).isoformat() if days > 0 else None
+    query = OfferQuery(scraped_since=since, limit=0)
+    ids = array("q")
+    salary_min = array("i")
+    salary_max = array("i")
+    source_codes = array("B")
+    sources: dict[str, int] = {}
+    cities, companies = _Dictionary(), _Dictionary()
+    city_codes, company_codes = array("i"), array("i")
+    strings = {"title": _StringColumn(), "external_id": _StringColumn(), "offer_url": _StringColumn()}
+    skill_names: dict[str, int] = {}  # display string -> id
+    skill_bits: dict[str, int] = {}  # canonical skill key -> bit
+    skill_offsets, skill_ids = array("I", [0]), array("I")
+    row_bits: list[int] = []
+
+    for row in store.iter_offers(query, page_size=page_size):
+        ids.append(row["id"])
+        salary_min.append(_NULL if row["salary_min_pln"] is None else row["salary_min_pln"])
+        salary_max.append(_NULL if row["salary_max_pln"] is None else row["salary_max_pln"])
+        source_codes.append(sources.setdefault(row["source"], len(sources)))
+        city_codes.append(cities.code(row["city"]))
+        company_codes.append(companies.code(row["company"]))
+        for name, column in strings.items():
+            column.append(row[name])
+        bits = 0
+        for skill in row["skills"] or []:
+            skill_ids.append(skill_names.setdefault(skill, len(skill_names)))
+            key = normalize_skill(skill)
+            if key:
+                bits |= 1 << skill_bits.setdefault(key, len(skill_bits))
+        skill_offsets.append(len(skill_ids))
+        row_bits.append(bits)
+
+    rows = len(ids)
+    words = max(1, (len(skill_bits) + 63) // 64)
+    bitmap = array("Q", bytes(8 * rows * words))
+    for index, bits in enumerate(row_bits):
+        for word in range(words):
+            bitmap[index * words + word] = (bits >> (64 * word)) & 0xFFFFFFFFFFFFFFFF
+
+    sections: list[tuple[str, bytes, str, list[int]]] = [
+        ("id", _le(ids), "<i8", [rows]),
+        ("salary_min_pln", _le(salary_min), "<i4", [rows]),
+        ("salary_max_pln", _le(salary_max), "<i4", [rows]),
+        ("source", source_codes.tobytes(), "|u1", [rows]),
+        ("city", _le(city_codes), "<i4", [rows]),
+        ("company", _le(company_codes), "<i4", [rows]),
+        ("skills.bitmap", _le(bitmap), "<u8", [rows, words]),
+        ("skills.offsets", _le(skill_offsets), "<u4", [rows + 1]),
+        ("skills.ids", _le(skill_ids), "<u4", [len(skill_ids)]),
+    ]
+    for name, dictionary in (("city_dict", cities), ("company_dict", companies)):
+        sections.append((f"{name}.offsets", _le(dictionary.strings.offsets), "<u8", [len(dictionary.codes) + 1]))
+        sections.append((f"{name}.heap", bytes(dictionary.strings.heap), "|u1", [len(dictionary.strings.heap)]))
+    for name, column in strings.items():
+        sections.append((f"{name}.offsets", _le(column.offsets), "<u8", [rows + 1]))
+        sections.append((f"{name}.heap", bytes(column.heap), "|u1", [len(column.heap)]))
+
+    header = {
+        "version": 1,
+        "rows": rows,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "max_id": ids[0] if rows else None,
+        "days": days,
+        "sources": list(sources),
+        "skills": {
+            "names": list(skill_names),
+            "keys": list(skill_bits),
+            "bits": [skill_bits.get(normalize_skill(name), -1) for name in skill_names],
+        },
+        "sections": {},
+    }
+    # Section offsets depend on the header size and the header lists them: grow the reserved size until it fits.
+    header_size = _ALIGN
+    while True:
+        offset = header_size
+        for name, data, dtype, shape in sections:
+            header["sections"][name] = [offset, len(data), dtype, shape]
+            offset += -(-len(data) // _ALIGN) * _ALIGN
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        needed = -(-(len(MAGIC) + 4 + len(encoded)) // _ALIGN) * _ALIGN
+        if needed <= header_size:
+            break
+        header_size = needed
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+            for name, data, _, _ in sections:
+                handle.seek(header["sections"][name][0])
+                handle.write(data)
+            handle.truncate(offset)
+        # Readers holding the previous file keep their mapping; new opens see the new one.
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    logger.info("Wrote offer snapshot %s (%d offers, %d skills, %.1f MiB)", path, rows, len(skill_bits), offset / 2**20)
+    return rows
+
+
+class OfferSnapshot:
+    """Memory-mapped view of a snapshot file; columns are zero-copy NumPy arrays.
+
+    ``snapshot.mask(city="Kraków", skills=["python"])`` builds a boolean row
+    mask with vectorized operations; ``snapshot.rows(snapshot.select(mask, 20))``
+    turns the first matches into the same dicts ``query_offers`` returns.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._np = _import_numpy()
+        self._open()
+
+    def _open(self) -> None:
+        # Build the new mapping completely before swapping it in, so a failed
+        # reopen leaves the previous one usable.
+        with open(self.path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapping[: len(MAGIC)] != MAGIC:
+            mapping.close()
+            raise ValueError(f"{self.path} is not an offer snapshot")
+        (header_len,) = struct.unpack_from("<I", mapping, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(mapping[start:start + header_len])
+        columns: dict[str, "np.ndarray"] = {}
+        for name, (offset, nbytes, dtype, shape) in header["sections"].items():
+            dtype = self._np.dtype(dtype)
+            array_ = self._np.frombuffer(mapping, dtype=dtype, count=nbytes // dtype.itemsize, offset=offset)
+            columns[name] = array_.reshape(shape)
+        self._stat, self._mmap, self.header, self._columns = stat, mapping, header, columns
+        self._lower_dicts: dict[str, list[str]] = {}
+
+    def close(self) -> None:
+        """Release the mapping.
+
+        Arrays returned by :meth:`column` export the mapping's buffer. While a
+        caller still holds one the file cannot be unmapped here; it is unmapped
+        when the last such array is garbage collected instead.
+        """
+        self._columns = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            logger.debug("Snapshot %s still has exported column arrays; unmapping it on collection", self.path)
+
+    def __enter__(self) -> "OfferSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.header["rows"]
+
+    def refresh(self) -> bool:
+        """Remap if the file was rebuilt since it was opened; return whether it changed.
+
+        The old mapping is not closed explicitly: arrays already handed out by
+        :meth:`column` keep reading it, and it is unmapped once they are gone.
+        """
+        stat = os.stat(self.path)
+        if (stat.st_ino, stat.st_mtime_ns) == (self._stat.st_ino, self._stat.st_mtime_ns):
+            return False
+        self._open()
+        return True
+
+    def column(self, name: str) -> "np.ndarray":
+        """Raw section array (e.g. ``id``, ``salary_min_pln``, ``city``, ``skills.bitmap``)."""
+        return self._columns[name]
+
+    def _dictionary(self, name: str) -> list[str]:
+        if name not in self._lower_dicts:
+            offsets, heap = self._columns[f"{name}.offsets"], self._columns[f"{name}.heap"]
+            self._lower_dicts[name] = [
+                bytes(heap[offsets[i]:offsets[i + 1]]).decode("utf-8").casefold() for i in range(len(offsets) - 1)
+            ]
+        return self._lower_dicts[name]
+
+    def _codes_equal(self, column: str, value: str) -> "np.ndarray":
+        wanted = value.casefold()
+        codes = [code for code, text in enumerate(self._dictionary(f"{column}_dict")) if text == wanted]
+        return self._np.isin(self._columns[column], codes)
+
+    def skill_mask(self, skills: Iterable[str], match: str = "all") -> "np.ndarray":
+        """Rows having all (or, with ``match="any"``, any) of *skills*; aliases match their canonical skill."""
+        np = self._np
+        bitmap = self._columns["skills.bitmap"]
+        words = bitmap.shape[1]
+        wanted = np.zeros(words, dtype=np.uint64)
+        bit_of = {key: bit for bit, key in enumerate(self.header["skills"]["keys"])}
+        for skill in skills:
+            bit = bit_of.get(normalize_skill(skill))
+            if bit is None:
+                if match == "all":
+                    return np.zeros(len(self), dtype=bool)
+                continue
+            wanted[bit // 64] |= np.uint64(1 << (bit % 64))
+        hits = bitmap & wanted
+        if match == "all":
+            return (hits == wanted).all(axis=1)
+        return hits.any(axis=1)
+
+    def mask(
+        self,
+        city: str | None = None,
+        company: str | None = None,
+        source: str | None = None,
+        skills: Iterable[str] = (),
+        skills_match: str = "all",
+        min_salary: int | None = None,
+    ) -> "np.ndarray":
+        """Boolean row mask; city and company are exact, case-insensitive matches."""
+        np = self._np
+        result = np.ones(len(self), dtype=bool)
+        if city is not None:
+            result &= self._codes_equal("city", city)
+        if company is not None:
+            result &= self._codes_equal("company", company)
+        if source is not None:
+            sources = self.header["sources"]
+            if source not in sources:
+                return np.zeros(len(self), dtype=bool)
+            result &= self._columns["source"] == sources.index(source)
+        skills = list(skills)
+        if skills:
+            result &= self.skill_mask(skills, skills_match)
+        if min_salary is not None:
+            result &= (self._columns["salary_min_pln"] >= min_salary) | (self._columns["salary_max_pln"] >= min_salary)
+        return result
+
+    def select(self, mask: "np.ndarray", limit: int = 0) -> "np.ndarray":
+        """Row indices set in *mask*, newest first, at most *limit* (0 = all)."""
+        indices = self._np.flatnonzero(mask)
+        return indices[:limit] if limit > 0 else indices
+
+    def _string(self, name: str, index: int) -> str:
+        offsets, heap = self._columns[f"{name}.offsets"], self._columns[f"{name}.heap"]
+        return bytes(heap[offsets[index]:offsets[index + 1]]).decode("utf-8")
+
+    def row(self, index: int) -> dict:
+        columns = self._columns
+        city, company = int(columns["city"][index]), int(columns["company"][index])
+        salary_min, salary_max = int(columns["salary_min_pln"][index]), int(columns["salary_max_pln"][index])
+        skill_names = self.header["skills"]["names"]
+        first, last = columns["skills.offsets"][index], columns["skills.offsets"][index + 1]
+        return {
+            "id": int(columns["id"][index]),
+            "source": self.header["sources"][columns["source"][index]],
+            "external_id": self._string("external_id", index),
+            "title": self._string("title", index),
+            "company": self._string("company_dict", company) if company != _NULL else None,
+            "city": self._string("city_dict", city) if city != _NULL else None,
+            "salary_min_pln": salary_min if salary_min != _NULL else None,
+            "salary_max_pln": salary_max if salary_max != _NULL else None,
+            "skills": [skill_names[skill_id] for skill_id in columns["skills.ids"][first:last]],
+            "offer_url": self._string("offer_url", index),
+        }
+
+    def rows(self, indices: Iterable[int]) -> list[dict]:
+        return [self.row(int(index)) for index in indices]
@@ -1,15 +1,51 @@
 import json
 import logging
 import sqlite3
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
+from typing import ClassVar, Iterator, TYPE_CHECKING
 
-from src.models import JobOffer
+from src.analytics import rollups
+from src.filters import OfferFilter, lookup_key, normalize_skill, regexp
+from src.skills import DICTIONARY_VERSION, canonical_skill, canonicalize_skills
+from src.storage import history
+from src.storage.base import escape_like
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
 
 logger = logging.getLogger(__name__)
 
 
+TEXT_MATCH_MODES = ("contains", "prefix", "exact")
+
+
+def _lookup_clause(column: str, table: str, value: str, mode: str) -> tuple[str, list[object]]:
+    """Translate a company or city filter into a predicate on the lookup id *column* of ``offers``.
+
+    Names are matched on the :func:`~src.filters.lookup_key` of the small
+    lookup *table*, so case folding covers non-ASCII spellings too. The
+    unique key index serves ``exact`` (one id, whose rows the offers index
+    returns already in id order) and ``prefix`` (a key range); ``contains``
+    keeps the legacy ``%value%`` substring match and scans the lookup table.
+    """
+    key = lookup_key(value)
+    if mode == "exact":
+        return f"{column} = (SELECT id FROM {table} WHERE key = ?)", [key]
+    if mode == "prefix":
+        if value[-1:].isspace() and key:
+            key += " "  # "Nowy " means a whole first word
+        if not key:
+            return f"{column} IN (SELECT id FROM {table})", []
+        # Keys sort by code point (BINARY), so everything starting with *key* sorts below its successor.
+        upper = key[:-1] + chr(ord(key[-1]) + 1)
+        return f"{column} IN (SELECT id FROM {table} WHERE key >= ? AND key < ?)", [key, upper]
+    if mode == "contains":
+        return f"{column} IN (SELECT id FROM {table} WHERE key LIKE ? ESCAPE '\\')", [f"%{escape_like(key)}%"]
+    raise ValueError(f"Unsupported match mode {mode!r} (use one of {', '.join(TEXT_MATCH_MODES)})")
+
+
 @dataclass
 class OfferQuery:
     """Declarative query parameters for stored offers."""
@@ -19,155 +55,603 @@ class OfferQuery:
     title: str | None = None
     source: str | None = None
     min_salary: int | None = None
-    limit: int = 20
+    limit: int = 20  # <= 0 means no limit
+    city_match: str = "contains"  # "contains", "prefix" or "exact"
+    company_match: str = "contains"
+    skill_match: str = "contains"  # "contains" (substring of the JSON list) or "exact" (one list element)
+    before_id: int | None = None  # keyset cursor: only rows with id < before_id
+    scraped_since: str | None = None  # ISO date/time, inclusive
+    scraped_until: str | None = None  # ISO date/time, exclusive
+    offer_filter: OfferFilter | None = None  # same semantics as the in-memory filter, evaluated in SQL
+
+    def to_sql(self, schema: str = "") -> tuple[str, list[object]]:
+        """Return (WHERE+ORDER+LIMIT SQL fragment, params) over ``offers`` columns.
 
-    def to_sql(self) -> tuple[str, list[object]]:
-        """Return (WHERE+ORDER+LIMIT SQL fragment, params)."""
+        Lookup and skill tables are qualified with *schema* (an attached partition) when given.
+        """
+        prefix = f"{schema}." if schema else ""
         clauses: list[str] = []
         params: list[object] = []
+        # Predicates that can seek an index and still walk ids in order.
+        seekable = False
+
+        if self.offer_filter is not None:
+            filter_clauses, filter_params = self.offer_filter.to_sql(schema)
+            clauses.extend(filter_clauses)
+            params.extend(filter_params)
 
         if self.city:
-            clauses.append("city LIKE ?")
-            params.append(f"%{self.city}%")
+            clause, values = _lookup_clause("city_id", f"{prefix}cities", self.city, self.city_match)
+            clauses.append(clause)
+            params.extend(values)
+            seekable = seekable or self.city_match != "contains"
         if self.company:
-            clauses.append("company LIKE ?")
-            params.append(f"%{self.company}%")
+            clause, values = _lookup_clause("company_id", f"{prefix}companies", self.company, self.company_match)
+            clauses.append(clause)
+            params.extend(values)
+            seekable = seekable or self.company_match != "contains"
         if self.skill:
-            clauses.append("skills LIKE ?")
-            params.append(f"%{self.skill}%")
+            # Stored skills are canonical, so aliases ("k8s") are resolved before matching.
+            if self.skill_match == "exact":
+                clauses.append(f"id IN (SELECT offer_id FROM {prefix}offer_skills WHERE skill = ?)")
+                params.append(normalize_skill(self.skill))
+                seekable = True
+            elif self.skill_match == "contains":
+                clauses.append("skills LIKE ? ESCAPE '\\'")
+                params.append(f"%{escape_like(canonical_skill(self.skill))}%")
+            else:
+                raise ValueError(f"Unsupported skill match mode {self.skill_match!r} (use contains or exact)")
         if self.title:
-            clauses.append("title LIKE ?")
-            params.append(f"%{self.title}%")
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            params.append(f"%{escape_like(self.title)}%")
         if self.source:
             clauses.append("source = ?")
             params.append(self.source)
+            seekable = True
         if self.min_salary is not None:
             clauses.append("(salary_min_pln >= ? OR salary_max_pln >= ?)")
             params.extend([self.min_salary, self.min_salary])
+        if self.scraped_since:
+            clauses.append("scraped_at >= ?")
+            params.append(self.scraped_since)
+        if self.scraped_until:
+            clauses.append("scraped_at < ?")
+            params.append(self.scraped_until)
+        if self.before_id is not None:
+            clauses.append("id < ?")
+            params.append(self.before_id)
+            seekable = True
+
+        # With only the salary range to go on, SQLite prefers walking the rowid
+        # backwards for ORDER BY id DESC LIMIT and never touches the salary
+        # indexes. ``+id`` removes that option so it runs a MULTI-INDEX OR over
+        # (salary_min_pln, salary_max_pln) and (salary_max_pln) instead.
+        order_column = "+id" if self.min_salary is not None and not seekable else "id"
 
         where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
-        sql = f"{where} ORDER BY id DESC LIMIT ?"
-        params.append(self.limit)
+        sql = f"{where} ORDER BY {order_column} DESC LIMIT ?"
+        params.append(self.limit if self.limit > 0 else -1)
         return sql, params
 
 
+def register_functions(conn: sqlite3.Connection) -> None:
+    """Register SQL functions used by compiled filters (``title REGEXP ?``)."""
+    conn.create_function("regexp", 2, regexp, deterministic=True)
+
+
+def index_offer_skills(conn: sqlite3.Connection, offer_id: int, skills: list[str], table: str = "offer_skills") -> None:
+    """(Re)write the normalized skill keys of one offer into *table*."""
+    conn.execute(f"DELETE FROM {table} WHERE offer_id = ?", (offer_id,))
+    keys = {normalize_skill(skill) for skill in skills or []} - {""}
+    conn.executemany(f"INSERT INTO {table} (skill, offer_id) VALUES (?, ?)", [(key, offer_id) for key in keys])
+
+
+def _ensure_skills_index(conn: sqlite3.Connection, batch_size: int = 5000) -> bool:
+    """Create ``offer_skills`` and (re)build it for stored offers when the skill dictionary changed.
+
+    ``PRAGMA user_version`` records the :data:`DICTIONARY_VERSION` the keys were
+    built with. Returns True if stored offers were re-keyed.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'offer_skills'").fetchone()
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS offer_skills (
+            skill TEXT NOT NULL,
+            offer_id INTEGER NOT NULL,
+            PRIMARY KEY (skill, offer_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offer_skills_offer ON offer_skills(offer_id)")
+    if exists and version >= DICTIONARY_VERSION:
+        return False
+    conn.execute("DELETE FROM offer_skills")
+    last_id, indexed = 0, 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, skills FROM offers WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "INSERT OR IGNORE INTO offer_skills (skill, offer_id) VALUES (?, ?)",
+            [
+                (key, offer_id)
+                for offer_id, skills in rows
+                for key in {normalize_skill(skill) for skill in json.loads(skills or "[]")} - {""}
+            ],
+        )
+        last_id, indexed = rows[-1][0], indexed + len(rows)
+    conn.execute(f"PRAGMA user_version = {DICTIONARY_VERSION}")
+    if indexed:
+        logger.info("Indexed skills of %d stored offers (skill dictionary v%d)", indexed, DICTIONARY_VERSION)
+    return indexed > 0
+
+
+def _lookup_name(name: str) -> str:
+    """Display name stored for a key: the first spelling seen, whitespace collapsed."""
+    return " ".join(name.split())
+
+
+class LookupCache:
+    """Name -> id of rows in the ``companies`` and ``cities`` lookup tables.
+
+    One cache lives as long as its store, so a batch only touches the lookup
+    tables for names it has not seen before. Lookup rows are never deleted;
+    :meth:`clear` is only needed after a rolled-back transaction, whose new
+    ids no longer exist.
+    """
+
+    def __init__(self) -> None:
+        # table -> name as given -> (id, stored display name)
+        self._ids: dict[str, dict[str, tuple[int, str]]] = {"companies": {}, "cities": {}}
+
+    def clear(self) -> None:
+        for ids in self._ids.values():
+            ids.clear()
+
+    def name(self, table: str, name: str | None) -> str | None:
+        """Stored display name of *name*, which :meth:`id` must have resolved already."""
+        return self._ids[table][name][1] if name is not None else None
+
+    def id(self, conn: sqlite3.Connection, table: str, name: str | None, schema: str = "main") -> int | None:
+        """Id of *name* in *table* (``companies`` or ``cities``), inserted on first sight; ``None`` for no name."""
+        if name is None:
+            return None
+        ids = self._ids[table]
+        found = ids.get(name)
+        if found is None:
+            key = lookup_key(name)
+            # Another writer may add the same key at any time; DO NOTHING keeps
+            # that from surfacing as an IntegrityError, and the SELECT then
+            # returns whichever row won.
+            conn.execute(
+                f"INSERT INTO {schema}.{table} (key, name) VALUES (?, ?) ON CONFLICT(key) DO NOTHING",
+                (key, _lookup_name(name)),
+            )
+            found = ids[name] = conn.execute(f"SELECT id, name FROM {schema}.{table} WHERE key = ?", (key,)).fetchone()
+        return found[0]
+
+
+_OFFER_COLUMNS = """
+    source TEXT NOT NULL,
+    external_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company_id INTEGER NOT NULL REFERENCES companies(id),
+    city_id INTEGER REFERENCES cities(id),
+    workplace_type TEXT NOT NULL,
+    employment_type TEXT,
+    salary_min_pln INTEGER,
+    salary_max_pln INTEGER,
+    currency TEXT,
+    skills TEXT,
+    offer_url TEXT NOT NULL,
+    published_at TEXT,
+    scraped_at TEXT NOT NULL,
+    detail_status TEXT,
+    detail_attempts INTEGER NOT NULL DEFAULT 0,
+    UNIQUE(source, external_id)
+"""
+
+# Same columns as the original job_offers table, for readers outside the stores.
+_JOB_OFFERS_VIEW = """
+    CREATE VIEW IF NOT EXISTS job_offers AS
+    SELECT offers.id AS id, source, external_id, title,
+           companies.name AS company, cities.name AS city,
+           workplace_type, employment_type, salary_min_pln, salary_max_pln, currency,
+           skills, offer_url, published_at, scraped_at, detail_status, detail_attempts
+    FROM offers
+    JOIN companies ON companies.id = offers.company_id
+    LEFT JOIN cities ON cities.id = offers.city_id
+"""
+
+
+def _ensure_lookup_tables(conn: sqlite3.Connection) -> None:
+    for table in ("companies", "cities"):
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL
+            )
+            """
+        )
+
+
+def _migrate_job_offers_table(conn: sqlite3.Connection) -> None:
+    """Move rows of a pre-lookup ``job_offers`` table into ``offers`` (same ids) and drop it."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(job_offers)")}
+    if "detail_status" not in columns:
+        # Rows stored before detail enrichment existed are not queued for it.
+        conn.execute("ALTER TABLE job_offers ADD COLUMN detail_status TEXT")
+        conn.execute("ALTER TABLE job_offers ADD COLUMN detail_attempts INTEGER NOT NULL DEFAULT 0")
+        conn.execute("UPDATE job_offers SET detail_status = 'legacy'")
+    # "name and ..." passes NULL cities through.
+    conn.create_function("lookup_key", 1, lambda name: name and lookup_key(name), deterministic=True)
+    conn.create_function("lookup_name", 1, lambda name: name and _lookup_name(name), deterministic=True)
+    # "WHERE true" keeps ON CONFLICT from parsing as a join constraint; id order
+    # makes the first spelling seen the display name.
+    conn.execute(
+        """
+        INSERT INTO companies (key, name)
+        SELECT lookup_key(company), lookup_name(company) FROM job_offers WHERE true ORDER BY id
+        ON CONFLICT(key) DO NOTHING
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO cities (key, name)
+        SELECT lookup_key(city), lookup_name(city) FROM job_offers WHERE city IS NOT NULL ORDER BY id
+        ON CONFLICT(key) DO NOTHING
+        """
+    )
+    moved = conn.execute(
+        """
+        INSERT INTO offers (
+            id, source, external_id, title, company_id, city_id, workplace_type, employment_type,
+            salary_min_pln, salary_max_pln, currency, skills, offer_url, published_at, scraped_at,
+            detail_status, detail_attempts
+        )
+        SELECT j.id, j.source, j.external_id, j.title, companies.id, cities.id, j.workplace_type,
+               j.employment_type, j.salary_min_pln, j.salary_max_pln, j.currency, j.skills, j.offer_url,
+               j.published_at, j.scraped_at, j.detail_status, j.detail_attempts
+        FROM job_offers AS j
+        JOIN companies ON companies.key = lookup_key(j.company)
+        LEFT JOIN cities ON cities.key = lookup_key(j.city)
+        ORDER BY j.id
+        """
+    ).rowcount
+    # Keep AUTOINCREMENT from reusing ids of offers deleted before the move.
+    conn.execute(
+        """
+        UPDATE sqlite_sequence
+        SET seq = max(seq, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'job_offers'), 0))
+        WHERE name = 'offers'
+        """
+    )
+    conn.execute("DROP TABLE job_offers")
+    logger.info("Moved %d stored offers to the offers table with company and city lookups", moved)
+
+
+def ensure_offers_schema(conn: sqlite3.Connection) -> bool:
+    """Create or migrate the offer tables, their indexes and the ``offer_skills`` index table.
+
+    Offers live in ``offers`` with company and city as ids into the
+    ``companies`` and ``cities`` lookup tables; the ``job_offers`` view joins
+    them back into the original column layout for readers.
+
+    Returns True if stored skills were re-keyed, which invalidates rollups keyed by skill.
+    """
+    _ensure_lookup_tables(conn)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS offers (id INTEGER PRIMARY KEY AUTOINCREMENT, {_OFFER_COLUMNS})")
+    legacy = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_offers'").fetchone()
+    if legacy:
+        _migrate_job_offers_table(conn)
+    conn.execute(_JOB_OFFERS_VIEW)
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_offers_detail_pending
+        ON offers(id) WHERE detail_status IS NULL OR detail_status = 'failed'
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offers_company ON offers(company_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offers_city ON offers(city_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offers_source_id ON offers(source, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offers_salary ON offers(salary_min_pln, salary_max_pln)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offers_salary_max ON offers(salary_max_pln)")
+    return _ensure_skills_index(conn)
+
+
+def _serialize_skills(skills: list[str]) -> str:
+    return json.dumps(skills, ensure_ascii=False)
+
+
+def rollup_row(offer: "JobOffer", lookups: LookupCache) -> dict:
+    """:func:`rollups.offer_rollup_row` with the city's stored display name, as ``job_offers`` shows it."""
+    row = rollups.offer_rollup_row(offer)
+    row["city"] = lookups.name("cities", offer.city)
+    return row
+
+
+def write_offers(
+    conn: sqlite3.Connection, offers: list["JobOffer"], lookups: LookupCache | None = None
+) -> tuple[int, int]:
+    """Insert new *offers* and update history and rollups on *conn*.
+
+    Runs in the caller's transaction; *lookups* carries company and city ids
+    across calls. Returns (inserted offers, new history observations).
+    """
+    if lookups is None:
+        lookups = LookupCache()
+    inserted_offers: list["JobOffer"] = []
+    for offer in offers:
+        # Resolved outside the try: an IntegrityError below only ever means the offer is stored already.
+        company_id = lookups.id(conn, "companies", offer.company)
+        city_id = lookups.id(conn, "cities", offer.city)
+        try:
+            offer_id = conn.execute(
+                """
+                INSERT INTO offers (
+                    source, external_id, title, company_id, city_id, workplace_type,
+                    employment_type, salary_min_pln, salary_max_pln, currency,
+                    skills, offer_url, published_at, scraped_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    offer.source,
+                    offer.external_id,
+                    offer.title,
+                    company_id,
+                    city_id,
+                    offer.workplace_type,
+                    offer.employment_type,
+                    offer.salary_min_pln,
+                    offer.salary_max_pln,
+                    offer.currency,
+                    _serialize_skills(offer.skills),
+                    str(offer.offer_url),
+                    offer.published_at.isoformat() if offer.published_at else None,
+                    offer.scraped_at.isoformat() if isinstance(offer.scraped_at, datetime) else datetime.utcnow().isoformat(),
+                ),
+            ).lastrowid
+        except sqlite3.IntegrityError:
+            continue
+        index_offer_skills(conn, offer_id, offer.skills)
+        inserted_offers.append(offer)
+    observations = history.record_observations(conn, offers)
+    rollups.update_rollups(conn, (rollup_row(offer, lookups) for offer in inserted_offers))
+    return len(inserted_offers), observations
+
+
+def apply_offer_details(conn: sqlite3.Connection, results: list[tuple[int, dict | None]], schema: str = "main") -> int:
+    """Merge detail fields into the ``offers`` rows of *schema*; ``None`` details mark a failed attempt.
+
+    Listing values win where the listing already had one, except skills
+    (the detail list is complete) and an ``unknown`` workplace type. Runs in
+    the caller's transaction and returns the number of offers updated.
+    Rollups (in the main schema) follow: the enriched offers' old rows are
+    taken out and their new rows folded in.
+    """
+    enriched = [offer_id for offer_id, details in results if details is not None]
+    previous = rollups.stored_rollup_rows(conn, enriched, table=f"{schema}.job_offers")
+    updated = 0
+    for offer_id, details in results:
+        if details is None:
+            conn.execute(
+                f"UPDATE {schema}.offers SET detail_status = 'failed', detail_attempts = detail_attempts + 1 WHERE id = ?",
+                (offer_id,),
+            )
+            continue
+        skills = canonicalize_skills(details.get("skills") or [])
+        conn.execute(
+            f"""
+            UPDATE {schema}.offers SET
+                published_at = COALESCE(published_at, ?),
+                employment_type = COALESCE(employment_type, ?),
+                workplace_type = CASE WHEN workplace_type = 'unknown' AND ? IS NOT NULL THEN ? ELSE workplace_type END,
+                salary_min_pln = COALESCE(salary_min_pln, ?),
+                salary_max_pln = COALESCE(salary_max_pln, ?),
+                skills = COALESCE(?, skills),
+                detail_status = 'ok',
+                detail_attempts = detail_attempts + 1
+            WHERE id = ?
+            """,
+            (
+                details.get("published_at"),
+                details.get("employment_type"),
+                details.get("workplace_type"),
+                details.get("workplace_type"),
+                details.get("salary_min_pln"),
+                details.get("salary_max_pln"),
+                _serialize_skills(skills) if skills else None,
+                offer_id,
+            ),
+        )
+        if skills:
+            index_offer_skills(conn, offer_id, skills, table=f"{schema}.offer_skills")
+        updated += 1
+    rollups.update_rollups(conn, previous, weight=-1)
+    rollups.update_rollups(conn, rollups.stored_rollup_rows(conn, enriched, table=f"{schema}.job_offers"))
+    return updated
+
+
 class SQLiteOfferStore:
+    supports_history: ClassVar[bool] = True
+
     def __init__(self, db_path: str | Path = "jobpulse.db") -> None:
         self.db_path = str(db_path)
+        self._lookups = LookupCache()
         logger.debug("Initializing SQLite store at %s", self.db_path)
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS job_offers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source TEXT NOT NULL,
-                    external_id TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    company TEXT NOT NULL,
-                    city TEXT,
-                    workplace_type TEXT NOT NULL,
-                    employment_type TEXT,
-                    salary_min_pln INTEGER,
-                    salary_max_pln INTEGER,
-                    currency TEXT,
-                    skills TEXT,
-                    offer_url TEXT NOT NULL,
-                    published_at TEXT,
-                    scraped_at TEXT NOT NULL,
-                    UNIQUE(source, external_id)
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_job_offers_company
-                ON job_offers(company)
-                """
-            )
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_job_offers_city
-                ON job_offers(city)
-                """
-            )
+            # Only takes effect on a fresh file; compact_history converts older DBs.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            rekeyed = ensure_offers_schema(conn)
+            history.ensure_history_schema(conn)
+            rollups.ensure_rollup_schema(conn)
+            if rekeyed:
+                rollups.rebuild_rollups(conn)
 
     @staticmethod
     def _serialize_skills(skills: list[str]) -> str:
-        return json.dumps(skills, ensure_ascii=False)
+        return _serialize_skills(skills)
 
-    def save_offers(self, offers: list[JobOffer]) -> int:
+    def save_offers(self, offers: list["JobOffer"]) -> int:
         if not offers:
             logger.debug("No offers to save")
             return 0
 
         logger.info("Saving %d offers to database...", len(offers))
-        inserted = 0
-        with sqlite3.connect(self.db_path) as conn:
-            for offer in offers:
-                try:
-                    conn.execute(
-                        """
-                        INSERT INTO job_offers (
-                            source, external_id, title, company, city, workplace_type,
-                            employment_type, salary_min_pln, salary_max_pln, currency,
-                            skills, offer_url, published_at, scraped_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            offer.source,
-                            offer.external_id,
-                            offer.title,
-                            offer.company,
-                            offer.city,
-                            offer.workplace_type,
-                            offer.employment_type,
-                            offer.salary_min_pln,
-                            offer.salary_max_pln,
-                            offer.currency,
-                            self._serialize_skills(offer.skills),
-                            str(offer.offer_url),
-                            offer.published_at.isoformat() if offer.published_at else None,
-                            offer.scraped_at.isoformat() if isinstance(offer.scraped_at, datetime) else datetime.utcnow().isoformat(),
-                        ),
-                    )
-                    inserted += 1
-                except sqlite3.IntegrityError:
-                    continue
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                inserted, observations = write_offers(conn, offers, self._lookups)
+        except Exception:
+            self._lookups.clear()
+            raise
         logger.info("Inserted %d new offers (duplicates skipped)", inserted)
+        logger.debug("Opened %d new history observations", observations)
         return inserted
 
+    def pending_enrichment(self, limit: int = 200, max_attempts: int = 3) -> list[dict]:
+        """Return newest offers whose detail page was never fetched (or failed), up to *limit*."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                """
+                SELECT id, source, external_id, offer_url FROM offers
+                WHERE detail_status IS NULL OR (detail_status = 'failed' AND detail_attempts < ?)
+                ORDER BY id DESC LIMIT ?
+                """,
+                (max_attempts, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def apply_enrichment(self, results: list[tuple[int, dict | None]]) -> int:
+        """Merge detail fields into stored rows (see :func:`apply_offer_details`)."""
+        with sqlite3.connect(self.db_path) as conn:
+            updated = apply_offer_details(conn, results)
+        logger.info("Applied detail enrichment to %d offers", updated)
+        return updated
+
+    def compact_history(self, raw_days: int = 30, retention_days: int = 365) -> dict[str, int]:
+        """Downsample old observations, apply retention and reclaim free pages."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                stats = history.compact_history(conn, raw_days=raw_days, retention_days=retention_days)
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                logger.info("Converting %s to incremental auto-vacuum (one-time VACUUM)", self.db_path)
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+        finally:
+            conn.close()
+        return stats
+
+    def offer_history(self, source: str, external_id: str) -> list[dict]:
+        """Return the stored observation history for one offer."""
+        with sqlite3.connect(self.db_path) as conn:
+            return history.offer_history(conn, source, external_id)
+
+    def market_stats(
+        self,
+        skill: str | None = None,
+        city: str | None = None,
+        workplace_type: str | None = None,
+        employment_type: str | None = None,
+        weeks: int | None = None,
+        group_by: str | None = None,
+    ) -> list[dict]:
+        """Return offer counts and salary percentiles from the rollup tables."""
+        with sqlite3.connect(self.db_path) as conn:
+            return rollups.query_rollups(
+                conn,
+                skill=skill,
+                city=city,
+                workplace_type=workplace_type,
+                employment_type=employment_type,
+                weeks=weeks,
+                group_by=group_by,
+            )
+
+    def rebuild_market_stats(self) -> int:
+        """Recompute rollups from all stored offers (e.g. for pre-existing DBs)."""
+        with sqlite3.connect(self.db_path) as conn:
+            return rollups.rebuild_rollups(conn)
+
     def count(self) -> int:
         """Return total number of stored offers."""
         with sqlite3.connect(self.db_path) as conn:
-            return conn.execute("SELECT count(*) FROM job_offers").fetchone()[0]
+            return conn.execute("SELECT count(*) FROM offers").fetchone()[0]
+
+    @staticmethod
+    def _select_sql(query: OfferQuery, schema: str = "") -> tuple[str, list[object]]:
+        # The inner query picks one page of ids from offers alone; only those
+        # rows are joined to their company and city names. Joining first would
+        # look up names for every candidate the ORDER BY has to sort.
+        prefix = f"{schema}." if schema else ""
+        where_sql, params = query.to_sql(schema)
+        sql = (
+            "SELECT offers.id AS id, source, external_id, title, companies.name AS company, cities.name AS city, "
+            "salary_min_pln, salary_max_pln, skills, offer_url"
+            f" FROM {prefix}offers"
+            f" JOIN {prefix}companies ON companies.id = offers.company_id"
+            f" LEFT JOIN {prefix}cities ON cities.id = offers.city_id"
+            f" WHERE offers.id IN (SELECT id FROM {prefix}offers{where_sql})"
+            " ORDER BY offers.id DESC"
+        )
+        return sql, params
+
+    def explain_query(self, query: OfferQuery) -> list[str]:
+        """Return SQLite's EXPLAIN QUERY PLAN detail lines for *query*."""
+        sql, params = self._select_sql(query)
+        with sqlite3.connect(self.db_path) as conn:
+            register_functions(conn)
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
 
     def query_offers(self, query: OfferQuery | None = None) -> list[dict]:
         """Return offers matching *query* as list of dicts (row factory)."""
+        return list(self.iter_offers(query))
+
+    def iter_offers(self, query: OfferQuery | None = None, page_size: int = 1000) -> Iterator[dict]:
+        """Yield offers matching *query* newest first, one keyset page at a time.
+
+        Pages seek on ``id < last_seen_id`` instead of OFFSET, so memory stays
+        bounded by *page_size* and late pages cost the same as the first one.
+        ``query.limit`` caps the total number of rows (``<= 0`` for all).
+        """
         if query is None:
             query = OfferQuery()
 
-        where_sql, params = query.to_sql()
-        sql = (
-            "SELECT source, external_id, title, company, city, "
-            "salary_min_pln, salary_max_pln, skills, offer_url"
-            f" FROM job_offers{where_sql}"
-        )
-
+        remaining = query.limit if query.limit > 0 else None
+        cursor_id = query.before_id
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
-            rows = conn.execute(sql, params).fetchall()
-
-        results: list[dict] = []
-        for r in rows:
-            d = dict(r)
-            # Deserialize skills back to a list
-            if isinstance(d.get("skills"), str):
-                try:
-                    d["skills"] = json.loads(d["skills"])
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            results.append(d)
-        return results
+            register_functions(conn)
+            while remaining is None or remaining > 0:
+                batch = page_size if remaining is None else min(page_size, remaining)
+                sql, params = self._select_sql(replace(query, before_id=cursor_id, limit=batch))
+                rows = conn.execute(sql, params).fetchall()
+                for row in rows:
+                    yield self._row_to_dict(row)
+                if len(rows) < batch:
+                    return
+                cursor_id = rows[-1]["id"]
+                if remaining is not None:
+                    remaining -= len(rows)
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> dict:
+        d = dict(row)
+        # Deserialize skills back to a list
+        if isinstance(d.get("skills"), str):
+            try:
+                d["skills"] = json.loads(d["skills"])
+            except (json.JSONDecodeError, TypeError):
+                pass
+        return d
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from .base import ScrapeTask, TaskSpec, WorkQueue, plan_tasks
+from .sqlite_queue import SQLiteWorkQueue
+from .worker import QueueWorker, WorkerStats, default_worker_id
+
+__all__ = [
+    "QueueWorker",
+    "SQLiteWorkQueue",
+    "ScrapeTask",
+    "TaskSpec",
+    "WorkQueue",
+    "WorkerStats",
+    "default_worker_id",
+    "open_queue",
+    "plan_tasks",
+]
+
+
+def open_queue(dsn: str | Path) -> WorkQueue:
+    """Open the work queue for *dsn* (a SQLite path or ``sqlite:///`` URL; the only backend so far)."""
+    from src.storage.base import SQLITE_SCHEME, dsn_scheme, sqlite_path
+
+    dsn = str(dsn)
+    if dsn_scheme(dsn) != SQLITE_SCHEME:
+        raise ValueError(f"unsupported work queue scheme {dsn_scheme(dsn)!r} (use a file path or sqlite:///)")
+    return SQLiteWorkQueue(sqlite_path(dsn))
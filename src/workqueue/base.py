@@ -0,0 +1,77 @@
+import math
+from dataclasses import dataclass
+from typing import Iterable, Protocol
+
+from src.scrapers.registry import get_capabilities, get_scraper_class
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    """One unit of scrape work: listing pages *first_page*..*last_page* of *source*.
+
+    ``first_page == 0`` means the source cannot fetch page ranges and the task
+    runs ``fetch_offers(limit)`` once. *limit* caps the offers kept from the task.
+    """
+
+    source: str
+    first_page: int
+    last_page: int
+    limit: int
+
+
+@dataclass(frozen=True)
+class ScrapeTask:
+    """A leased task. ``attempt`` fences the lease: only the holder of this attempt may complete it."""
+
+    id: int
+    source: str
+    first_page: int
+    last_page: int
+    limit: int
+    attempt: int
+    worker_id: str
+
+
+class WorkQueue(Protocol):
+    """Shared queue of scrape tasks with leases; see :class:`SQLiteWorkQueue`."""
+
+    def enqueue(self, specs: Iterable[TaskSpec], batch: str) -> int:
+        """Add tasks for *batch*; tasks already queued for the same batch are skipped. Return how many were new."""
+        ...
+
+    def claim(self, worker_id: str, lease_seconds: float) -> ScrapeTask | None:
+        """Lease the next runnable task (pending, or with an expired lease) or return ``None``."""
+        ...
+
+    def heartbeat(self, task: ScrapeTask, lease_seconds: float) -> bool:
+        """Extend the lease; ``False`` if it was lost (expired and taken over)."""
+        ...
+
+    def complete(self, task: ScrapeTask, offers: int) -> bool:
+        """Mark the task done. Repeating the call is harmless; ``False`` if the lease was lost."""
+        ...
+
+    def fail(self, task: ScrapeTask, error: str, retry_delay: float = 0.0) -> str:
+        """Release the task after an error; return its new status (``pending``, ``failed`` or ``lost``)."""
+        ...
+
+    def counts(self) -> dict[str, int]:
+        """Number of tasks per status."""
+        ...
+
+
+def plan_tasks(sources: list[str], limit: int, pages_per_task: int = 5) -> list[TaskSpec]:
+    """Split a run of *limit* offers per source into tasks of *pages_per_task* listing pages."""
+    specs: list[TaskSpec] = []
+    pages_per_task = max(1, pages_per_task)
+    for source in sources:
+        page_size = getattr(get_scraper_class(source), "page_size", 0)
+        if not get_capabilities(source).supports_pagination or page_size <= 0:
+            specs.append(TaskSpec(source, 0, 0, limit))
+            continue
+        pages = max(1, math.ceil(limit / page_size))
+        for first_page in range(1, pages + 1, pages_per_task):
+            last_page = min(pages, first_page + pages_per_task - 1)
+            task_limit = min(limit - (first_page - 1) * page_size, (last_page - first_page + 1) * page_size)
+            specs.append(TaskSpec(source, first_page, last_page, task_limit))
+    return specs
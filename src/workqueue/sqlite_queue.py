@@ -0,0 +1,178 @@
+"""Work queue in a SQLite file, shared by worker processes on one host or a network share.
+
+Every state change is a single ``UPDATE`` guarded by the task's current state,
+so two workers can never hold the same task: a claim takes a pending task or
+one whose lease has expired, and bumps ``attempts``. ``attempts`` is also the
+fencing token — heartbeats, completion and failure only apply while the task
+is still leased to the same worker *and* attempt, so a worker that stalled
+past its lease cannot overwrite the work of the one that took over.
+
+Timestamps are wall-clock seconds (``time.time()``) because leases are
+compared across processes.
+"""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable
+
+from src.workqueue.base import ScrapeTask, TaskSpec
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteWorkQueue:
+    def __init__(self, db_path: str | Path = "jobpulse-queue.db", max_attempts: int = 3) -> None:
+        self.db_path = str(db_path)
+        self.max_attempts = max(1, max_attempts)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scrape_tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    batch TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    first_page INTEGER NOT NULL,
+                    last_page INTEGER NOT NULL,
+                    limit_offers INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    offers INTEGER,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL,
+                    UNIQUE(batch, source, first_page, last_page)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_scrape_tasks_runnable
+                ON scrape_tasks(status, available_at) WHERE status IN ('pending', 'leased')
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Workers contend for the write lock only for single-row updates; wait instead of failing.
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def enqueue(self, specs: Iterable[TaskSpec], batch: str) -> int:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.executemany(
+                """
+                INSERT OR IGNORE INTO scrape_tasks (batch, source, first_page, last_page, limit_offers, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [(batch, spec.source, spec.first_page, spec.last_page, spec.limit, now) for spec in specs],
+            )
+            added = cursor.rowcount
+        logger.info("Queued %d new scrape tasks for batch %s", added, batch)
+        return added
+
+    def claim(self, worker_id: str, lease_seconds: float) -> ScrapeTask | None:
+        now = time.time()
+        with self._connect() as conn:
+            # Leases that ran out on their last attempt will not be retried.
+            expired = conn.execute(
+                """
+                UPDATE scrape_tasks
+                SET status = 'failed', finished_at = ?, last_error = 'lease expired'
+                WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            ).rowcount
+            if expired:
+                logger.warning("%d scrape tasks failed: lease expired on the last attempt", expired)
+            row = conn.execute(
+                """
+                UPDATE scrape_tasks
+                SET status = 'leased', lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1
+                WHERE id = (
+                    SELECT id FROM scrape_tasks
+                    WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires_at < ?)
+                    ORDER BY id
+                    LIMIT 1
+                )
+                RETURNING id, source, first_page, last_page, limit_offers, attempts, lease_owner
+                """,
+                (worker_id, now + lease_seconds, now, now),
+            ).fetchone()
+        if row is None:
+            return None
+        task = ScrapeTask(*row)
+        logger.debug(
+            "Worker %s leased task %d (%s pages %d-%d, attempt %d)",
+            worker_id,
+            task.id,
+            task.source,
+            task.first_page,
+            task.last_page,
+            task.attempt,
+        )
+        return task
+
+    def heartbeat(self, task: ScrapeTask, lease_seconds: float) -> bool:
+        with self._connect() as conn:
+            return conn.execute(
+                """
+                UPDATE scrape_tasks SET lease_expires_at = ?
+                WHERE id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?
+                """,
+                (time.time() + lease_seconds, task.id, task.worker_id, task.attempt),
+            ).rowcount == 1
+
+    def complete(self, task: ScrapeTask, offers: int) -> bool:
+        with self._connect() as conn:
+            updated = conn.execute(
+                """
+                UPDATE scrape_tasks
+                SET status = 'done', offers = ?, finished_at = ?, lease_expires_at = NULL, last_error = NULL
+                WHERE id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?
+                """,
+                (offers, time.time(), task.id, task.worker_id, task.attempt),
+            ).rowcount
+            if updated:
+                return True
+            # Already completed by this very lease (a retried call) counts as success.
+            return conn.execute(
+                "SELECT 1 FROM scrape_tasks WHERE id = ? AND status = 'done' AND lease_owner = ? AND attempts = ?",
+                (task.id, task.worker_id, task.attempt),
+            ).fetchone() is not None
+
+    def fail(self, task: ScrapeTask, error: str, retry_delay: float = 0.0) -> str:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                UPDATE scrape_tasks
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    available_at = ?,
+                    finished_at = CASE WHEN attempts >= ? THEN ? END,
+                    lease_expires_at = NULL,
+                    last_error = ?
+                WHERE id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?
+                RETURNING status
+                """,
+                (
+                    self.max_attempts,
+                    now + retry_delay,
+                    self.max_attempts,
+                    now,
+                    error[:500],
+                    task.id,
+                    task.worker_id,
+                    task.attempt,
+                ),
+            ).fetchone()
+        return row[0] if row else "lost"
+
+    def counts(self) -> dict[str, int]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, count(*) FROM scrape_tasks GROUP BY status"))
+
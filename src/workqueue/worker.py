@@ -0,0 +1,170 @@
+"""Queue worker: lease scrape tasks, run them and store the offers.
+
+While a task runs, a heartbeat thread renews its lease every third of the
+lease time. If the worker stalls or dies the lease runs out and another worker
+takes the task over; offers already saved are skipped as duplicates by the
+store, so a task that runs twice does no harm.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.filters import OfferFilter, filter_offers
+from src.scrapers.registry import get_capabilities, get_scrapers
+from src.scrapers.scheduler import browser_slot
+from src.workqueue.base import ScrapeTask, WorkQueue
+
+if TYPE_CHECKING:
+    from src.models import JobOffer
+    from src.storage import OfferStore
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class WorkerStats:
+    tasks: int = 0
+    failed: int = 0  # attempts that raised (the task may be retried)
+    lost: int = 0  # leases taken over by another worker
+    offers: int = 0
+    inserted: int = 0
+    sources: dict[str, int] = field(default_factory=dict)
+
+
+class _Heartbeat(threading.Thread):
+    def __init__(self, queue: WorkQueue, task: ScrapeTask, lease_seconds: float) -> None:
+        super().__init__(name=f"lease-{task.id}", daemon=True)
+        self.queue = queue
+        self.task = task
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.lease_seconds / 3):
+            try:
+                renewed = self.queue.heartbeat(self.task, self.lease_seconds)
+            except Exception:
+                logger.exception("Heartbeat for task %d failed", self.task.id)
+                continue
+            if not renewed:
+                logger.warning(
+                    "Lost the lease on task %d (%s); another worker took it over", self.task.id, self.task.source
+                )
+                self.lost = True
+                return
+
+
+class QueueWorker:
+    """Run tasks from *queue* until it is drained (or *idle_wait* seconds pass without work)."""
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        store: "OfferStore",
+        offer_filter: OfferFilter | None = None,
+        worker_id: str | None = None,
+        lease_seconds: float = 120.0,
+        poll_interval: float = 5.0,
+        idle_wait: float = 0.0,
+        retry_delay: float = 30.0,
+    ) -> None:
+        self.queue = queue
+        self.store = store
+        self.offer_filter = offer_filter
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.idle_wait = idle_wait
+        self.retry_delay = retry_delay
+        self._scrapers: dict = {}
+
+    def run(self, max_tasks: int = 0) -> WorkerStats:
+        stats = WorkerStats()
+        idle_since: float | None = None
+        logger.info("Worker %s started (lease %.0fs)", self.worker_id, self.lease_seconds)
+        while not max_tasks or stats.tasks + stats.failed < max_tasks:
+            task = self.queue.claim(self.worker_id, self.lease_seconds)
+            if task is None:
+                counts = self.queue.counts()
+                outstanding = counts.get("pending", 0) + counts.get("leased", 0)
+                idle_since = idle_since or time.monotonic()
+                if not outstanding and time.monotonic() - idle_since >= self.idle_wait:
+                    break
+                # Others hold leases (which may still expire) or retries are backing off.
+                time.sleep(self.poll_interval)
+                continue
+            idle_since = None
+            self._run_task(task, stats)
+        logger.info(
+            "Worker %s finished: %d tasks done, %d failed attempts, %d leases lost, %d offers (%d new)",
+            self.worker_id,
+            stats.tasks,
+            stats.failed,
+            stats.lost,
+            stats.offers,
+            stats.inserted,
+        )
+        return stats
+
+    def _scraper(self, source: str):
+        if source not in self._scrapers:
+            self._scrapers[source] = get_scrapers([source])[0]
+        return self._scrapers[source]
+
+    def _fetch(self, task: ScrapeTask) -> list["JobOffer"]:
+        scraper = self._scraper(task.source)
+        slot = browser_slot(task.source) if get_capabilities(task.source).needs_browser else nullcontext()
+        with slot:
+            if task.first_page > 0:
+                offers = scraper.fetch_pages(task.first_page, task.last_page)
+            else:
+                offers = scraper.fetch_offers(limit=task.limit)
+        return offers[:task.limit]
+
+    def _run_task(self, task: ScrapeTask, stats: WorkerStats) -> None:
+        heartbeat = _Heartbeat(self.queue, task, self.lease_seconds)
+        heartbeat.start()
+        try:
+            offers = self._fetch(task)
+            if self.offer_filter is not None:
+                offers = filter_offers(offers, self.offer_filter)
+            # Saved even if the lease was lost meanwhile: the store skips duplicates.
+            inserted = self.store.save_offers(offers)
+        except Exception as exc:
+            logger.exception("Task %d (%s pages %d-%d) failed", task.id, task.source, task.first_page, task.last_page)
+            status = self.queue.fail(task, f"{type(exc).__name__}: {exc}", retry_delay=self.retry_delay)
+            stats.failed += 1
+            stats.lost += status == "lost"
+            return
+        finally:
+            heartbeat.stopped.set()
+            heartbeat.join()
+
+        stats.offers += len(offers)
+        stats.inserted += inserted
+        stats.sources[task.source] = stats.sources.get(task.source, 0) + len(offers)
+        if self.queue.complete(task, len(offers)):
+            stats.tasks += 1
+            logger.info(
+                "Task %d (%s pages %d-%d) done: %d offers, %d new",
+                task.id,
+                task.source,
+                task.first_page,
+                task.last_page,
+                len(offers),
+                inserted,
+            )
+        else:
+            stats.lost += 1
+            logger.warning("Task %d finished after its lease was lost; result left to the new holder", task.id)